@@ -0,0 +1,297 @@
+"""
+Batch Engine Module
+
+Schedules OCR work at (image, field) granularity on a pool of worker
+threads with work stealing, so a large image with many fields no longer
+keeps one worker busy while the others sit idle at the end of a batch.
+
+- Every image is split into one task per template field. The decoded
+  image is shared read-only by all of its tasks.
+- Each worker owns a deque. New images are dealt round-robin to the
+  workers; a worker takes tasks from the front of its own deque and, when
+  it runs dry, steals from the back of another worker's deque.
+- When the last field of an image completes, its row is assembled and
+  placed in a reorder buffer, so rows are still produced in input order.
+
+Tesseract runs as a subprocess, so threads run it in parallel despite the GIL.
+
+prefetch() is the stage in front of the engine: an I/O thread pool reads and
+decodes the next images ahead of OCR, bounded both by a number of images and
+by a MemoryBudget of decoded bytes.
+"""
+
+import os
+import queue
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+
+class _ImageJob:
+    """One image in flight: shared pixels plus the row being assembled."""
+
+    __slots__ = ("index", "key", "image", "meta", "row", "remaining", "lock")
+
+    def __init__(self, index, key, image, meta, field_count):
+        self.index = index
+        self.key = key
+        self.image = image
+        self.meta = meta
+        self.row = {}
+        self.remaining = field_count
+        self.lock = threading.Lock()
+
+
+class BatchEngine:
+    """
+    Work-stealing OCR scheduler for a batch of images and one template.
+
+    Attributes:
+        fields: Template fields
+        field_fn: Callable field_fn(image, field) -> dict of column values
+        workers: Number of worker threads
+        max_pending: Maximum images decoded and in flight at once
+        stats: Counters (images, tasks, steals) of the last run
+    """
+
+    def __init__(self, fields, field_fn, workers=None, max_pending=None):
+        self.fields = list(fields)
+        self.field_fn = field_fn
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_pending = max_pending or self.workers * 2
+        self.stats = {"images": 0, "tasks": 0, "steals": 0}
+
+    def map(self, items, on_release=None):
+        """
+        OCR a stream of images and yield their rows in input order.
+
+        Args:
+            items: Iterable of (key, image, meta). image is a BGR numpy
+                array, or None to pass the item through without OCR.
+            on_release: Optional callable(key), called once the engine no
+                longer holds an item's image
+
+        Yields:
+            Tuples (key, row, meta); row is None for pass-through items
+        """
+        self.stats = {"images": 0, "tasks": 0, "steals": 0}
+        deques = [deque() for _ in range(self.workers)]
+        wakeup = threading.Condition()
+        completed = queue.Queue()
+        slots = threading.BoundedSemaphore(self.max_pending)
+        state = {"feeding": True, "error": None}
+        steals = [0] * self.workers
+
+        def next_task(worker_index):
+            try:
+                return deques[worker_index].popleft()
+            except IndexError:
+                pass
+            victims = [i for i in range(self.workers) if i != worker_index]
+            random.shuffle(victims)
+            for victim in victims:
+                try:
+                    task = deques[victim].pop()
+                except IndexError:
+                    continue
+                steals[worker_index] += 1
+                return task
+            return None
+
+        def worker(worker_index):
+            while True:
+                task = next_task(worker_index)
+                if task is None:
+                    with wakeup:
+                        if not state["feeding"] and not any(deques):
+                            return
+                        wakeup.wait(0.05)
+                    continue
+                job, field = task
+                try:
+                    values = self.field_fn(job.image, field)
+                except Exception as e:
+                    print(f"  [ERROR] Field {field.get('name', '?')}: {e}")
+                    values = {field["name"]: ""}
+                with job.lock:
+                    job.row.update(values)
+                    job.remaining -= 1
+                    finished = job.remaining == 0
+                if finished:
+                    job.image = None  # release the pixels as soon as the row is complete
+                    if on_release is not None:
+                        on_release(job.key)
+                    completed.put(job)
+
+        def feeder():
+            index = 0
+            try:
+                for key, image, meta in items:
+                    slots.acquire()
+                    if image is None or not self.fields:
+                        job = _ImageJob(index, key, None, meta, 0)
+                        if image is None:
+                            job.row = None  # pass-through, no OCR
+                        if on_release is not None:
+                            on_release(key)
+                        completed.put(job)
+                    else:
+                        if getattr(image, "flags", None) is not None:
+                            image.setflags(write=False)
+                        job = _ImageJob(index, key, image, meta, len(self.fields))
+                        target = deques[index % self.workers]
+                        target.extend((job, field) for field in self.fields)
+                        self.stats["images"] += 1
+                        self.stats["tasks"] += len(self.fields)
+                        with wakeup:
+                            wakeup.notify_all()
+                    index += 1
+            except BaseException as e:
+                state["error"] = e
+            finally:
+                with wakeup:
+                    state["feeding"] = False
+                    wakeup.notify_all()
+                completed.put(index)  # total item count marks the end of the stream
+
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True, name=f"ocr-worker-{i}")
+                   for i in range(self.workers)]
+        threads.append(threading.Thread(target=feeder, daemon=True, name="ocr-feeder"))
+        for thread in threads:
+            thread.start()
+
+        # Reorder buffer: hold finished rows until all earlier items are out
+        buffered = {}
+        next_index = 0
+        total = None
+        while total is None or next_index < total:
+            entry = completed.get()
+            if isinstance(entry, int):
+                total = entry
+                continue
+            buffered[entry.index] = entry
+            while next_index in buffered:
+                job = buffered.pop(next_index)
+                next_index += 1
+                slots.release()
+                yield job.key, job.row, job.meta
+
+        for thread in threads:
+            thread.join()
+        self.stats["steals"] = sum(steals)
+        if state["error"] is not None:
+            raise state["error"]
+
+
+class MemoryBudget:
+    """
+    Byte budget for decoded images held in memory at once.
+
+    A single item larger than the whole budget is still admitted when
+    nothing else is held, so huge scans are processed one at a time instead
+    of blocking forever.
+
+    Attributes:
+        limit: Budget in bytes (None = unlimited)
+        used: Bytes currently reserved
+        peak: Highest value of used seen
+    """
+
+    def __init__(self, limit_mb=None):
+        self.limit = int(limit_mb * 1024 * 1024) if limit_mb else None
+        self.used = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes, block=True):
+        """Reserve nbytes; returns False instead of waiting when block is False."""
+        with self._cond:
+            while self.limit is not None and self.used and self.used + nbytes > self.limit:
+                if not block:
+                    return False
+                self._cond.wait()
+            self.used += nbytes
+            self.peak = max(self.peak, self.used)
+            return True
+
+    def release(self, nbytes):
+        with self._cond:
+            self.used = max(0, self.used - nbytes)
+            self._cond.notify_all()
+
+
+def estimate_decoded_bytes(path):
+    """Size of the image decoded as 8-bit BGR, read from the header only."""
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+        return width * height * 3
+    except Exception:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+
+def prefetch(paths, decode, ahead=8, io_workers=2, budget=None):
+    """
+    Decode images ahead of their consumer, in order.
+
+    Up to `ahead` images are read/decoded in an I/O thread pool. Each one
+    reserves its estimated decoded size in `budget` before it is decoded;
+    the consumer must release it (budget.release(nbytes)) once the image is
+    no longer needed. Reservations happen in input order, and the call only
+    waits for memory when nothing is queued, so the stage cannot deadlock
+    on its own reservations. The size estimates (image header reads) also
+    run in the pool, ahead of the reservations, so slow network storage is
+    not opened one file at a time.
+
+    Args:
+        paths: Iterable of image paths
+        decode: Callable decode(path) -> image or None
+        ahead: Maximum number of images decoded but not yet consumed
+        io_workers: Threads reading and decoding
+        budget: Optional MemoryBudget
+
+    Yields:
+        Tuples (path, image, reserved_bytes)
+    """
+    budget = budget or MemoryBudget()
+    paths = iter(paths)
+    estimates = deque()  # (path, future of its size estimate), header reads run ahead in the pool
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=max(1, io_workers), thread_name_prefix="decode") as pool:
+
+        def read_headers_ahead():
+            while len(estimates) < max(1, ahead):
+                path = next(paths, None)
+                if path is None:
+                    return
+                estimates.append((path, pool.submit(estimate_decoded_bytes, path)))
+
+        try:
+            while True:
+                read_headers_ahead()
+                while len(pending) < max(1, ahead) and estimates:
+                    path, estimate = estimates[0]
+                    nbytes = estimate.result()
+                    if not budget.acquire(nbytes, block=not pending):
+                        break
+                    estimates.popleft()
+                    pending.append((path, nbytes, pool.submit(decode, path)))
+                    read_headers_ahead()
+                if not pending:
+                    return
+                path, nbytes, future = pending.popleft()
+                yield path, future.result(), nbytes
+        finally:
+            # Consumer stopped early: drop what was decoded ahead
+            for _, estimate in estimates:
+                estimate.cancel()
+            for _, nbytes, future in pending:
+                future.cancel()
+                budget.release(nbytes)
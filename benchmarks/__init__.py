@@ -0,0 +1,13 @@
+"""
+Benchmarks Package
+
+Reproducible OCR benchmarks on synthetic forms with known ground truth.
+
+- synthetic: renders forms (eng+ind text, several fonts, noise, skew,
+  blank fields) plus their template JSON and ground truth
+- runner: measures throughput, per-field latency and character accuracy
+  of run_ocr, run_ocr_preview and every EnhancedOCR strategy
+
+    python -m benchmarks.runner generate bench_data --count 20
+    python -m benchmarks.runner run bench_data --output results.json
+"""
@@ -0,0 +1,189 @@
+"""
+Regression Gate Module
+
+Stores benchmark reports (see runner) as named JSON baselines and compares
+a new report against one of them, per template and per target:
+
+- throughput: images/s may drop by at most throughput_tolerance (relative)
+- latency: the p50/p90/p99 field latencies may rise by at most
+  latency_tolerance (relative) and min_latency_ms (absolute) together, so
+  sub-millisecond jitter is not reported
+- accuracy: char_accuracy and exact_match may drop by at most
+  accuracy_tolerance (absolute)
+- coverage: every baseline (template, target) pair must be in the new
+  report, unless allow_missing is set
+
+    python -m benchmarks.regression save results.json --name main
+    python -m benchmarks.regression compare results.json --baseline main
+
+compare exits with status 1 when anything regressed, so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+LATENCY_PERCENTILES = ("p50", "p90", "p99")
+ACCURACY_METRICS = ("char_accuracy", "exact_match")
+
+
+def baseline_path(name, baselines_dir=BASELINES_DIR):
+    """A name maps to <baselines_dir>/<name>.json; an existing file path is used as is"""
+    if os.path.isfile(name):
+        return name
+    return os.path.join(baselines_dir, name + ".json")
+
+
+def save_baseline(report, name, baselines_dir=BASELINES_DIR):
+    os.makedirs(baselines_dir, exist_ok=True)
+    path = baseline_path(name, baselines_dir)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(report, baseline=name), f, indent=2)
+    return path
+
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_baselines(baselines_dir=BASELINES_DIR):
+    if not os.path.isdir(baselines_dir):
+        return []
+    return sorted(name[:-len(".json")] for name in os.listdir(baselines_dir) if name.endswith(".json"))
+
+
+def _finding(template, target, metric, baseline, current, regression):
+    change = (current - baseline) / baseline if baseline else 0.0
+    return {"template": template, "target": target, "metric": metric, "baseline": baseline,
+            "current": current, "change": round(change, 4), "regression": regression}
+
+
+def compare(baseline, current, throughput_tolerance=0.10, latency_tolerance=0.15, min_latency_ms=1.0,
+            accuracy_tolerance=0.01, allow_missing=False):
+    """
+    Compare two benchmark reports.
+
+    Returns:
+        Dict with "findings" (one entry per compared metric), "missing"
+        ((template, target) pairs of the baseline absent from current),
+        "warnings" and "regressed" (bool; missing pairs count unless
+        allow_missing)
+    """
+    findings = []
+    missing = []
+    warnings = []
+    if baseline.get("dataset") != current.get("dataset"):
+        warnings.append("dataset berbeda dari baseline; hasil tidak sebanding")
+    for key in ("workers", "lang"):
+        if baseline.get(key) != current.get(key):
+            warnings.append(f"{key} berbeda: baseline {baseline.get(key)}, sekarang {current.get(key)}")
+    if baseline.get("environment", {}).get("tesseract") != current.get("environment", {}).get("tesseract"):
+        warnings.append("versi Tesseract berbeda dari baseline")
+
+    for template, targets in baseline.get("results", {}).items():
+        for target, old in targets.items():
+            new = current.get("results", {}).get(template, {}).get(target)
+            if new is None:
+                missing.append((template, target))
+                continue
+
+            floor = old["images_per_s"] * (1.0 - throughput_tolerance)
+            findings.append(_finding(template, target, "images_per_s", old["images_per_s"], new["images_per_s"],
+                                     new["images_per_s"] < floor))
+
+            for percentile in LATENCY_PERCENTILES:
+                before, after = old["latency_ms"][percentile], new["latency_ms"][percentile]
+                ceiling = max(before * (1.0 + latency_tolerance), before + min_latency_ms)
+                findings.append(_finding(template, target, f"latency_{percentile}_ms", before, after,
+                                         after > ceiling))
+
+            for metric in ACCURACY_METRICS:
+                findings.append(_finding(template, target, metric, old[metric], new[metric],
+                                         new[metric] < old[metric] - accuracy_tolerance))
+
+    return {
+        "findings": findings,
+        "missing": missing,
+        "allow_missing": allow_missing,
+        "warnings": warnings,
+        "regressed": any(f["regression"] for f in findings) or bool(missing and not allow_missing),
+    }
+
+
+def print_comparison(result, verbose=False, file=None):
+    file = file or sys.stdout
+    for warning in result["warnings"]:
+        print(f"⚠️ {warning}", file=file)
+    mark = "⚠️" if result["allow_missing"] else "REGRESI"
+    for template, target in result["missing"]:
+        print(f"{mark} {template}/{target} tidak ada di hasil baru", file=file)
+    for f in result["findings"]:
+        if not (f["regression"] or verbose):
+            continue
+        mark = "REGRESI" if f["regression"] else "ok"
+        print(f"{mark:<8} {f['template']:<10} {f['target']:<32} {f['metric']:<18} "
+              f"{f['baseline']:>10.3f} -> {f['current']:>10.3f} ({f['change']:+.1%})", file=file)
+    regressions = sum(f["regression"] for f in result["findings"])
+    print(f"{regressions} regresi dari {len(result['findings'])} metrik", file=file)
+    if result["missing"]:
+        print(f"{len(result['missing'])} pasangan template/target baseline tidak ada", file=file)
+
+
+def add_tolerance_arguments(parser):
+    parser.add_argument("--throughput-tolerance", type=float, default=0.10,
+                        help="Penurunan gambar/s relatif yang masih diterima (default: 0.10)")
+    parser.add_argument("--latency-tolerance", type=float, default=0.15,
+                        help="Kenaikan latensi persentil relatif yang masih diterima (default: 0.15)")
+    parser.add_argument("--min-latency-ms", type=float, default=1.0,
+                        help="Kenaikan latensi absolut yang selalu diterima, ms (default: 1.0)")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.01,
+                        help="Penurunan akurasi absolut yang masih diterima (default: 0.01)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Template/target baseline yang tidak ada di hasil baru tidak dihitung regresi")
+
+
+def compare_with_baseline(report, name, args, baselines_dir=BASELINES_DIR):
+    """Compare a report with a stored baseline using the tolerances in args; print and return the result"""
+    result = compare(load_report(baseline_path(name, baselines_dir)), report,
+                     throughput_tolerance=args.throughput_tolerance, latency_tolerance=args.latency_tolerance,
+                     min_latency_ms=args.min_latency_ms, accuracy_tolerance=args.accuracy_tolerance,
+                     allow_missing=args.allow_missing)
+    print_comparison(result, verbose=getattr(args, "verbose", False))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simpan baseline benchmark dan deteksi regresi performa")
+    parser.add_argument("--baselines-dir", default=BASELINES_DIR, help="Folder baseline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    save = subparsers.add_parser("save", help="Simpan hasil benchmark sebagai baseline")
+    save.add_argument("results", help="File hasil dari 'runner run --output'")
+    save.add_argument("--name", required=True, help="Nama baseline, mis. main atau v1.2")
+
+    check = subparsers.add_parser("compare", help="Bandingkan hasil benchmark dengan baseline")
+    check.add_argument("results", help="File hasil dari 'runner run --output'")
+    check.add_argument("--baseline", required=True, help="Nama baseline atau path file JSON")
+    check.add_argument("--verbose", "-v", action="store_true", help="Tampilkan semua metrik, bukan hanya regresi")
+    add_tolerance_arguments(check)
+
+    subparsers.add_parser("list", help="Tampilkan baseline yang tersimpan")
+    args = parser.parse_args(argv)
+
+    if args.command == "save":
+        print(save_baseline(load_report(args.results), args.name, args.baselines_dir))
+    elif args.command == "list":
+        for name in list_baselines(args.baselines_dir):
+            print(name)
+    else:
+        result = compare_with_baseline(load_report(args.results), args.baseline, args, args.baselines_dir)
+        sys.exit(1 if result["regressed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Benchmark Runner Module
+
+Runs the OCR entry points over a synthetic dataset (see synthetic) and
+reports, per template and per target:
+
+- throughput (images/s and fields/s, wall clock)
+- per-field OCR latency (mean, p50, p90, p99 in ms)
+- character accuracy (1 - edit distance / ground-truth characters) and the
+  share of fields read exactly, after collapsing whitespace
+
+Targets:
+    run_ocr            the batch pipeline, reading its CSV output back
+    run_ocr_preview    the single-image preview path (base64 in, dict out)
+    enhanced:<name>    EnhancedOCR restricted to one preprocessing strategy,
+                       run on each field crop
+
+Usage:
+    python -m benchmarks.runner generate bench_data --count 20 --seed 0
+    python -m benchmarks.runner run bench_data --output results.json --workers 4
+    python -m benchmarks.runner run bench_data --baseline main   # regression gate
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import cv2
+from PIL import Image
+
+import profiling
+from benchmarks import regression, synthetic
+from extract import find_images, load_template_fields, run_ocr, run_ocr_preview
+from output_sinks import read_output
+
+
+def normalize_text(text):
+    return " ".join(str(text or "").split())
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0..100); 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(images, seconds, latencies, predictions, truth):
+    """
+    Build the result dict of one target on one template.
+
+    Args:
+        images: Number of images processed
+        seconds: Wall-clock time of the whole target
+        latencies: Per-field OCR latencies in seconds
+        predictions: Filename -> {field: text}
+        truth: Filename -> {field: text} (ground truth)
+    """
+    edits = chars = exact = fields = 0
+    for filename, expected in truth.items():
+        predicted = predictions.get(filename, {})
+        for name, text in expected.items():
+            text, guess = normalize_text(text), normalize_text(predicted.get(name))
+            edits += edit_distance(guess, text)
+            chars += len(text)
+            exact += guess == text
+            fields += 1
+    latencies_ms = [s * 1000.0 for s in latencies]
+    return {
+        "images": images,
+        "fields": fields,
+        "seconds": round(seconds, 4),
+        "images_per_s": round(images / seconds, 3) if seconds else 0.0,
+        "fields_per_s": round(fields / seconds, 3) if seconds else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies_ms) / len(latencies_ms), 3) if latencies_ms else 0.0,
+            "p50": round(percentile(latencies_ms, 50), 3),
+            "p90": round(percentile(latencies_ms, 90), 3),
+            "p99": round(percentile(latencies_ms, 99), 3),
+        },
+        "char_accuracy": round(max(0.0, 1.0 - edits / chars), 4) if chars else 1.0,
+        "exact_match": round(exact / fields, 4) if fields else 1.0,
+    }
+
+
+@contextlib.contextmanager
+def collect_span_latencies(stage="ocr"):
+    """Collect the durations of every profiling span named stage (any thread)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def listener(name, seconds):
+        if name == stage:
+            with lock:
+                latencies.append(seconds)
+
+    profiling.add_span_listener(listener)
+    try:
+        yield latencies
+    finally:
+        profiling.remove_span_listener(listener)
+
+
+def bench_run_ocr(template_dir, truth, workers=1, lang="eng+ind"):
+    template_path = os.path.join(template_dir, synthetic.TEMPLATE_FILENAME)
+    images_dir = os.path.join(template_dir, "images")
+    with tempfile.TemporaryDirectory() as output_dir, collect_span_latencies() as latencies:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            manifest = run_ocr(template_path, images_dir, output_dir=output_dir, output_format="csv",
+                               workers=workers, lang=lang)
+        seconds = time.perf_counter() - started
+        names, rows = read_output(os.path.join(output_dir, manifest["outputs"][0]))
+        predictions = {}
+        for row in rows:
+            row = dict(zip(names, row))
+            predictions[row["filename"]] = row
+    return summarize(len(truth), seconds, latencies, predictions, truth)
+
+
+def bench_preview(template_dir, truth):
+    fields = load_template_fields(os.path.join(template_dir, synthetic.TEMPLATE_FILENAME))
+    images_dir = os.path.join(template_dir, "images")
+    predictions = {}
+    with collect_span_latencies() as latencies:
+        started = time.perf_counter()
+        for filename in truth:
+            with open(os.path.join(images_dir, filename), "rb") as f:
+                image_b64 = base64.b64encode(f.read()).decode("ascii")
+            with contextlib.redirect_stdout(io.StringIO()):
+                predictions[filename] = run_ocr_preview({"image": image_b64, "fields": fields})
+        seconds = time.perf_counter() - started
+    return summarize(len(truth), seconds, latencies, predictions, truth)
+
+
+def bench_enhanced(template_dir, truth, strategy, lang="eng+ind"):
+    from enhanced_ocr import EnhancedOCR
+
+    ocr = EnhancedOCR(languages=lang)
+    ocr.strategies = [strategy]
+    fields = load_template_fields(os.path.join(template_dir, synthetic.TEMPLATE_FILENAME))
+    images_dir = os.path.join(template_dir, "images")
+    predictions = {}
+    latencies = []
+    started = time.perf_counter()
+    for filename in truth:
+        image = Image.fromarray(cv2.cvtColor(cv2.imread(os.path.join(images_dir, filename)), cv2.COLOR_BGR2RGB))
+        row = {}
+        for field in fields:
+            crop = image.crop((field["x"], field["y"], field["x"] + field["w"], field["y"] + field["h"]))
+            field_started = time.perf_counter()
+            row[field["name"]] = ocr.extract_text(crop)["text"]
+            latencies.append(time.perf_counter() - field_started)
+        predictions[filename] = row
+    seconds = time.perf_counter() - started
+    return summarize(len(truth), seconds, latencies, predictions, truth)
+
+
+def default_targets():
+    from enhanced_ocr import EnhancedOCR
+
+    return ["run_ocr", "run_ocr_preview"] + [f"enhanced:{name}" for name in EnhancedOCR().strategies]
+
+
+def environment():
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    try:
+        import pytesseract
+        info["tesseract"] = str(pytesseract.get_tesseract_version())
+    except Exception:
+        info["tesseract"] = None
+    return info
+
+
+def run_benchmarks(dataset_dir, targets=None, templates=None, workers=1, lang="eng+ind", limit=None):
+    """
+    Run every target on every template of a dataset.
+
+    Args:
+        dataset_dir: Folder written by synthetic.generate_dataset
+        targets: Target names (default: default_targets())
+        templates: Template names (default: all in the dataset)
+        workers: Workers for run_ocr
+        lang: Tesseract language
+        limit: Use only the first `limit` images of each template
+
+    Returns:
+        Dict with metadata and results[template][target] summaries
+    """
+    dataset = synthetic.load_dataset(dataset_dir)
+    targets = list(targets or default_targets())
+    results = {}
+    for template_name in templates or dataset["templates"]:
+        template_dir = os.path.join(dataset_dir, template_name)
+        truth = synthetic.load_ground_truth(template_dir)
+        if limit:
+            keep = set(find_images(os.path.join(template_dir, "images"))[:limit])
+            truth = {name: values for name, values in truth.items() if name in keep}
+        results[template_name] = {}
+        for target in targets:
+            print(f"[{template_name}] {target} ...", file=sys.stderr)
+            if target == "run_ocr":
+                summary = bench_run_ocr(template_dir, truth, workers=workers, lang=lang)
+            elif target == "run_ocr_preview":
+                summary = bench_preview(template_dir, truth)
+            elif target.startswith("enhanced:"):
+                summary = bench_enhanced(template_dir, truth, target.split(":", 1)[1], lang=lang)
+            else:
+                raise ValueError(f"Target tidak dikenal: {target}")
+            results[template_name][target] = summary
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "dataset": dataset,
+        "environment": environment(),
+        "workers": workers,
+        "lang": lang,
+        "results": results,
+    }
+
+
+def print_results(report, file=None):
+    file = file or sys.stdout
+    print(f"{'template':<10} {'target':<32} {'img/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+          f"{'akurasi':>8} {'tepat':>7}", file=file)
+    for template_name, targets in report["results"].items():
+        for target, r in targets.items():
+            latency = r["latency_ms"]
+            print(f"{template_name:<10} {target:<32} {r['images_per_s']:>8.2f} {latency['p50']:>8.1f} "
+                  f"{latency['p90']:>8.1f} {latency['p99']:>8.1f} {r['char_accuracy']:>8.2%} "
+                  f"{r['exact_match']:>7.1%}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark OCR dengan formulir sintetis")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Buat dataset formulir sintetis")
+    generate.add_argument("output_dir", help="Folder dataset")
+    generate.add_argument("--templates", nargs="+", choices=sorted(synthetic.TEMPLATES),
+                          help="Template yang dibuat (default: semua)")
+    generate.add_argument("--count", type=int, default=20, help="Gambar per template (default: 20)")
+    generate.add_argument("--seed", type=int, default=0, help="Seed acak (default: 0)")
+    generate.add_argument("--noise", type=float, default=8.0, help="Noise Gaussian maksimum (default: 8)")
+    generate.add_argument("--max-skew", type=float, default=1.0, help="Kemiringan maksimum dalam derajat (default: 1)")
+    generate.add_argument("--blank-ratio", type=float, default=0.1, help="Peluang field kosong (default: 0.1)")
+
+    run = subparsers.add_parser("run", help="Jalankan benchmark pada dataset")
+    run.add_argument("dataset_dir", help="Folder dataset dari 'generate'")
+    run.add_argument("--output", help="Simpan hasil ke file JSON ini")
+    run.add_argument("--targets", nargs="+", help="Target (default: run_ocr, run_ocr_preview, enhanced:<strategi>)")
+    run.add_argument("--templates", nargs="+", help="Template yang diuji (default: semua)")
+    run.add_argument("--workers", type=int, default=1, help="Worker untuk run_ocr (default: 1)")
+    run.add_argument("--lang", default="eng+ind", help="Bahasa Tesseract (default: eng+ind)")
+    run.add_argument("--limit", type=int, help="Hanya N gambar pertama per template")
+    run.add_argument("--save-baseline", metavar="NAME", help="Simpan hasil sebagai baseline NAME")
+    run.add_argument("--baseline", metavar="NAME",
+                     help="Bandingkan dengan baseline NAME; exit 1 jika ada regresi")
+    run.add_argument("--verbose", "-v", action="store_true", help="Tampilkan semua metrik perbandingan")
+    regression.add_tolerance_arguments(run)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        dataset = synthetic.generate_dataset(args.output_dir, templates=args.templates, count=args.count,
+                                             seed=args.seed, noise=args.noise, max_skew=args.max_skew,
+                                             blank_ratio=args.blank_ratio)
+        print(f"Dataset: {args.output_dir} ({len(dataset['templates'])} template x {dataset['count']} gambar, "
+              f"font: {', '.join(dataset['fonts'])})")
+        return
+
+    report = run_benchmarks(args.dataset_dir, targets=args.targets, templates=args.templates,
+                            workers=args.workers, lang=args.lang, limit=args.limit)
+    print_results(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Hasil: {args.output}")
+    if args.save_baseline:
+        print(f"Baseline: {regression.save_baseline(report, args.save_baseline)}")
+    if args.baseline:
+        result = regression.compare_with_baseline(report, args.baseline, args)
+        sys.exit(1 if result["regressed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
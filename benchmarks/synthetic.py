@@ -0,0 +1,262 @@
+"""
+Synthetic Forms Module
+
+Renders synthetic form images with PIL together with the template JSON the
+extractor uses and the exact text of every field (ground truth).
+
+Each template gets its own folder:
+
+    <output_dir>/<template>/template.json
+    <output_dir>/<template>/ground_truth.json
+    <output_dir>/<template>/images/<template>_0000.png ...
+
+Everything is derived from the seed, so a dataset can be regenerated
+byte-for-byte instead of being stored.
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+DATASET_FILENAME = "dataset.json"
+GROUND_TRUTH_FILENAME = "ground_truth.json"
+TEMPLATE_FILENAME = "template.json"
+
+FONT_CANDIDATES = (
+    "DejaVuSans.ttf",
+    "DejaVuSerif.ttf",
+    "DejaVuSansMono.ttf",
+    "LiberationSans-Regular.ttf",
+    "LiberationSerif-Regular.ttf",
+    "FreeSans.ttf",
+    "arial.ttf",
+    "times.ttf",
+    "cour.ttf",
+)
+
+FONT_DIRS = (
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    "C:\\Windows\\Fonts",
+)
+
+NAMES = ("Budi Santoso", "Siti Rahayu", "Dewi Lestari", "Ahmad Fauzi", "Agus Pratama",
+         "Rina Wulandari", "John Smith", "Emily Johnson", "Maria Garcia", "David Brown")
+STREETS = ("Jl. Merdeka No. 17", "Jl. Sudirman Kav. 52", "Jl. Gajah Mada 8", "Jl. Diponegoro No. 3",
+           "Jl. Pahlawan Gg. Mawar 21", "221 Baker Street", "14 Market Road", "Jl. Asia Afrika 65")
+CITIES = ("Jakarta", "Surabaya", "Bandung", "Yogyakarta", "Medan", "Denpasar", "Makassar",
+          "London", "Singapore")
+WORDS = ("pembayaran", "lunas", "pengiriman", "barang", "diterima", "tanggal", "jatuh", "tempo",
+         "mohon", "segera", "dikirim", "payment", "received", "order", "delivery", "invoice",
+         "pending", "approved", "catatan", "tambahan")
+
+
+def _date(rng):
+    return f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(1960, 2024)}"
+
+
+def _amount(rng):
+    return "Rp " + f"{rng.randint(10, 99999) * 1000:,}".replace(",", ".")
+
+
+GENERATORS = {
+    "name": lambda rng: rng.choice(NAMES),
+    "nik": lambda rng: "".join(str(rng.randint(0, 9)) for _ in range(16)),
+    "date": _date,
+    "street": lambda rng: rng.choice(STREETS),
+    "city": lambda rng: rng.choice(CITIES),
+    "invoice": lambda rng: f"INV-{rng.randint(2019, 2024)}-{rng.randint(1, 99999):05d}",
+    "amount": _amount,
+    "words": lambda rng: " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))),
+}
+
+# Template name -> page size and fields: (name, label, generator, x, y, w, h)
+TEMPLATES = {
+    "formulir": {
+        "size": (1000, 720),
+        "title": "FORMULIR PENDAFTARAN",
+        "fields": [
+            ("nama", "Nama", "name", 300, 120, 520, 50),
+            ("nik", "NIK", "nik", 300, 200, 520, 50),
+            ("tanggal_lahir", "Tanggal Lahir", "date", 300, 280, 300, 50),
+            ("alamat", "Alamat", "street", 300, 360, 620, 50),
+            ("kota", "Kota", "city", 300, 440, 400, 50),
+            ("catatan", "Catatan", "words", 300, 520, 640, 50),
+        ],
+    },
+    "invoice": {
+        "size": (900, 600),
+        "title": "INVOICE",
+        "fields": [
+            ("nomor", "No. Invoice", "invoice", 280, 110, 400, 48),
+            ("tanggal", "Tanggal", "date", 280, 185, 300, 48),
+            ("pelanggan", "Customer", "name", 280, 260, 500, 48),
+            ("total", "Total", "amount", 280, 335, 400, 48),
+            ("keterangan", "Keterangan", "words", 280, 410, 560, 48),
+        ],
+    },
+}
+
+
+def find_fonts(candidates=FONT_CANDIDATES, font_dirs=FONT_DIRS):
+    """Paths of the available TrueType fonts out of candidates, in candidate order"""
+    found = {}
+    for font_dir in font_dirs:
+        if not os.path.isdir(font_dir):
+            continue
+        for root, _, files in os.walk(font_dir):
+            for name in files:
+                if name in candidates and name not in found:
+                    found[name] = os.path.join(root, name)
+    return [found[name] for name in candidates if name in found]
+
+
+def load_font(path, size):
+    if path is None:
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            return ImageFont.load_default()  # Pillow < 10.1: fixed size bitmap font
+    return ImageFont.truetype(path, size)
+
+
+def _fit_font(draw, text, font_path, box_w, box_h):
+    """Largest font (up to 70% of the box height) whose text fits the box width"""
+    size = max(8, int(box_h * 0.7))
+    while True:
+        font = load_font(font_path, size)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        if (right - left <= box_w - 8 and bottom - top <= box_h - 4) or size <= 8 or font_path is None:
+            return font
+        size -= 2
+
+
+def render_form(template_name, values, rng, font_path=None, noise=0.0, skew=0.0):
+    """
+    Render one form.
+
+    Args:
+        template_name: Key of TEMPLATES
+        values: Field name -> text ("" leaves the field blank)
+        rng: random.Random for jitter
+        font_path: TrueType font, None for PIL's default font
+        noise: Standard deviation of Gaussian pixel noise
+        skew: Rotation in degrees (the page is rotated about its center)
+
+    Returns:
+        PIL RGB image
+    """
+    spec = TEMPLATES[template_name]
+    image = Image.new("RGB", spec["size"], "white")
+    draw = ImageDraw.Draw(image)
+
+    title_font = load_font(font_path, 36)
+    draw.text((40, 30), spec["title"], fill="black", font=title_font)
+    label_font = load_font(font_path, 22)
+    for name, label, _, x, y, w, h in spec["fields"]:
+        draw.text((40, y + h // 4), label + ":", fill="black", font=label_font)
+        draw.line((x, y + h + 4, x + w, y + h + 4), fill=(160, 160, 160), width=1)
+        text = values.get(name, "")
+        if not text:
+            continue
+        font = _fit_font(draw, text, font_path, w, h)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        ink = rng.randint(0, 60)
+        draw.text((x + 4 - left, y + (h - (bottom - top)) // 2 - top), text, fill=(ink, ink, ink), font=font)
+
+    if skew:
+        image = image.rotate(skew, resample=Image.BICUBIC, fillcolor="white")
+    if noise:
+        pixels = np.asarray(image, dtype=np.float32)
+        pixels += np.random.default_rng(rng.randrange(2 ** 32)).normal(0.0, noise, pixels.shape)
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return image
+
+
+def template_fields(template_name):
+    """Template JSON fields for a synthetic template (same format as the GUI creates)"""
+    return [{"name": name, "x": x, "y": y, "w": w, "h": h}
+            for name, _, _, x, y, w, h in TEMPLATES[template_name]["fields"]]
+
+
+def generate_template(output_dir, template_name, count=20, seed=0, noise=8.0, max_skew=1.0,
+                      blank_ratio=0.1, fonts=None):
+    """
+    Generate count images for one template.
+
+    Returns:
+        Path of the template folder
+    """
+    rng = random.Random(f"{template_name}:{seed}")
+    fonts = fonts if fonts is not None else (find_fonts() or [None])
+    template_dir = os.path.join(output_dir, template_name)
+    images_dir = os.path.join(template_dir, "images")
+    os.makedirs(images_dir, exist_ok=True)
+
+    with open(os.path.join(template_dir, TEMPLATE_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({"fields": template_fields(template_name)}, f, indent=4)
+
+    truth = {}
+    for i in range(count):
+        values = {}
+        for name, _, generator, *_ in TEMPLATES[template_name]["fields"]:
+            values[name] = "" if rng.random() < blank_ratio else GENERATORS[generator](rng)
+        font_path = fonts[i % len(fonts)]
+        skew = rng.uniform(-max_skew, max_skew) if max_skew else 0.0
+        image = render_form(template_name, values, rng, font_path=font_path,
+                            noise=rng.uniform(0, noise) if noise else 0.0, skew=skew)
+        filename = f"{template_name}_{i:04d}.png"
+        image.save(os.path.join(images_dir, filename))
+        truth[filename] = {
+            "values": values,
+            "font": os.path.basename(font_path) if font_path else "default",
+            "skew": round(skew, 3),
+        }
+
+    with open(os.path.join(template_dir, GROUND_TRUTH_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({"template": template_name, "images": truth}, f, indent=2, ensure_ascii=False)
+    return template_dir
+
+
+def generate_dataset(output_dir, templates=None, count=20, seed=0, noise=8.0, max_skew=1.0, blank_ratio=0.1):
+    """
+    Generate every template (or the given ones) and write dataset.json with the parameters.
+
+    Returns:
+        The dataset description dict
+    """
+    templates = list(templates or TEMPLATES)
+    fonts = find_fonts() or [None]
+    for template_name in templates:
+        generate_template(output_dir, template_name, count=count, seed=seed, noise=noise,
+                          max_skew=max_skew, blank_ratio=blank_ratio, fonts=fonts)
+    dataset = {
+        "templates": templates,
+        "count": count,
+        "seed": seed,
+        "noise": noise,
+        "max_skew": max_skew,
+        "blank_ratio": blank_ratio,
+        "fonts": [os.path.basename(path) if path else "default" for path in fonts],
+    }
+    with open(os.path.join(output_dir, DATASET_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(dataset, f, indent=2)
+    return dataset
+
+
+def load_dataset(dataset_dir):
+    with open(os.path.join(dataset_dir, DATASET_FILENAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_ground_truth(template_dir):
+    """Filename -> {field: text}"""
+    with open(os.path.join(template_dir, GROUND_TRUTH_FILENAME), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {filename: entry["values"] for filename, entry in data["images"].items()}
@@ -1,9 +1,10 @@
 import cv2
 import numpy as np
-import pytesseract
 from PIL import Image
 import time
 
+from profiling import span
+
 class EnhancedOCR:
     def __init__(self, languages="eng", confidence_threshold=0.5):
         self.languages = languages
@@ -37,8 +38,10 @@ class EnhancedOCR:
         # Try different preprocessing strategies
         for strategy in self.strategies:
             try:
-                processed_image = self._apply_preprocessing(pil_image, strategy)
-                text, confidence = self._ocr_with_confidence(processed_image)
+                with span("preprocess", strategy=strategy):
+                    processed_image = self._apply_preprocessing(pil_image, strategy)
+                with span("ocr", strategy=strategy):
+                    text, confidence = self._ocr_with_confidence(processed_image)
 
                 if debug:
                     print(f"Strategy: {strategy}, Confidence: {confidence:.3f}, Text: '{text[:50]}...'")
@@ -94,6 +97,9 @@ class EnhancedOCR:
 
     def _ocr_with_confidence(self, image):
         """Perform OCR and calculate confidence score"""
+        # Imported on first OCR: pytesseract also imports pandas when installed
+        import pytesseract
+
         try:
             # Get detailed OCR data
             data = pytesseract.image_to_data(
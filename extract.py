@@ -1,13 +1,30 @@
 import os
 import json
+import argparse
+import contextlib
+import hashlib
+import heapq
 import cv2
-import pytesseract
-import pandas as pd
 import sys
 import base64
 import numpy as np
 from PIL import Image
 import io
+import time
+from datetime import datetime
+
+from batch_engine import BatchEngine, MemoryBudget, prefetch
+from metrics import TextfileExporter, metrics
+from phash import HASH_BITS, HashIndex, fields_hash, image_hash
+from profiling import profile_session, span
+from resource_manager import plan_resources, thread_limit
+from result_cache import ResultCache, template_digest
+from output_sinks import MANIFEST_SUFFIX, normalize_format, open_sink, output_columns, read_output
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# Crop dengan simpangan baku piksel di bawah ini dianggap kosong dan tidak di-OCR
+BLANK_STDDEV = 2.0
 
 
 def decode_base64_image(base64_string):
@@ -18,18 +35,100 @@ def decode_base64_image(base64_string):
     return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
 
 
-def run_ocr_preview(input_data):
-    """Jalankan OCR preview untuk single image"""
-    print("=== OCR PREVIEW START ===")
+def load_template_fields(template_path):
+    """Baca template JSON dan kembalikan daftar field-nya"""
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
 
-    image_b64 = input_data.get("image")
-    fields = input_data.get("fields", [])
+    with open(template_path, "r", encoding="utf-8") as f:
+        template = json.load(f)
 
-    if not image_b64:
-        raise ValueError("No image data provided")
+    if "fields" not in template:
+        raise KeyError("Template JSON tidak memiliki key 'fields'")
 
-    # Decode gambar dari base64
-    image = decode_base64_image(image_b64)
+    return template["fields"]
+
+
+def find_images(image_folder, recursive=False):
+    """Daftar nama file gambar di folder, terurut agar hasil dan dedup deterministik
+
+    Dengan recursive=True subfolder ikut dibaca; hasilnya path relatif
+    terhadap image_folder dengan pemisah "/".
+    """
+    if not recursive:
+        return sorted(
+            name for name in os.listdir(image_folder)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    images = []
+    for root, dirs, files in os.walk(image_folder):
+        dirs.sort()
+        relative_root = os.path.relpath(root, image_folder)
+        for name in files:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                relative = name if relative_root == "." else os.path.join(relative_root, name)
+                images.append(relative.replace(os.sep, "/"))
+    return sorted(images)
+
+
+def shard_of(relative_path, shard_count):
+    """Nomor shard (0..shard_count-1) untuk sebuah file; stabil di semua mesin dan proses"""
+    key = relative_path.replace(os.sep, "/").encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def shard_basename(shard_index, shard_count, basename="hasil_ocr"):
+    """Nama dasar output parsial satu shard, mis. hasil_ocr.shard-02-of-08"""
+    width = len(str(shard_count))
+    return f"{basename}.shard-{shard_index:0{width}d}-of-{shard_count:0{width}d}"
+
+
+def write_manifest(output_dir, manifest, basename="hasil_ocr"):
+    """Tulis manifest hasil (JSON) ke output_dir dan kembalikan path-nya"""
+    path = os.path.join(output_dir, basename + MANIFEST_SUFFIX)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_stats(stats_path, manifest, engine_stats):
+    """Tulis statistik run (manifest + counter engine + throughput) sebagai JSON"""
+    elapsed = manifest.get("elapsed_s") or 0
+    stats = dict(manifest)
+    stats["engine"] = engine_stats
+    stats["images_per_s"] = round(manifest["rows"] / elapsed, 3) if elapsed else None
+    directory = os.path.dirname(stats_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(stats_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    return stats_path
+
+
+def fields_bounds(fields, padding=0):
+    """Kembalikan bounding box gabungan semua field sebagai (left, top, width, height)"""
+    if not fields:
+        return None
+    left = min(f["x"] for f in fields) - padding
+    top = min(f["y"] for f in fields) - padding
+    right = max(f["x"] + f["w"] for f in fields) + padding
+    bottom = max(f["y"] + f["h"] for f in fields) + padding
+    left, top = max(0, left), max(0, top)
+    return (left, top, right - left, bottom - top)
+
+
+def offset_fields(fields, dx, dy):
+    """Salin field dengan koordinat digeser (mis. relatif ke area capture)"""
+    return [dict(field, x=field["x"] + dx, y=field["y"] + dy) for field in fields]
+
+
+def extract_fields(image, fields, lang="eng+ind"):
+    """OCR semua field template dari gambar OpenCV (BGR numpy array) di memori"""
+    # Diimpor saat OCR pertama: pytesseract ikut mengimpor pandas jika terpasang (lambat)
+    import pytesseract
 
     results = {}
 
@@ -40,14 +139,21 @@ def run_ocr_preview(input_data):
             w = field["w"]
             h = field["h"]
 
-            # Crop area
-            crop = image[y:y + h, x:x + w]
+            # Crop area (clamped so fields outside a capture region stay empty)
+            with span("crop", field=field["name"]):
+                crop = image[max(0, y):y + h, max(0, x):x + w]
+            if is_blank(crop):
+                metrics.inc("blank_fields")
+                results[field["name"]] = ""
+                continue
 
             # OCR
-            text = pytesseract.image_to_string(
-                crop,
-                lang="eng+ind"
-            ).strip()
+            metrics.inc("fields_ocr")
+            with span("ocr", field=field["name"]):
+                text = pytesseract.image_to_string(
+                    crop,
+                    lang=lang
+                ).strip()
 
             results[field["name"]] = text
 
@@ -58,168 +164,525 @@ def run_ocr_preview(input_data):
     return results
 
 
-def run_ocr(template_path, image_folder, output_dir="/data", output_format="csv"):
-    print("=== OCR BATCH START ===")
-    print(f"Template path : {template_path}")
-    print(f"Image folder  : {image_folder}")
-    print(f"Output dir    : {output_dir}")
-    print(f"Output format : {output_format}")
-=======
-class OCRGuiApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("OCR Template Extractor")
-        self.root.geometry("500x550")
-        self.root.resizable(False, False)
->>>>>>> origin/main
-
-    # --- Validasi path ---
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
-
-    if not os.path.isdir(image_folder):
-        raise NotADirectoryError(f"Folder gambar tidak ditemukan: {image_folder}")
-
-    # --- Load template ---
-    with open(template_path, "r", encoding="utf-8") as f:
-        template = json.load(f)
-
-    if "fields" not in template:
-        raise KeyError("Template JSON tidak memiliki key 'fields'")
-
-<<<<<<< HEAD
-    fields = template["fields"]
-    rows = []
+def text_with_confidence(crop, lang="eng+ind"):
+    """OCR satu crop; kembalikan (teks image_to_string, rata-rata confidence kata dari image_to_data)"""
+    import pytesseract
+
+    text = pytesseract.image_to_string(crop, lang=lang).strip()
+
+    # image_to_data hanya dipakai untuk confidence; teks tetap dari image_to_string
+    data = pytesseract.image_to_data(crop, lang=lang, output_type=pytesseract.Output.DICT)
+    confidences = [float(conf) for word, conf in zip(data["text"], data["conf"])
+                   if word.strip() and float(conf) >= 0]
+    confidence = round(sum(confidences) / len(confidences), 2) if confidences else None
+    return text, confidence
+
+
+def is_blank(crop):
+    """True jika crop kosong atau hampir seragam (tidak ada teks untuk dibaca)"""
+    return crop.size == 0 or float(crop.std()) < BLANK_STDDEV
+
+
+def ocr_field(image, field, lang="eng+ind", confidence=False):
+    """OCR satu field; kembalikan {name: teks}, plus {name_conf: confidence} jika confidence=True"""
+    import pytesseract
+
+    name = field["name"]
+    conf = None
+    try:
+        x, y, w, h = field["x"], field["y"], field["w"], field["h"]
+        with span("crop", field=name):
+            crop = image[max(0, y):y + h, max(0, x):x + w]
+        if is_blank(crop):
+            metrics.inc("blank_fields")
+            text = ""
+        else:
+            metrics.inc("fields_ocr")
+            with span("ocr", field=name):
+                if confidence:
+                    text, conf = text_with_confidence(crop, lang=lang)
+                else:
+                    text = pytesseract.image_to_string(crop, lang=lang).strip()
+    except Exception as e:
+        print(f"  [ERROR] Field {field.get('name', '?')}: {e}")
+        text, conf = "", None
+    if confidence:
+        return {name: text, name + "_conf": conf}
+    return {name: text}
+
+
+def extract_fields_with_confidence(image, fields, lang="eng+ind"):
+    """Seperti extract_fields, tetapi juga mengisi kolom <name>_conf"""
+    results = {}
 
-    images = os.listdir(image_folder)
-    print(f"Jumlah file di folder gambar: {len(images)}")
+    for field in fields:
+        results.update(ocr_field(image, field, lang=lang, confidence=True))
 
-    for filename in images:
-        if not filename.lower().endswith((".png", ".jpg", ".jpeg")):
-            continue
-=======
-        # --- LOG AREA ---
-        tk.Label(root, text="Log:").pack()
-        self.log_area = scrolledtext.ScrolledText(root, width=60, height=10)
-        self.log_area.pack(padx=10, pady=5)
-
-        # --- PREVIEW AREA ---
-        tk.Label(root, text="Preview Hasil Ekstraksi:").pack()
-        self.preview_area = scrolledtext.ScrolledText(root, width=60, height=10)
-        self.preview_area.pack(padx=10, pady=5)
-
-    def log(self, text):
-        self.log_area.insert(tk.END, text + "\n")
-        self.log_area.see(tk.END)
-        self.root.update_idletasks()
-
-    def preview(self, text):
-        self.preview_area.insert(tk.END, text + "\n")
-        self.preview_area.see(tk.END)
-
-    def load_template(self):
-        path = filedialog.askopenfilename(
-            initialdir=os.getcwd(),
-            title="Pilih Template JSON",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
-        )
-        if path:
-            self.template_path = path
-            self.log(f"Template dipilih: {path}")
->>>>>>> origin/main
+    return results
 
-        img_path = os.path.join(image_folder, filename)
-        print(f"Processing: {filename}")
 
+def process_image(img_path, fields, lang="eng+ind", image=None, confidence=False):
+    """OCR satu file gambar dengan template; kembalikan baris hasil atau None jika gagal dibaca"""
+    if image is None:
         image = cv2.imread(img_path)
-        if image is None:
-            print(f"  [SKIP] Tidak bisa membaca gambar")
-            continue
+    if image is None:
+        print(f"  [SKIP] Tidak bisa membaca gambar")
+        return None
 
-        data = {"filename": filename}
+    data = {"filename": os.path.basename(img_path)}
+    if confidence:
+        data.update(extract_fields_with_confidence(image, fields, lang=lang))
+    else:
+        data.update(extract_fields(image, fields, lang=lang))
+    return data
 
-        for field in fields:
-            try:
-                x = field["x"]
-                y = field["y"]
-                w = field["w"]
-                h = field["h"]
 
-                crop = image[y:y + h, x:x + w]
+def run_ocr_preview(input_data, profile=None):
+    """Jalankan OCR preview untuk single image (profile: prefix file profil, opsional)"""
+    print("=== OCR PREVIEW START ===")
 
-                text = pytesseract.image_to_string(
-                    crop,
-                    lang="eng+ind"
-                ).strip()
+    image_b64 = input_data.get("image")
+    fields = input_data.get("fields", [])
 
-                data[field["name"]] = text
+    if not image_b64:
+        raise ValueError("No image data provided")
 
-<<<<<<< HEAD
-            except Exception as e:
-                print(f"  [ERROR] Field {field.get('name', '?')}: {e}")
-                data[field["name"]] = ""
-=======
-        self.log("\n=== Mulai proses OCR ===")
-        self.preview_area.delete(1.0, tk.END)  # Clear preview area
->>>>>>> origin/main
+    with profile_session(profile):
+        # Decode gambar dari base64
+        with span("decode"):
+            image = decode_base64_image(image_b64)
+
+        return extract_fields(image, fields)
+
+
+def run_ocr(template_path, image_folder, output_dir="/data", output_format="csv", dedup_distance=None,
+            shard_index=None, shard_count=None, workers=1, lang="eng+ind",
+            prefetch_images=8, io_workers=2, max_memory_mb=1024, tesseract_threads=None,
+            recursive=False, cache_dir=None, stats_path=None):
+    """
+    OCR semua gambar di folder dengan template dan simpan hasilnya.
+
+    output_format: csv, excel, parquet atau sqlite. Baris ditulis bertahap
+    ke output selama batch berjalan (lihat output_sinks).
+
+    dedup_distance: jika diisi, gambar yang perceptual hash-nya berjarak
+    Hamming <= nilai ini dari gambar sebelumnya tidak di-OCR ulang; barisnya
+    menyalin hasil gambar tersebut dan kolom duplicate_of berisi namanya.
+    Hash dihitung hanya dari area field template (64 bit per field), karena
+    formulir berbeda dengan template yang sama hampir identik sebagai satu
+    halaman. 0 = hanya hash identik (disarankan).
+
+    image_folder boleh berupa satu file gambar. Ringkasan hasil (file output
+    relatif terhadap output_dir, jumlah baris, dst.) ditulis ke
+    hasil_ocr.manifest.json dan juga dikembalikan sebagai dict.
+
+    shard_index/shard_count: hanya proses file yang shard_of(path relatif)
+    == shard_index, dan tulis output/manifest parsial sendiri
+    (hasil_ocr.shard-XX-of-YY.*). Gabungkan dengan merge_shards(). Dedup
+    hanya berlaku di dalam satu shard.
+
+    workers: jumlah thread OCR. Pekerjaan dijadwalkan per (gambar, field)
+    dengan work stealing (lihat batch_engine); urutan baris tetap sama.
+    tesseract_threads: thread OpenMP per panggilan tesseract; default
+    CPU // workers agar workers x thread tidak melebihi jumlah core.
+
+    prefetch_images/io_workers/max_memory_mb: gambar berikutnya dibaca dan
+    di-decode lebih dulu oleh thread I/O, maksimal prefetch_images gambar dan
+    max_memory_mb MB gambar ter-decode di memori sekaligus.
+
+    recursive: sertakan subfolder; kolom filename berisi path relatif.
+    cache_dir: simpan hasil per gambar di SQLite (lihat result_cache);
+    gambar yang tidak berubah tidak di-OCR ulang, sehingga run yang terputus
+    bisa dilanjutkan. stats_path: tulis manifest + statistik ke file JSON.
+    """
+    started_at = datetime.now()
+    started = time.perf_counter()
+    print("=== OCR BATCH START ===")
+    print(f"Template path : {template_path}")
+    print(f"Image folder  : {image_folder}")
+    print(f"Output dir    : {output_dir}")
+    print(f"Output format : {output_format}")
+    workers, tesseract_threads = plan_resources(workers, tesseract_threads)
+    print(f"Workers       : {workers} x {tesseract_threads} thread tesseract")
+    if dedup_distance is not None:
+        print(f"Dedup distance: {dedup_distance}")
 
-        rows.append(data)
+    # --- Load template ---
+    fields = load_template_fields(template_path)
 
-    if not rows:
+    # --- Validasi path ---
+    if os.path.isfile(image_folder):
+        images = [os.path.basename(image_folder)]
+        image_folder = os.path.dirname(image_folder) or "."
+    elif os.path.isdir(image_folder):
+        with span("discovery"):
+            images = find_images(image_folder, recursive=recursive)
+    else:
+        raise NotADirectoryError(f"Folder gambar tidak ditemukan: {image_folder}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    basename = "hasil_ocr"
+    if shard_count:
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_index harus 0..{shard_count - 1}")
+        images = [name for name in images if shard_of(name, shard_count) == shard_index]
+        basename = shard_basename(shard_index, shard_count)
+        print(f"Shard         : {shard_index + 1}/{shard_count}")
+
+    hash_index = None
+    if dedup_distance is not None:
+        hash_index = HashIndex(dedup_distance, bits=HASH_BITS * max(1, len(fields)))
+    results_by_file = {}
+    duplicates = 0
+    skipped = 0
+
+    print(f"Jumlah gambar di folder: {len(images)}")
+
+    extra = [("duplicate_of", "text")] if hash_index is not None else []
+    # Kolom <name>_conf hanya untuk format kolumnar; skema CSV/Excel tetap seperti semula
+    confidence = normalize_format(output_format) in ("parquet", "sqlite")
+    columns = output_columns(fields, confidence=confidence, extra=extra)
+    sink = open_sink(output_format, output_dir, columns, basename=basename)
+
+    cache = ResultCache(cache_dir, template_digest(fields, lang, confidence)) if cache_dir else None
+    relpaths = {os.path.join(image_folder, name): name for name in images}
+
+    def decode(img_path):
+        # Cache lookups run on the decode threads; a hit returns (row, phash) instead of pixels
+        if cache is not None:
+            cached = cache.get(relpaths[img_path], img_path)
+            if cached is not None:
+                return cached
+        with span("decode", file=relpaths[img_path]):
+            return cv2.imread(img_path)
+
+    budget = MemoryBudget(max_memory_mb)
+    reserved = {}  # filename -> bytes reserved in the budget until OCR is done
+
+    def release(filename):
+        budget.release(reserved.pop(filename, 0))
+
+    def decoded_images():
+        """Baca gambar berurutan; duplikat dan hasil cache diteruskan tanpa OCR (image None)"""
+        nonlocal skipped
+        for img_path, image, nbytes in prefetch(list(relpaths), decode, ahead=prefetch_images,
+                                                io_workers=io_workers, budget=budget):
+            filename = relpaths[img_path]
+            print(f"Processing: {filename}")
+
+            if isinstance(image, tuple):
+                print(f"  [CACHE] hasil sebelumnya dipakai")
+                metrics.inc("cache_hits")
+                reserved[filename] = nbytes
+                row, phash = image
+                kind, value = "cached", row
+            elif image is None:
+                print(f"  [SKIP] Tidak bisa membaca gambar")
+                budget.release(nbytes)
+                skipped += 1
+                metrics.inc("images_skipped")
+                continue
+            else:
+                reserved[filename] = nbytes
+                phash = None
+                if hash_index is not None:
+                    phash = fields_hash(image, fields) if fields else image_hash(image)
+                kind, value = None, None
+
+            if hash_index is not None and phash is not None:
+                match = hash_index.add_or_find(phash, filename)
+                if match is not None:
+                    original, distance = match
+                    print(f"  [DUPLIKAT] sama dengan {original} (jarak {distance})")
+                    yield filename, None, ("duplicate", original, phash)
+                    continue
+
+            yield filename, (image if kind is None else None), (kind, value, phash)
+
+    engine = BatchEngine(fields, lambda image, field: ocr_field(image, field, lang=lang, confidence=confidence),
+                         workers=workers)
+
+    with sink, thread_limit(tesseract_threads):
+        for filename, results, (kind, value, phash) in engine.map(decoded_images(), on_release=release):
+            if kind == "duplicate":
+                # Original selalu keluar lebih dulu karena urutan input dipertahankan
+                original = results_by_file[value]
+                results = {k: v for k, v in original.items() if k not in ("filename", "duplicate_of")}
+                data = dict(original, filename=filename, duplicate_of=value)
+                duplicates += 1
+                metrics.inc("duplicates")
+            else:
+                if kind == "cached":
+                    results = value
+                data = {"filename": filename}
+                data.update(results)
+                if hash_index is not None:
+                    results_by_file[filename] = data
+            if cache is not None and kind != "cached":
+                cache.put(filename, os.path.join(image_folder, filename), results, phash)
+
+            # --- Tulis baris langsung ke output (bertahap per batch) ---
+            with span("write"):
+                sink.write(data)
+            metrics.inc("images_processed")
+
+    if cache is not None:
+        cache.close()
+    if sink.rows_written == 0:
         print("⚠️ Tidak ada data OCR yang dihasilkan")
+    if hash_index is not None:
+        print(f"Duplikat dilewati: {duplicates}")
+    manifest = {
+        "status": "ok",
+        "template": template_path,
+        "input": image_folder,
+        "format": normalize_format(output_format),
+        "outputs": [os.path.basename(sink.path)],
+        "columns": columns,
+        "images": len(images),
+        "rows": sink.rows_written,
+        "duplicates": duplicates,
+        "skipped": skipped,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "workers": engine.workers,
+        "tesseract_threads": tesseract_threads,
+        "steals": engine.stats["steals"],
+        "peak_decoded_mb": round(budget.peak / (1024 * 1024), 1),
+        "cache_hits": cache.hits if cache is not None else 0,
+    }
+    if shard_count:
+        manifest["shard"] = {"index": shard_index, "count": shard_count}
+    manifest_path = write_manifest(output_dir, manifest, basename)
+    if stats_path:
+        write_stats(stats_path, manifest, engine.stats)
 
-    # --- Simpan output berdasarkan format ---
-    df = pd.DataFrame(rows)
-
-    if output_format.lower() == "excel":
-        output_path = os.path.join(output_dir, "hasil_ocr.xlsx")
-        df.to_excel(output_path, index=False, engine='openpyxl')
-    else:  # default to csv
-        output_path = os.path.join(output_dir, "hasil_ocr.csv")
-        df.to_csv(output_path, index=False, encoding="utf-8")
-
-<<<<<<< HEAD
     print(f"=== OCR SELESAI ===")
-    print(f"Output file: {output_path}")
-=======
-                # Crop + OCR tiap field
-                for field in fields:
-                    try:
-                        x, y, w, h = field["x"], field["y"], field["w"], field["h"]
-                        crop = image[y:y+h, x:x+w]
-                        text = pytesseract.image_to_string(crop, lang="eng+ind").strip()
-                        data[field["name"]] = text
-                    except Exception as e:
-                        self.log(f"[ERROR] Field {field['name']} gagal diambil: {e}")
-                        data[field["name"]] = ""
-
-                rows.append(data)
-                self.log(f"[OK] Extracted: {filename}")
-
-                # Preview hasil ekstraksi
-                preview_text = f"--- {filename} ---\n"
-                for field in fields:
-                    preview_text += f"{field['name']}: {data[field['name']]}\n"
-                self.preview(preview_text)
-
-        # Save CSV
-        df = pd.DataFrame(rows)
-        df.to_csv("hasil_ocr.csv", index=False, encoding="utf-8")
-
-        self.log("\nSelesai! Data disimpan ke hasil_ocr.csv")
-        messagebox.showinfo("Selesai", "OCR selesai!\nFile: hasil_ocr.csv")
->>>>>>> origin/main
+    print(f"Output file: {sink.path}")
+    print(f"Manifest   : {manifest_path}")
+    return manifest
+
+
+def estimate_runtime(template_path, image_folder, sample=3, workers=1, recursive=False, lang="eng+ind",
+                     shard_index=None, shard_count=None):
+    """
+    Perkirakan durasi total batch tanpa menulis output: OCR beberapa gambar
+    contoh (tersebar merata) dan ekstrapolasi ke seluruh folder.
+    """
+    fields = load_template_fields(template_path)
+    if os.path.isfile(image_folder):
+        images = [os.path.basename(image_folder)]
+        image_folder = os.path.dirname(image_folder) or "."
+    else:
+        images = find_images(image_folder, recursive=recursive)
+    if shard_count:
+        images = [name for name in images if shard_of(name, shard_count) == shard_index]
+    if not images:
+        raise FileNotFoundError(f"Tidak ada gambar di {image_folder}")
+
+    step = max(1, len(images) // max(1, sample))
+    chosen = images[::step][:sample]
+    decode_s = ocr_s = 0.0
+    for name in chosen:
+        started = time.perf_counter()
+        image = cv2.imread(os.path.join(image_folder, name))
+        decode_s += time.perf_counter() - started
+        if image is None:
+            continue
+        started = time.perf_counter()
+        for field in fields:
+            ocr_field(image, field, lang=lang)
+        ocr_s += time.perf_counter() - started
+
+    workers, threads = plan_resources(workers, None)
+    per_image = (decode_s + ocr_s) / len(chosen)
+    # Decode overlaps with OCR (prefetch), OCR is spread over the workers per field
+    estimated = max(decode_s / len(chosen), ocr_s / len(chosen) / workers) * len(images)
+    return {
+        "images": len(images),
+        "fields": len(fields),
+        "sampled": len(chosen),
+        "decode_s_per_image": round(decode_s / len(chosen), 4),
+        "ocr_s_per_image": round(ocr_s / len(chosen), 4),
+        "sequential_s": round(per_image * len(images), 1),
+        "workers": workers,
+        "estimated_s": round(estimated, 1),
+    }
+
+
+def merge_shards(output_dir, output_format=None, basename="hasil_ocr"):
+    """
+    Gabungkan output parsial semua shard di output_dir menjadi satu file
+    terurut berdasarkan filename, plus satu manifest gabungan.
+    """
+    suffix = MANIFEST_SUFFIX
+    manifests = []
+    for name in sorted(os.listdir(output_dir)):
+        if name.startswith(basename + ".shard-") and name.endswith(suffix):
+            with open(os.path.join(output_dir, name), "r", encoding="utf-8") as f:
+                manifests.append(json.load(f))
+    if not manifests:
+        raise FileNotFoundError(f"Tidak ada manifest shard di {output_dir}")
+
+    shard_count = manifests[0]["shard"]["count"]
+    found = sorted(m["shard"]["index"] for m in manifests)
+    if found != list(range(shard_count)):
+        missing = sorted(set(range(shard_count)) - set(found))
+        raise ValueError(f"Shard belum lengkap, belum ada: {missing}")
+
+    columns = [tuple(column) for column in manifests[0]["columns"]]
+    for manifest in manifests[1:]:
+        for column in manifest["columns"]:
+            if tuple(column) not in columns:
+                columns.append(tuple(column))
+    output_format = output_format or manifests[0]["format"]
+
+    # Setiap shard sudah terurut berdasarkan filename -> k-way merge
+    streams = []
+    for manifest in manifests:
+        for output in manifest["outputs"]:
+            names, rows = read_output(os.path.join(output_dir, output), manifest["format"])
+            streams.append(dict(zip(names, row)) for row in rows)
+
+    sink = open_sink(output_format, output_dir, columns, basename=basename)
+    with sink:
+        for row in heapq.merge(*streams, key=lambda row: row["filename"] or ""):
+            sink.write(row)
+
+    manifest = {
+        "status": "ok",
+        "template": manifests[0]["template"],
+        "input": manifests[0]["input"],
+        "format": normalize_format(output_format),
+        "outputs": [os.path.basename(sink.path)],
+        "columns": columns,
+        "images": sum(m["images"] for m in manifests),
+        "rows": sink.rows_written,
+        "duplicates": sum(m["duplicates"] for m in manifests),
+        "skipped": sum(m["skipped"] for m in manifests),
+        "started_at": min(m["started_at"] for m in manifests),
+        "elapsed_s": max(m["elapsed_s"] for m in manifests),
+        "merged_shards": shard_count,
+    }
+    write_manifest(output_dir, manifest, basename)
+    print(f"Gabungan {shard_count} shard: {sink.path} ({sink.rows_written} baris)")
+    return manifest
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "preview":
+        parser = argparse.ArgumentParser(prog="extract.py preview",
+                                         description="OCR preview satu gambar dengan template (hasil JSON)")
+        parser.add_argument("template", help="Template JSON")
+        parser.add_argument("image", help="File gambar")
+        parser.add_argument("--profile", metavar="PREFIX", help="Tulis PREFIX.prof dan PREFIX.trace.json")
+        args = parser.parse_args(argv[1:])
+        with open(args.image, "rb") as f:
+            image_b64 = base64.b64encode(f.read()).decode("ascii")
+        results = run_ocr_preview({"image": image_b64, "fields": load_template_fields(args.template)},
+                                  profile=args.profile)
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    if argv and argv[0] == "merge":
+        parser = argparse.ArgumentParser(prog="extract.py merge",
+                                         description="Gabungkan output parsial semua shard")
+        parser.add_argument("output_dir", help="Folder berisi output dan manifest shard")
+        parser.add_argument("--format", dest="output_format",
+                            help="Format output gabungan (default: sama dengan shard)")
+        args = parser.parse_args(argv[1:])
+        merge_shards(args.output_dir, args.output_format)
+        return
+
+    parser = argparse.ArgumentParser(
+        description="OCR batch dengan template",
+        epilog="Gabungkan shard: python extract.py merge output_dir [--format csv]\n"
+               "Preview satu gambar: python extract.py preview template.json gambar.png",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("template", help="Template JSON")
+    parser.add_argument("image_folder", help="Folder gambar (atau satu file gambar)")
+    parser.add_argument("output_dir", nargs="?", default="/data", help="Folder output (default: /data)")
+    parser.add_argument("output_format", nargs="?", default="csv",
+                        help="csv, excel, parquet atau sqlite (default: csv)")
+    parser.add_argument("--format", dest="format_option", help="Sama dengan output_format posisional")
+    parser.add_argument("--recursive", "-r", action="store_true", help="Sertakan gambar di subfolder")
+    parser.add_argument("--lang", default="eng+ind", help="Bahasa Tesseract (default: eng+ind)")
+    parser.add_argument("--dedup-distance", type=int,
+                        help="Lewati gambar duplikat: jarak Hamming maksimum antar hash area field "
+                             "(0 = hanya identik, disarankan)")
+
+    performance = parser.add_argument_group("performa")
+    performance.add_argument("--workers", type=int, default=1, help="Jumlah worker OCR paralel (default: 1)")
+    performance.add_argument("--tesseract-threads", type=int,
+                             help="Thread OpenMP per tesseract (default: CPU / workers)")
+    performance.add_argument("--prefetch", type=int, default=8,
+                             help="Gambar yang di-decode lebih dulu (default: 8)")
+    performance.add_argument("--io-workers", type=int, default=2, help="Thread baca/decode (default: 2)")
+    performance.add_argument("--max-memory-mb", type=int, default=1024,
+                             help="Batas memori gambar ter-decode dalam MB (default: 1024)")
+
+    caching = parser.add_argument_group("cache / resume")
+    caching.add_argument("--cache-dir", help="Folder cache hasil OCR (SQLite)")
+    caching.add_argument("--resume", action="store_true",
+                         help="Lanjutkan run sebelumnya; memakai cache di <output_dir>/.ocr_cache "
+                              "jika --cache-dir tidak diisi")
+
+    sharding = parser.add_argument_group("sharding")
+    sharding.add_argument("--shard-index", type=int, help="Nomor shard yang diproses mesin ini (0-based)")
+    sharding.add_argument("--shard-count", type=int, help="Jumlah total shard")
+
+    reporting = parser.add_argument_group("laporan")
+    reporting.add_argument("--stats", dest="stats_path", help="Tulis statistik run ke file JSON ini")
+    reporting.add_argument("--dry-run", action="store_true",
+                           help="Hanya perkirakan durasi dengan OCR beberapa gambar contoh")
+    reporting.add_argument("--profile", metavar="PREFIX",
+                           help="Tulis profil cProfile (PREFIX.prof) dan trace Chrome (PREFIX.trace.json)")
+    reporting.add_argument("--metrics-file",
+                           help="Tulis metrik format Prometheus ke file ini secara berkala "
+                                "(textfile collector node-exporter, mis. /var/lib/node_exporter/ocr.prom)")
+    reporting.add_argument("--metrics-interval", type=float, default=15.0,
+                           help="Interval penulisan --metrics-file dalam detik (default: 15)")
+    reporting.add_argument("--sample", type=int, default=3, help="Jumlah gambar contoh untuk --dry-run (default: 3)")
+    args = parser.parse_args(argv)
+
+    if (args.shard_index is None) != (args.shard_count is None):
+        parser.error("--shard-index dan --shard-count harus dipakai bersama")
+    if args.shard_count is not None and not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index harus 0..shard-count-1")
+    output_format = args.format_option or args.output_format
+    try:
+        normalize_format(output_format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.dry_run:
+        estimate = estimate_runtime(args.template, args.image_folder, sample=args.sample, workers=args.workers,
+                                    recursive=args.recursive, lang=args.lang,
+                                    shard_index=args.shard_index, shard_count=args.shard_count)
+        print(f"Gambar           : {estimate['images']} ({estimate['fields']} field per gambar)")
+        print(f"Contoh           : {estimate['sampled']} gambar")
+        print(f"Decode / gambar  : {estimate['decode_s_per_image']:.3f}s")
+        print(f"OCR / gambar     : {estimate['ocr_s_per_image']:.3f}s")
+        print(f"Perkiraan total  : {estimate['estimated_s']:.0f}s dengan {estimate['workers']} worker "
+              f"({estimate['sequential_s']:.0f}s berurutan)")
+        if args.stats_path:
+            with open(args.stats_path, "w", encoding="utf-8") as f:
+                json.dump(estimate, f, indent=2)
+        return
+
+    cache_dir = args.cache_dir
+    if args.resume and not cache_dir:
+        cache_dir = os.path.join(args.output_dir, ".ocr_cache")
+
+    exporter = TextfileExporter(args.metrics_file, args.metrics_interval) if args.metrics_file else None
+    with profile_session(args.profile), (exporter or contextlib.nullcontext()):
+        run_ocr(args.template, args.image_folder, output_dir=args.output_dir, output_format=output_format,
+                dedup_distance=args.dedup_distance, shard_index=args.shard_index, shard_count=args.shard_count,
+                workers=args.workers, lang=args.lang, prefetch_images=args.prefetch, io_workers=args.io_workers,
+                max_memory_mb=args.max_memory_mb, tesseract_threads=args.tesseract_threads,
+                recursive=args.recursive, cache_dir=cache_dir, stats_path=args.stats_path)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 4:
-        print("Usage: python extract.py template.json image_folder output_dir output_format")
-        print("output_format: csv or excel")
-        sys.exit(1)
-
-    template = sys.argv[1]
-    folder = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "/data"
-    output_format = sys.argv[4] if len(sys.argv) > 4 else "csv"
-
-    run_ocr(template, folder, output_dir=output_dir, output_format=output_format)
+    main()
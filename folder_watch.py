@@ -0,0 +1,278 @@
+"""Hot-folder watch mode: OCR new images as soon as they arrive.
+
+Watches a folder for new or modified images (inotify on Linux, polling
+elsewhere or when inotify is unavailable), waits until each file's writes
+have settled, OCRs it with the template and appends its row to a CSV file.
+A scanner dropping files into the folder therefore gets results within
+seconds instead of at the next batch run.
+
+Images already listed in the output file are not processed again, so the
+watcher can be restarted at any time.
+
+Usage:
+    python folder_watch.py template.json /data/masuk --output /data/hasil_ocr.csv
+"""
+import argparse
+import csv
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+
+from extract import IMAGE_EXTENSIONS, find_images, load_template_fields, process_image
+
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_image(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+class InotifySource:
+    """Report changed file names in a folder using Linux inotify (via ctypes)"""
+
+    name = "inotify"
+
+    def __init__(self, folder):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify tidak tersedia")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.folder = folder
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 gagal")
+        mask = IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch gagal: {folder}")
+
+    def wait(self, timeout):
+        """Return the set of changed names (None means: rescan everything)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset < len(buffer):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Report changed file names by comparing directory snapshots"""
+
+    name = "polling"
+
+    def __init__(self, folder, interval=1.0):
+        self.folder = folder
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        return snapshot
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        changed = {name for name, state in snapshot.items() if self._snapshot.get(name) != state}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_source(folder, use_inotify=True, poll_interval=1.0):
+    """Return an inotify source when possible, otherwise a polling source"""
+    if use_inotify:
+        try:
+            return InotifySource(folder)
+        except (OSError, AttributeError) as e:
+            print(f"inotify tidak bisa dipakai ({e}), beralih ke polling", file=sys.stderr)
+    return PollingSource(folder, poll_interval)
+
+
+class FolderWatcher:
+    """Detect images whose writes have settled and hand them to on_ready.
+
+    Arguments:
+        folder (str): folder to watch
+        on_ready (callable): receives the path of each settled image
+        settle (float): seconds a file must stay unchanged before it is ready
+        use_inotify (bool): try inotify before falling back to polling
+        poll_interval (float): seconds between scans for the polling source
+    """
+
+    def __init__(self, folder, on_ready, settle=1.0, use_inotify=True, poll_interval=1.0):
+        self.folder = folder
+        self.on_ready = on_ready
+        self.settle = settle
+        self.source = open_source(folder, use_inotify, poll_interval)
+        self._pending = {}  # name -> (last change time, (size, mtime_ns))
+
+    def touch(self, names):
+        """Mark names as changed now (restarts their settle timer)"""
+        now = time.monotonic()
+        for name in names:
+            if is_image(name):
+                self._pending[name] = (now, None)
+
+    def _stat(self, name):
+        try:
+            stat = os.stat(os.path.join(self.folder, name))
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def flush_settled(self):
+        """Hand over every pending image that has not changed for `settle` seconds"""
+        now = time.monotonic()
+        for name, (changed_at, state) in list(self._pending.items()):
+            if now - changed_at < self.settle:
+                continue
+            current = self._stat(name)
+            if current is None:
+                del self._pending[name]
+            elif current != state or current[0] == 0:
+                # Still growing (or empty): wait another settle period
+                self._pending[name] = (now, current)
+            else:
+                del self._pending[name]
+                self.on_ready(os.path.join(self.folder, name))
+
+    def run(self, stop_event=None):
+        """Watch until stop_event is set (or forever)"""
+        try:
+            while stop_event is None or not stop_event.is_set():
+                timeout = self.settle / 2 if self._pending else 1.0
+                changed = self.source.wait(timeout)
+                if changed is None:
+                    # inotify queue overflowed: treat every image as changed
+                    changed = find_images(self.folder)
+                self.touch(changed)
+                self.flush_settled()
+        finally:
+            self.source.close()
+
+
+class CsvRowAppender:
+    """Append OCR rows to a CSV file, writing the header only for a new file"""
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.fieldnames = ["filename"] + [name for name in fieldnames if name != "filename"]
+
+    def processed_files(self):
+        """Filenames already present in the output"""
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, newline="", encoding="utf-8") as f:
+            return {row.get("filename") for row in csv.DictReader(f)}
+
+    def append(self, row):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pantau folder dan OCR setiap gambar baru dengan template")
+    parser.add_argument("template", help="Template JSON")
+    parser.add_argument("folder", help="Folder yang dipantau")
+    parser.add_argument("--output", help="File CSV tujuan (default: <folder>/hasil_ocr.csv)")
+    parser.add_argument("--settle", type=float, default=1.0,
+                        help="Detik file harus tidak berubah sebelum diproses (default: 1.0)")
+    parser.add_argument("--existing", action="store_true",
+                        help="Proses juga gambar yang sudah ada dan belum ada di output")
+    parser.add_argument("--polling", action="store_true", help="Paksa polling, jangan pakai inotify")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Detik antar scan polling (default: 1.0)")
+    parser.add_argument("--lang", default="eng+ind", help="Bahasa Tesseract (default: eng+ind)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error(f"Folder tidak ditemukan: {args.folder}")
+    fields = load_template_fields(args.template)
+    output = args.output or os.path.join(args.folder, "hasil_ocr.csv")
+    appender = CsvRowAppender(output, [f["name"] for f in fields])
+    processed = appender.processed_files()
+
+    # OCR runs on its own thread so detecting new files never waits for Tesseract
+    jobs = queue.Queue()
+
+    def ocr_worker():
+        while True:
+            img_path = jobs.get()
+            if img_path is None:
+                return
+            started = time.monotonic()
+            row = process_image(img_path, fields, lang=args.lang)
+            if row is not None:
+                appender.append(row)
+                print(f"OCR {row['filename']} ({time.monotonic() - started:.1f}s)", file=sys.stderr)
+
+    worker = threading.Thread(target=ocr_worker, daemon=True)
+    worker.start()
+
+    # Modified images are OCR'd again; the new row is appended after the old one
+    watcher = FolderWatcher(args.folder, jobs.put, settle=args.settle,
+                            use_inotify=not args.polling, poll_interval=args.poll_interval)
+    if args.existing:
+        for name in find_images(args.folder):
+            if name not in processed:
+                jobs.put(os.path.join(args.folder, name))
+
+    print(f"Memantau {args.folder} ({watcher.source.name}), output: {output}", file=sys.stderr)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        jobs.put(None)
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
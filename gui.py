@@ -32,20 +32,96 @@ Last Updated: 2024
 # IMPORT SECTION / BAGIAN IMPOR
 # ============================================================================
 
+import argparse
+import os
+import subprocess
+import sys
+
 # Import tkinter module / Mengimpor modul tkinter
 # Tkinter is Python's standard GUI library / Tkinter adalah library GUI standar Python
 import tkinter as tk
 
-# Import main GUI class from main_gui module / Mengimpor kelas GUI utama dari modul main_gui
-# This class contains all the GUI logic and UI components / Kelas ini berisi semua logika GUI dan komponen UI
-from main_gui import ModernOCRGui
+# The main GUI class (main_gui.ModernOCRGui) is imported inside main(), after
+# argument parsing, so --import-report can measure it from a clean interpreter
+# Kelas GUI utama diimpor di dalam main(), setelah parsing argumen, agar
+# --import-report dapat mengukurnya dari interpreter yang bersih
+
+
+# ============================================================================
+# STARTUP REPORT / LAPORAN STARTUP
+# ============================================================================
+
+def parse_importtime(output):
+    """
+    Parse the stderr of `python -X importtime`.
+    Parsing stderr dari `python -X importtime`.
+    
+    Returns:
+        list: (self_us, cumulative_us, depth, module) per import / per impor
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line / baris judul
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((int(parts[0]), int(parts[1]), depth, stripped))
+    return entries
+
+
+def import_report(module="main_gui", top=15):
+    """
+    Import a module in a fresh interpreter with -X importtime and print a summary.
+    Impor modul di interpreter baru dengan -X importtime dan tampilkan ringkasan.
+    
+    Args:
+        module: Module to measure / Modul yang diukur
+        top: Number of slowest imports to list / Jumlah impor terlambat yang ditampilkan
+    
+    Returns:
+        int: Exit code of the measuring interpreter / Exit code interpreter pengukur
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True,
+    )
+    entries = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else f"import {module} gagal")
+    total = next((cumulative for _, cumulative, depth, name in entries if depth == 0 and name == module), None)
+    if total is not None:
+        print(f"Startup import '{module}': {total / 1000:.1f} ms")
+
+    # Direct imports of the module by cumulative time; importtime lists them
+    # right before the module itself / Impor langsung modul menurut waktu kumulatif
+    print(f"\n{'kumulatif ms':>12} {'sendiri ms':>10}  modul")
+    index = next((i for i, e in enumerate(entries) if e[2] == 0 and e[3] == module), len(entries))
+    nested = []
+    for entry in reversed(entries[:index]):
+        if entry[2] == 0:
+            break
+        if entry[2] == 1:
+            nested.append(entry)
+    for self_us, cumulative_us, _, name in sorted(nested, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>12.1f} {self_us / 1000:>10.1f}  {name}")
+
+    # Most expensive modules by their own import time / Modul dengan waktu impor sendiri terbesar
+    print(f"\n{'sendiri ms':>12}  modul")
+    for self_us, _, _, name in sorted(entries, key=lambda e: e[0], reverse=True)[:top]:
+        print(f"{self_us / 1000:>12.1f}  {name}")
+    return result.returncode
 
 
 # ============================================================================
 # MAIN FUNCTION / FUNGSI UTAMA
 # ============================================================================
 
-def main():
+def main(argv=None):
     """
     Main entry point for the Modern OCR GUI application
     Titik masuk utama untuk aplikasi GUI OCR Modern
@@ -69,6 +145,23 @@ def main():
     │      root.mainloop()                │  Start event loop / Mulai event loop
     └─────────────────────────────────────┘
     """
+    # Optional profiling of the whole session (e.g. the template OCR preview)
+    # Profiling opsional untuk seluruh sesi (mis. OCR preview template)
+    parser = argparse.ArgumentParser(description="Modern OCR GUI")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="Write PREFIX.prof and PREFIX.trace.json on exit / Tulis profil saat keluar")
+    parser.add_argument("--import-report", metavar="N", type=int, nargs="?", const=15,
+                        help="Print the N slowest startup imports (-X importtime) and exit / "
+                             "Tampilkan N impor startup terlambat lalu keluar")
+    args = parser.parse_args(argv)
+
+    if args.import_report is not None:
+        sys.exit(import_report(top=args.import_report))
+
+    # Import main GUI class / Mengimpor kelas GUI utama
+    # This class contains all the GUI logic and UI components / Kelas ini berisi semua logika GUI dan komponen UI
+    from main_gui import ModernOCRGui
+
     # Step 1: Create the main application window / Langkah 1: Buat jendela aplikasi utama
     # The root window is the top-level window that contains all other widgets
     # Jendela root adalah jendela tingkat atas yang berisi semua widget lainnya
@@ -82,7 +175,12 @@ def main():
     # Step 3: Start the tkinter main event loop / Langkah 3: Mulai main event loop tkinter
     # This keeps the application running and responsive to user events
     # Ini menjaga aplikasi tetap berjalan dan responsif terhadap event pengguna
-    root.mainloop()
+    if args.profile:
+        from profiling import profile_session
+        with profile_session(args.profile):
+            root.mainloop()
+    else:
+        root.mainloop()
 
 
 # ============================================================================
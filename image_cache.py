@@ -0,0 +1,121 @@
+"""
+Decoded Image Cache Module
+
+Keeps recently opened images decoded in memory so the Template Creator,
+the OCR preview and the mini-map share one decode per file instead of
+re-reading it from disk.
+
+Entries are keyed by (absolute path, mtime), so an image that changes on
+disk is decoded again on the next request.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+
+class DecodedImage:
+    """
+    One decoded image with lazily derived views.
+
+    Attributes:
+        path: Absolute path of the source file
+        mtime: Modification time (ns) the image was decoded at
+        pil: RGB PIL Image used for display
+    """
+
+    def __init__(self, path, mtime, pil):
+        self.path = path
+        self.mtime = mtime
+        self.pil = pil
+        self._bgr = None
+        self._thumbnails = {}
+        self._lock = threading.Lock()
+
+    @property
+    def bgr(self):
+        """OpenCV-style BGR numpy array of the image (read-only, shared)."""
+        with self._lock:
+            if self._bgr is None:
+                rgb = np.asarray(self.pil)
+                self._bgr = np.ascontiguousarray(rgb[:, :, ::-1])
+                self._bgr.setflags(write=False)
+            return self._bgr
+
+    def crop_bgr(self, x, y, w, h):
+        """Return a writable BGR copy of a region, clipped to the image bounds."""
+        return self.bgr[max(0, y):max(0, y + h), max(0, x):max(0, x + w)].copy()
+
+    def thumbnail(self, max_width, max_height):
+        """Return a cached PIL thumbnail that fits inside max_width x max_height."""
+        key = (int(max_width), int(max_height))
+        with self._lock:
+            thumb = self._thumbnails.get(key)
+            if thumb is None:
+                thumb = self.pil.copy()
+                thumb.thumbnail(key, Image.Resampling.BILINEAR)
+                self._thumbnails[key] = thumb
+            return thumb
+
+
+class DecodedImageCache:
+    """
+    Small LRU cache of DecodedImage entries keyed by path and mtime.
+
+    Attributes:
+        max_entries: Number of decoded images kept in memory
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Return the decoded image for a path, decoding it only if it is not
+        cached or the file changed since it was cached.
+
+        Args:
+            path: Path to an image file
+
+        Raises:
+            OSError: If the file cannot be read or decoded
+        """
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime == mtime:
+                self._entries.move_to_end(path)
+                return entry
+
+        with Image.open(path) as img:
+            pil = img.convert("RGB")
+        entry = DecodedImage(path, mtime, pil)
+
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, path=None):
+        """Drop one cached path, or everything when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+shared_image_cache = DecodedImageCache()
+
+
+def get_decoded_image(path):
+    """Return the DecodedImage for path from the process-wide shared cache."""
+    return shared_image_cache.get(path)
@@ -0,0 +1,139 @@
+"""
+Zoom Pyramid Module
+
+Provides tiled, cached rendering of large images for the Template Creator
+canvas. Instead of resizing the whole image on every zoom step, the image is
+kept as a pyramid of half-size levels and only the tiles that are visible in
+the viewport are rendered from the nearest level.
+
+Features:
+- Lazily built pyramid levels (1, 1/2, 1/4, ...) using Image.reduce
+- Per-tile rendering with a fast or high-quality resampling filter
+- LRU tile cache so zooming back to a previous level reuses rendered tiles
+"""
+
+from collections import OrderedDict
+from PIL import Image
+
+
+FAST_FILTER = Image.Resampling.NEAREST
+QUALITY_FILTER = Image.Resampling.LANCZOS
+
+
+class ZoomPyramid:
+    """
+    Zoom pyramid and tile cache for one source image.
+
+    Attributes:
+        image: Full resolution PIL Image (pyramid level 0)
+        tile_size: Edge length of a display tile in screen pixels
+        max_tiles: Maximum number of rendered tiles kept in the cache
+        levels: List of PIL Images, level k is the source reduced by 2**k
+    """
+
+    def __init__(self, image, tile_size=256, max_tiles=256):
+        self.image = image
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.levels = [image]
+        self._tiles = OrderedDict()
+
+    @staticmethod
+    def zoom_key(zoom):
+        """Round a zoom factor so repeated zoom steps map to the same cache key."""
+        return round(zoom, 6)
+
+    def display_size(self, zoom):
+        """Return the (width, height) of the whole image at the given zoom."""
+        return max(1, int(self.image.width * zoom)), max(1, int(self.image.height * zoom))
+
+    def tile_grid(self, zoom):
+        """Return the number of (columns, rows) of tiles at the given zoom."""
+        width, height = self.display_size(zoom)
+        return -(-width // self.tile_size), -(-height // self.tile_size)
+
+    def level_for(self, zoom):
+        """
+        Return the smallest pyramid level that is still at least as large
+        as the requested zoom, building missing levels on demand.
+
+        Args:
+            zoom: Display zoom factor (1.0 = 100%)
+        """
+        level = 0
+        while zoom <= 0.5 ** (level + 1):
+            if level + 1 >= len(self.levels):
+                previous = self.levels[-1]
+                if previous.width < 2 * self.tile_size or previous.height < 2 * self.tile_size:
+                    break
+                self.levels.append(previous.reduce(2))
+            level += 1
+        return self.levels[level]
+
+    def render_tile(self, zoom, tx, ty, high_quality=False):
+        """
+        Render a single display tile without touching the cache.
+
+        Args:
+            zoom: Display zoom factor
+            tx, ty: Tile column and row
+            high_quality: Use LANCZOS instead of the fast filter
+
+        Returns:
+            PIL Image of the tile, or None if the tile is outside the image
+        """
+        width, height = self.display_size(zoom)
+        x0, y0 = tx * self.tile_size, ty * self.tile_size
+        if x0 >= width or y0 >= height:
+            return None
+        x1, y1 = min(x0 + self.tile_size, width), min(y0 + self.tile_size, height)
+
+        source = self.level_for(zoom)
+        scale_x = source.width / width
+        scale_y = source.height / height
+        box = (x0 * scale_x, y0 * scale_y, x1 * scale_x, y1 * scale_y)
+        resample = QUALITY_FILTER if high_quality else FAST_FILTER
+        return source.resize((x1 - x0, y1 - y0), resample, box=box)
+
+    def get_tile(self, zoom, tx, ty, high_quality=False, convert=None):
+        """
+        Return a cached tile, rendering it if needed.
+
+        A cached high-quality tile is always preferred over rendering a new
+        fast one, so zooming back to a settled level shows sharp tiles
+        immediately.
+
+        Args:
+            zoom: Display zoom factor
+            tx, ty: Tile column and row
+            high_quality: Render with the high-quality filter
+            convert: Optional callable applied to the rendered PIL tile before
+                caching (e.g. ImageTk.PhotoImage)
+
+        Returns:
+            Tuple (tile, is_high_quality), or (None, False) outside the image
+        """
+        key = self.zoom_key(zoom)
+        for quality in ((True,) if high_quality else (True, False)):
+            cached = self._tiles.get((key, tx, ty, quality))
+            if cached is not None:
+                self._tiles.move_to_end((key, tx, ty, quality))
+                return cached, quality
+
+        tile = self.render_tile(zoom, tx, ty, high_quality)
+        if tile is None:
+            return None, False
+        if convert:
+            tile = convert(tile)
+
+        self._tiles[(key, tx, ty, high_quality)] = tile
+        if high_quality:
+            self._tiles.pop((key, tx, ty, False), None)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile, high_quality
+
+    def clear(self):
+        """Drop all cached tiles and pyramid levels except the source image."""
+        self._tiles.clear()
+        del self.levels[1:]
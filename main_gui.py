@@ -11,6 +11,11 @@ This module provides:
 Tab modules are located in the 'tabs' package:
 - screenshot_tab.py / ocr_tab.py / template_tab.py / ocr_processing.py
 
+Tab contents are built on first selection, and the template list is scanned
+in a background thread, so the main window appears immediately.
+Isi tab dibangun saat pertama dipilih dan daftar template dipindai di thread
+latar belakang, sehingga jendela utama langsung muncul.
+
 Author: [Your Name]
 Version: 1.0.0
 """
@@ -18,12 +23,23 @@ Version: 1.0.0
 import tkinter as tk
 from tkinter import messagebox
 import os
+import queue
+import threading
 
 # Import styling / Impor styling
 from modern_styles import apply_modern_styling, create_modern_notebook
 
 # Import tab modules / Impor modul tab
 from tabs import ScreenshotTab, TemplateTab, OCRTab, OCRProcessing
+from tabs.template_tab import list_template_files
+
+
+# Poll interval for the background template scan / Interval polling pemindaian template
+TEMPLATE_POLL_MS = 50
+
+# Notebook tab indices / Indeks tab notebook
+TEMPLATE_TAB_INDEX = 1
+OCR_TAB_INDEX = 2
 
 
 class ModernOCRGui:
@@ -57,36 +73,96 @@ class ModernOCRGui:
         self.current_template_path = ""
         self.templates_dir = "Template"
         self.template_map = {}
+        self.template_paths = []
         os.makedirs(self.templates_dir, exist_ok=True)
         
+        # Tab instances, created on first selection / Instance tab, dibuat saat pertama dipilih
+        self.screenshot_tab = None
+        self.template_tab = None
+        self.ocr_tab = None
+        self.ocr_processing = None
+        self._tab_builders = {}     # tab frame path -> (frame, builder)
+        
+        # Background template scan / Pemindaian template di latar belakang
+        self._template_queue = queue.Queue()
+        self._template_scan_seq = 0
+        self._template_applied_seq = 0
+        
         # Create tabbed interface using modern notebook / Buat antarmuka tab menggunakan notebook modern
         self.notebook = create_modern_notebook(root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
         
-        # Initialize tabs / Inisialisasi tab
-        self._init_screenshot_tab()
-        self._init_template_tab()
-        self._init_ocr_tab()
+        # Add empty tab frames; contents are built on first selection
+        # Tambahkan frame tab kosong; isinya dibangun saat pertama dipilih
+        self._add_lazy_tab("📸 Screenshot", self._init_screenshot_tab)
+        self._add_lazy_tab("📐 Template Creator", self._init_template_tab)
+        self._add_lazy_tab("🔍 OCR Process", self._init_ocr_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        
+        # Build the visible tab once the window is drawn / Bangun tab yang terlihat setelah jendela tampil
+        self.root.after_idle(self._on_tab_changed)
+        
+        # Load available templates in the background / Muat template yang tersedia di latar belakang
+        self._refresh_templates()
+    
+    def _add_lazy_tab(self, text, builder):
+        """
+        Add an empty tab whose content is built by builder(frame) on first selection.
+        Tambahkan tab kosong yang isinya dibangun oleh builder(frame) saat pertama dipilih.
+        
+        Args:
+            text: Tab title / Judul tab
+            builder: Callable receiving the tab frame / Callable yang menerima frame tab
+        """
+        frame = tk.Frame(self.notebook, bg='white')
+        self.notebook.add(frame, text=text)
+        self._tab_builders[str(frame)] = (frame, builder)
+    
+    def _ensure_tab(self, index):
+        """
+        Build a tab's content if it has not been built yet.
+        Bangun isi tab jika belum dibangun.
+        
+        Args:
+            index: Notebook tab index / Indeks tab notebook
+        """
+        entry = self._tab_builders.pop(str(self.notebook.tabs()[index]), None)
+        if entry:
+            frame, builder = entry
+            builder(frame)
+    
+    def _on_tab_changed(self, event=None):
+        """
+        Build the selected tab on first selection.
+        Bangun tab yang dipilih saat pertama dipilih.
+        """
+        try:
+            self._ensure_tab(self.notebook.index('current'))
+        except tk.TclError:
+            pass  # window already destroyed / jendela sudah ditutup
     
-    def _init_screenshot_tab(self):
+    def _init_screenshot_tab(self, screenshot_frame):
         """
         Initialize the Screenshot tab.
         Inisialisasi tab Screenshot.
-        """
-        screenshot_frame = tk.Frame(self.notebook, bg='white')
-        self.notebook.add(screenshot_frame, text="📸 Screenshot")
         
+        Args:
+            screenshot_frame: Tab frame / Frame tab
+        """
         # Create screenshot tab instance / Buat instance tab screenshot
         self.screenshot_tab = ScreenshotTab(screenshot_frame)
+        
+        # Capture OCR uses the active template / OCR capture memakai template aktif
+        self.screenshot_tab.set_template_provider(lambda: self.current_template_path)
     
-    def _init_template_tab(self):
+    def _init_template_tab(self, template_frame):
         """
         Initialize the Template Creator tab.
         Inisialisasi tab Pembuat Template.
-        """
-        template_frame = tk.Frame(self.notebook, bg='white')
-        self.notebook.add(template_frame, text="📐 Template Creator")
         
+        Args:
+            template_frame: Tab frame / Frame tab
+        """
         # Create template tab instance / Buat instance tab template
         self.template_tab = TemplateTab(template_frame, self.templates_dir)
         
@@ -97,14 +173,14 @@ class ModernOCRGui:
         # Also set parent callback on template_tab / Juga atur parent callback pada template_tab
         self.template_tab.set_parent_callback(self._on_template_created)
     
-    def _init_ocr_tab(self):
+    def _init_ocr_tab(self, ocr_frame):
         """
         Initialize the OCR Process tab.
         Inisialisasi tab Proses OCR.
-        """
-        ocr_frame = tk.Frame(self.notebook, bg='white')
-        self.notebook.add(ocr_frame, text="🔍 OCR Process")
         
+        Args:
+            ocr_frame: Tab frame / Frame tab
+        """
         # Create OCR tab instance / Buat instance tab OCR
         self.ocr_tab = OCRTab(ocr_frame)
         
@@ -121,33 +197,60 @@ class ModernOCRGui:
         self.ocr_tab.open_creator_btn.config(command=self._open_template_in_creator)
         
         # Connect refresh button / Hubungkan tombol refresh
-        # Find and connect the refresh button if it exists in ocr_tab
-        try:
-            # The refresh button should have been created in ocr_tab setup
-            pass
-        except Exception:
-            pass
+        self.ocr_tab.refresh_templates_ui = self._refresh_templates
         
-        # Load available templates on startup / Muat template yang tersedia saat startup
-        try:
-            self._refresh_templates()
-        except Exception:
-            pass
+        # Show the templates scanned so far / Tampilkan template yang sudah dipindai
+        self._apply_templates()
     
     def _refresh_templates(self):
         """
-        Refresh the templates combobox with available templates.
-        Segarkan combobox template dengan template yang tersedia.
+        Rescan the template directory in a background thread.
+        Pindai ulang direktori template di thread latar belakang.
         """
-        templates = self.template_tab.list_templates()
-        display = [os.path.basename(p) for p in templates]
+        self._template_scan_seq += 1
+        seq = self._template_scan_seq
+        templates_dir = self.templates_dir
+        threading.Thread(
+            target=lambda: self._template_queue.put((seq, list_template_files(templates_dir))),
+            daemon=True
+        ).start()
+        self.root.after(TEMPLATE_POLL_MS, self._poll_templates)
+    
+    def _poll_templates(self):
+        """
+        Receive scan results on the Tk thread; an older scan never replaces a newer one.
+        Terima hasil pemindaian di thread Tk; hasil lama tidak menggantikan yang lebih baru.
+        """
+        try:
+            seq, templates = self._template_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(TEMPLATE_POLL_MS, self._poll_templates)
+            return
+        if seq < self._template_applied_seq:
+            return
+        self._template_applied_seq = seq
+        self.template_paths = templates
         self.template_map = {os.path.basename(p): p for p in templates}
-        
+        self._apply_templates()
+    
+    def _apply_templates(self):
+        """
+        Fill the templates combobox and select the active template (or the first one).
+        Isi combobox template dan pilih template aktif (atau yang pertama).
+        """
+        if self.ocr_tab is None:
+            return  # applied when the OCR tab is built / diterapkan saat tab OCR dibangun
+        display = [os.path.basename(p) for p in self.template_paths]
         self.ocr_tab.templates_combobox['values'] = display
         
+        current = os.path.basename(self.current_template_path)
+        if current and current not in display and self._template_applied_seq < self._template_scan_seq:
+            return  # a scan that may list it is still running / pemindaian yang mungkin memuatnya masih berjalan
         if display:
             try:
-                self.ocr_tab.templates_combobox.current(0)
+                # Active template gone from the list (deleted or outside Template/): select the first
+                # Template aktif tidak ada di daftar (dihapus atau di luar Template/): pilih yang pertama
+                self.ocr_tab.templates_combobox.current(display.index(current) if current in display else 0)
                 self._on_ocr_template_select()
             except Exception:
                 pass
@@ -185,10 +288,18 @@ class ModernOCRGui:
             template_path: Path to the newly created template / Path ke template yang baru dibuat
         """
         self.current_template_path = template_path
+        
+        # List the new template right away; the rescan confirms it
+        # Tampilkan template baru langsung; pemindaian ulang mengonfirmasinya
+        if os.path.basename(template_path) not in self.template_map:
+            self.template_paths = sorted(self.template_paths + [template_path])
+            self.template_map[os.path.basename(template_path)] = template_path
+        self._apply_templates()
         self._refresh_templates()
         
         # Switch to OCR tab / Beralih ke tab OCR
-        self.notebook.select(2)
+        self._ensure_tab(OCR_TAB_INDEX)
+        self.notebook.select(OCR_TAB_INDEX)
         
         if self.ocr_tab.log:
             self.ocr_tab.log.insert(tk.END, f"✅ Template baru dibuat: {template_path}\n")
@@ -207,11 +318,12 @@ class ModernOCRGui:
             return
 
         try:
+            self._ensure_tab(TEMPLATE_TAB_INDEX)
             template_gui = self.template_tab.get_template_gui()
             if template_gui:
                 ok = template_gui.load_template(self.current_template_path)
                 if ok:
-                    self.notebook.select(1)  # Select template tab / Pilih tab template
+                    self.notebook.select(TEMPLATE_TAB_INDEX)  # Select template tab / Pilih tab template
                     
                     if self.ocr_tab.log:
                         self.ocr_tab.log.insert(
@@ -0,0 +1,203 @@
+"""
+Metrics Module
+
+Process-wide OCR counters and latency histograms, exported in the
+Prometheus text format to a node-exporter textfile (written periodically,
+atomically) and readable in-process by the GUI.
+
+Counters:
+    irminsul_images_processed_total   rows produced
+    irminsul_images_skipped_total     images that could not be read
+    irminsul_duplicates_total         near-duplicate images not OCR'd
+    irminsul_cache_hits_total         rows served from the result cache
+    irminsul_fields_ocr_total         field crops sent to Tesseract
+    irminsul_blank_fields_total       blank field crops skipped without OCR
+Histogram:
+    irminsul_stage_seconds{stage=...} latency of decode/crop/ocr/write/...
+
+Stage latencies come from the profiling spans, so instrumented code only
+needs profiling.span().
+"""
+
+import os
+import threading
+import time
+
+import profiling
+
+
+COUNTERS = {
+    "images_processed": "Images that produced an output row",
+    "images_skipped": "Images that could not be read",
+    "duplicates": "Near-duplicate images linked instead of OCR'd",
+    "cache_hits": "Rows served from the result cache",
+    "fields_ocr": "Field crops sent to Tesseract",
+    "blank_fields": "Blank field crops skipped without OCR",
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = "irminsul_"
+
+# Textfile the batch worker writes next to its output (read by the GUI)
+METRICS_FILENAME = "ocr_metrics.prom"
+
+
+class Metrics:
+    """
+    Thread-safe counters plus one latency histogram per stage.
+
+    Attributes:
+        counters: Counter name -> value
+        started: Time the registry was created or reset
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {name: 0 for name in COUNTERS}
+            self._histograms = {}  # stage -> [bucket counts..., count, sum]
+            self.started = time.time()
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [0] * (len(LATENCY_BUCKETS) + 2)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += seconds
+
+    def snapshot(self):
+        """Return a plain dict: counters plus per-stage count and mean latency."""
+        with self._lock:
+            stages = {stage: {"count": h[-2], "mean_s": (h[-1] / h[-2]) if h[-2] else 0.0}
+                      for stage, h in self._histograms.items()}
+            return {"counters": dict(self.counters), "stages": stages,
+                    "uptime_s": time.time() - self.started}
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, help_text in COUNTERS.items():
+                metric = f"{PREFIX}{name}_total"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter",
+                          f"{metric} {self.counters.get(name, 0)}"]
+            metric = f"{PREFIX}stage_seconds"
+            lines += [f"# HELP {metric} Latency per pipeline stage", f"# TYPE {metric} histogram"]
+            for stage, histogram in sorted(self._histograms.items()):
+                for bound, count in zip(LATENCY_BUCKETS, histogram):
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram[-2]}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram[-1]:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {histogram[-2]}')
+            lines.append(f"{PREFIX}last_update_timestamp_seconds {time.time():.3f}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+# Stage latencies are taken from the profiling spans
+profiling.add_span_listener(metrics.observe)
+
+
+def write_textfile(path, registry=None):
+    """Write the metrics atomically (node-exporter reads *.prom files)."""
+    registry = registry or metrics
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+    return path
+
+
+class TextfileExporter:
+    """
+    Rewrite a textfile every `interval` seconds in a daemon thread.
+
+    Attributes:
+        path: Target .prom file
+        interval: Seconds between writes
+    """
+
+    def __init__(self, path, interval=15.0, registry=None):
+        self.path = path
+        self.interval = interval
+        self.registry = registry or metrics
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="metrics-exporter")
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                write_textfile(self.path, self.registry)
+            except OSError as e:
+                print(f"Metrics textfile error: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self):
+        """Stop the thread and write the final values."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        write_textfile(self.path, self.registry)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def read_textfile(path):
+    """
+    Parse a textfile written by another process (e.g. the Docker worker)
+    into {"counters": {...}, "stages": {stage: {"count", "mean_s"}}}.
+    """
+    counters, sums, counts = {}, {}, {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith(PREFIX):
+                continue
+            name, _, value = line.rstrip("\n").rpartition(" ")
+            name = name[len(PREFIX):]
+            if name.endswith("_total"):
+                counters[name[:-len("_total")]] = int(float(value))
+            elif name.startswith("stage_seconds_sum{"):
+                sums[name.split('"')[1]] = float(value)
+            elif name.startswith("stage_seconds_count{"):
+                counts[name.split('"')[1]] = int(float(value))
+    stages = {stage: {"count": count, "mean_s": sums.get(stage, 0.0) / count if count else 0.0}
+              for stage, count in counts.items()}
+    return {"counters": counters, "stages": stages}
+
+
+def format_summary(snapshot):
+    """One-line human readable summary for status labels."""
+    c = snapshot["counters"]
+    text = (f"Gambar: {c.get('images_processed', 0)}  Field OCR: {c.get('fields_ocr', 0)}  "
+            f"Cache: {c.get('cache_hits', 0)}  Kosong: {c.get('blank_fields', 0)}  "
+            f"Duplikat: {c.get('duplicates', 0)}")
+    ocr = snapshot["stages"].get("ocr")
+    if ocr and ocr["count"]:
+        text += f"  OCR/field: {ocr['mean_s'] * 1000:.0f} ms"
+    return text
@@ -4,20 +4,50 @@ This module keeps heavy I/O and external calls out of UI modules. It exposes
 `run_ocr` which is safe to call from a background thread and reports
 progress via callbacks supplied by the caller.
 """
+import json
 import subprocess
 import os
 
+from metrics import METRICS_FILENAME, read_textfile
+from output_sinks import MANIFEST_NAME, normalize_format
+
+
+def read_manifest(output_dir):
+    """Load the result manifest written by the extractor.
+
+    Output file names in the manifest are relative to the output directory;
+    they are returned as host paths under `output_paths`.
+    """
+    with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["output_paths"] = [os.path.join(output_dir, name) for name in manifest.get("outputs", [])]
+    return manifest
+
+
+def read_metrics(output_dir):
+    """Counters of the running (or last) extractor, from its metrics textfile.
+
+    Returns None while the file does not exist yet.
+    """
+    try:
+        return read_textfile(os.path.join(output_dir, METRICS_FILENAME))
+    except (OSError, ValueError):
+        return None
+
 
 def run_ocr(template_path, input_path, output_dir, export_format, progress_cb=None, done_cb=None):
-    """Run OCR (docker) and optionally convert CSV→Excel.
+    """Run OCR (docker), writing the requested format straight into output_dir.
 
     Arguments:
         template_path (str): path to JSON template (host path)
         input_path (str): input folder or file path
-        output_dir (str): where outputs are expected (used for locating result files)
-        export_format (str): 'CSV' or 'Excel'
+        output_dir (str): host folder the results are written to
+        export_format (str): 'CSV', 'Excel', 'Parquet' or 'SQLite'
         progress_cb (callable): progress callback receiving one string argument
         done_cb (callable): completion callback receiving (success: bool, message: str)
+
+    Returns:
+        dict: the result manifest (see `read_manifest`), or None on failure
     """
     def p(msg):
         if callable(progress_cb):
@@ -36,27 +66,38 @@ def run_ocr(template_path, input_path, output_dir, export_format, progress_cb=No
     try:
         p("🚀 Menjalankan OCR di Docker...")
 
-        template_dir = os.path.dirname(template_path) or "."
+        output_format = normalize_format(export_format)
+        template_dir = os.path.dirname(os.path.abspath(template_path))
+        output_dir = os.path.abspath(output_dir or template_dir)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # A stale manifest or metrics file must not be mistaken for this run's result
+        for name in (MANIFEST_NAME, METRICS_FILENAME):
+            try:
+                os.remove(os.path.join(output_dir, name))
+            except FileNotFoundError:
+                pass
+
         # Determine if input is a folder or file
         if os.path.isdir(input_path):
-            cmd = [
-                "docker", "run", "--rm",
-                "-v", f"{template_dir}:/data",
-                "-v", f"{input_path}:/input",
-                "ocr-app",
-                "/data/" + os.path.basename(template_path),
-                "/input",
-            ]
+            input_dir, container_input = os.path.abspath(input_path), "/input"
         else:
-            file_dir = os.path.dirname(input_path) or "."
-            cmd = [
-                "docker", "run", "--rm",
-                "-v", f"{template_dir}:/data",
-                "-v", f"{file_dir}:/input",
-                "ocr-app",
-                "/data/" + os.path.basename(template_path),
-                "/input/" + os.path.basename(input_path),
-            ]
+            input_dir = os.path.dirname(os.path.abspath(input_path))
+            container_input = "/input/" + os.path.basename(input_path)
+
+        cmd = [
+            "docker", "run", "--rm",
+            "-v", f"{template_dir}:/data",
+            "-v", f"{input_dir}:/input",
+            "-v", f"{output_dir}:/output",
+            "ocr-app",
+            "/data/" + os.path.basename(template_path),
+            container_input,
+            "/output",
+            output_format,
+            "--metrics-file", "/output/" + METRICS_FILENAME,
+            "--metrics-interval", "2",
+        ]
 
         p("🔗 Command: " + " ".join(cmd))
 
@@ -64,32 +105,24 @@ def run_ocr(template_path, input_path, output_dir, export_format, progress_cb=No
         if result.returncode != 0:
             p("❌ Docker process failed")
             done(False, result.stderr or "Docker run failed")
-            return
+            return None
 
         p("✅ Docker run completed")
 
-        # Post-process: convert CSV to Excel if requested
-        csv_path = os.path.join(template_dir, "hasil_ocr.csv")
-        if export_format == "Excel" and os.path.exists(csv_path):
-            try:
-                p("🔁 Converting CSV to Excel...")
-                import pandas as pd
-                df = pd.read_csv(csv_path)
-                excel_path = os.path.join(template_dir, "hasil_ocr.xlsx")
-                df.to_excel(excel_path, index=False)
-                p("✅ Conversion complete: hasil_ocr.xlsx")
-                done(True, f"OCR completed, Excel saved: {excel_path}")
-                return
-            except Exception as e:
-                p(f"⚠️ Conversion failed: {e}")
-                done(True, f"OCR completed (CSV saved), but Excel conversion failed: {e}")
-                return
-
-        # Default: success with CSV
-        p("✅ Selesai! Hasil OCR tersimpan di hasil_ocr.csv")
-        done(True, f"OCR completed, CSV saved: {csv_path}")
+        try:
+            manifest = read_manifest(output_dir)
+        except (OSError, ValueError) as e:
+            done(False, f"OCR finished but no result manifest was found: {e}")
+            return None
+
+        for path in manifest["output_paths"]:
+            p(f"✅ Selesai! Hasil OCR tersimpan di {os.path.basename(path)}")
+        p(f"📊 {manifest.get('rows', 0)} baris dari {manifest.get('images', 0)} gambar")
+        done(True, "OCR completed, saved: " + ", ".join(manifest["output_paths"]))
+        return manifest
 
     except FileNotFoundError:
         done(False, "Docker not found on PATH")
     except Exception as e:
         done(False, str(e))
+    return None
@@ -0,0 +1,323 @@
+"""
+Output Sinks Module
+
+Streams OCR result rows to the selected output format while the batch is
+still running, instead of collecting everything in a DataFrame first.
+
+Formats:
+- csv:     hasil_ocr.csv, written row by row with the csv module
+- excel:   hasil_ocr.xlsx, openpyxl write-only (streaming) workbook
+- parquet: hasil_ocr.parquet, one row group per batch (needs pyarrow)
+- sqlite:  hasil_ocr.db, table hasil_ocr, one transaction per batch
+
+Columns are typed: a template field may declare "type": "text" (default),
+"int" or "float"; values that do not parse become empty/NULL. Parquet and
+SQLite output also get a "<name>_conf" column per field with the mean
+Tesseract word confidence; CSV and Excel keep one column per field.
+"""
+
+import csv
+import os
+import re
+import sqlite3
+
+
+COLUMN_TYPES = ("text", "int", "float")
+
+# Result summary written next to the output files (see extract.write_manifest)
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_NAME = "hasil_ocr" + MANIFEST_SUFFIX
+
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "excel": ".xlsx",
+    "parquet": ".parquet",
+    "sqlite": ".db",
+}
+
+
+def normalize_format(output_format):
+    """Map a user-facing format name (e.g. "Excel", "xlsx", "db") to a sink key."""
+    key = (output_format or "csv").strip().lower()
+    key = {"xlsx": "excel", "db": "sqlite", "sqlite3": "sqlite", "arrow": "parquet"}.get(key, key)
+    if key not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Format output tidak dikenal: {output_format}")
+    return key
+
+
+def output_columns(fields, confidence=False, extra=()):
+    """
+    Build the ordered (name, type) column list for a template.
+
+    Args:
+        fields: Template fields; an optional "type" key sets the column type
+        confidence: Add a float "<name>_conf" column after every field
+        extra: Additional (name, type) columns appended at the end
+    """
+    columns = [("filename", "text")]
+    for field in fields:
+        column_type = field.get("type", "text")
+        if column_type not in COLUMN_TYPES:
+            column_type = "text"
+        columns.append((field["name"], column_type))
+        if confidence:
+            columns.append((field["name"] + "_conf", "float"))
+    columns.extend(extra)
+    return columns
+
+
+_NUMBER_CHARS = re.compile(r"[^0-9,.\-]")
+
+
+def convert_value(value, column_type):
+    """
+    Convert an OCR string to the column type; None when it does not parse.
+
+    Floats accept both "1.250,50" and "1,250.50": when both separators
+    occur, the last one is the decimal separator; a lone comma is decimal.
+    For ints every separator is a thousands separator ("1.250" -> 1250).
+    """
+    if column_type == "text" or value is None or isinstance(value, (int, float)):
+        return value
+    text = _NUMBER_CHARS.sub("", str(value))
+    if column_type == "int":
+        # Integers have no decimal part, so any separator groups thousands
+        text = text.replace(".", "").replace(",", "")
+    if not text:
+        return None
+    if "," in text and "." in text:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        text = text.replace(",", ".")
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    if column_type == "int":
+        return int(number) if number.is_integer() else None
+    return number
+
+
+class OutputSink:
+    """
+    Base class for streaming row writers.
+
+    Rows are dicts keyed by column name; they are converted to the column
+    types and handed to the subclass in batches of batch_size.
+
+    Attributes:
+        path: Output file path
+        columns: Ordered list of (name, type)
+        batch_size: Rows per write batch / row group / transaction
+        rows_written: Number of rows flushed so far
+    """
+
+    format = None
+
+    def __init__(self, path, columns, batch_size=1000):
+        self.path = path
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._batch = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, row):
+        """Queue one row, flushing a batch when it is full."""
+        self._batch.append(tuple(convert_value(row.get(name), column_type)
+                                 for name, column_type in self.columns))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._batch:
+            self._write_batch(self._batch)
+            self.rows_written += len(self._batch)
+            self._batch = []
+
+    def close(self):
+        """Flush remaining rows and close the file; returns the output path."""
+        self.flush()
+        self._close()
+        return self.path
+
+    def _write_batch(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class CsvSink(OutputSink):
+    format = "csv"
+
+    def __init__(self, path, columns, batch_size=1000):
+        super().__init__(path, columns, batch_size)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in self.columns])
+
+    def _write_batch(self, rows):
+        self._writer.writerows(rows)
+
+    def _close(self):
+        self._file.close()
+
+
+class ExcelSink(OutputSink):
+    format = "excel"
+
+    def __init__(self, path, columns, batch_size=1000):
+        super().__init__(path, columns, batch_size)
+        from openpyxl import Workbook
+
+        # write_only streams rows to a temp file instead of keeping cells in memory
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("hasil_ocr")
+        self._sheet.append([name for name, _ in self.columns])
+
+    def _write_batch(self, rows):
+        for row in rows:
+            self._sheet.append(row)
+
+    def _close(self):
+        self._workbook.save(self.path)
+
+
+class ParquetSink(OutputSink):
+    format = "parquet"
+
+    ARROW_TYPES = {"text": "string", "int": "int64", "float": "float64"}
+
+    def __init__(self, path, columns, batch_size=10000):
+        super().__init__(path, columns, batch_size)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Output parquet membutuhkan pyarrow (pip install pyarrow)") from None
+        self._pa = pa
+        self._schema = pa.schema([(name, getattr(pa, self.ARROW_TYPES[column_type])())
+                                  for name, column_type in self.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_batch(self, rows):
+        # Each batch becomes one row group
+        arrays = [self._pa.array(values, type=field.type)
+                  for values, field in zip(zip(*rows), self._schema)]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def _close(self):
+        self._writer.close()
+
+
+class SqliteSink(OutputSink):
+    format = "sqlite"
+
+    SQL_TYPES = {"text": "TEXT", "int": "INTEGER", "float": "REAL"}
+
+    def __init__(self, path, columns, batch_size=1000, table="hasil_ocr"):
+        super().__init__(path, columns, batch_size)
+        self.table = table
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        column_sql = ", ".join(f'"{name}" {self.SQL_TYPES[column_type]}' for name, column_type in self.columns)
+        with self._conn:
+            self._conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self._conn.execute(f'CREATE TABLE "{table}" ({column_sql})')
+        placeholders = ", ".join("?" for _ in self.columns)
+        self._insert = f'INSERT INTO "{table}" VALUES ({placeholders})'
+
+    def _write_batch(self, rows):
+        # One transaction per batch
+        with self._conn:
+            self._conn.executemany(self._insert, rows)
+
+    def _close(self):
+        self._conn.close()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "excel": ExcelSink,
+    "parquet": ParquetSink,
+    "sqlite": SqliteSink,
+}
+
+
+def output_path(output_dir, output_format, basename="hasil_ocr"):
+    """Return the output file path for a format inside output_dir."""
+    return os.path.join(output_dir, basename + FORMAT_EXTENSIONS[normalize_format(output_format)])
+
+
+def open_sink(output_format, output_dir, columns, basename="hasil_ocr", **kwargs):
+    """
+    Create the sink for a format, writing to output_dir/basename.<ext>.
+
+    Raises:
+        ValueError: Unknown format
+        ImportError: The format's optional dependency is missing
+    """
+    key = normalize_format(output_format)
+    return SINKS[key](output_path(output_dir, key, basename), columns, **kwargs)
+
+
+def read_output(path, output_format=None):
+    """
+    Read a file written by one of the sinks back as rows.
+
+    Args:
+        path: Output file
+        output_format: Sink key; guessed from the extension when omitted
+
+    Returns:
+        Tuple (column names, iterator of row tuples)
+    """
+    if output_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        output_format = next(key for key, ext in FORMAT_EXTENSIONS.items() if ext == extension)
+    key = normalize_format(output_format)
+
+    if key == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            names = next(csv.reader(f), [])
+
+        def rows():
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    yield tuple(value if value != "" else None for value in row)
+        return names, rows()
+
+    if key == "excel":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        values = workbook.worksheets[0].iter_rows(values_only=True)
+        names = list(next(values, ()))
+        return names, values
+
+    if key == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        names = parquet_file.schema_arrow.names
+
+        def rows():
+            for batch in parquet_file.iter_batches():
+                yield from zip(*(column.to_pylist() for column in batch.columns))
+        return names, rows()
+
+    conn = sqlite3.connect(path)
+    cursor = conn.execute("SELECT * FROM hasil_ocr ORDER BY rowid")
+    return [d[0] for d in cursor.description], cursor
@@ -0,0 +1,196 @@
+"""
+Perceptual Hash Module
+
+Computes 64-bit perceptual hashes (aHash / dHash) of screenshots and input
+images and finds near-duplicates among them, so repeated captures and
+duplicate scans are not OCR'd twice.
+
+The HashIndex uses multi-index hashing: each hash is split into
+max_distance + 1 bands and every band is indexed separately. Two hashes
+within max_distance bits of each other must agree exactly on at least one
+band (pigeonhole principle), so a lookup only compares the few hashes that
+share a band instead of scanning the whole index. This keeps lookups fast
+for hundreds of thousands of hashes.
+"""
+
+import threading
+
+import numpy as np
+from PIL import Image
+
+
+HASH_BITS = 64
+HASH_SIZE = 8
+
+
+def _grey_image(image, size):
+    """Return a small greyscale PIL image from a PIL image or a BGR/grey numpy array."""
+    if isinstance(image, np.ndarray):
+        if image.ndim == 3:
+            # BGR -> luminance, same weights as PIL's "L" conversion
+            image = image[:, :, 2] * 0.299 + image[:, :, 1] * 0.587 + image[:, :, 0] * 0.114
+        image = Image.fromarray(np.asarray(image, dtype=np.uint8))
+    else:
+        image = image.convert("L")
+    # reduce() first keeps large screenshots cheap to downscale
+    factor = max(1, min(image.width // (size[0] * 4), image.height // (size[1] * 4)))
+    if factor > 1:
+        image = image.reduce(factor)
+    return np.asarray(image.resize(size, Image.Resampling.BILINEAR), dtype=np.int16)
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def average_hash(image, hash_size=HASH_SIZE):
+    """
+    Return the aHash of an image as an int: one bit per pixel of a
+    hash_size x hash_size thumbnail, set when the pixel is above the mean.
+
+    Args:
+        image: PIL Image or BGR/greyscale numpy array
+        hash_size: Thumbnail edge length (8 -> 64-bit hash)
+    """
+    pixels = _grey_image(image, (hash_size, hash_size))
+    return _bits_to_int(pixels > pixels.mean())
+
+
+def difference_hash(image, hash_size=HASH_SIZE):
+    """
+    Return the dHash of an image as an int: one bit per horizontal
+    neighbour pair, set when brightness increases to the right.
+
+    Args:
+        image: PIL Image or BGR/greyscale numpy array
+        hash_size: Number of rows/comparisons per row (8 -> 64-bit hash)
+    """
+    pixels = _grey_image(image, (hash_size + 1, hash_size))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+HASH_FUNCTIONS = {"ahash": average_hash, "dhash": difference_hash}
+
+
+def image_hash(image, method="dhash"):
+    """Return the perceptual hash of an image using "ahash" or "dhash"."""
+    try:
+        return HASH_FUNCTIONS[method](image)
+    except KeyError:
+        raise ValueError(f"Metode hash tidak dikenal: {method}") from None
+
+
+def fields_hash(image, fields, method="dhash"):
+    """
+    Return one hash per template field region, concatenated into a single
+    int of HASH_BITS * len(fields) bits.
+
+    Filled-in copies of the same form share most of their pixels, so a hash
+    of the whole page puts different forms within a few bits of each other.
+    Hashing only the field regions compares what was actually filled in.
+
+    Args:
+        image: PIL Image or BGR/greyscale numpy array
+        fields: Template fields with x, y, w, h
+        method: "ahash" or "dhash"
+    """
+    value = 0
+    for field in fields:
+        x, y = max(0, field["x"]), max(0, field["y"])
+        right, bottom = field["x"] + field["w"], field["y"] + field["h"]
+        if isinstance(image, np.ndarray):
+            crop = image[y:bottom, x:right]
+            empty = crop.size == 0
+        else:
+            right, bottom = min(right, image.width), min(bottom, image.height)
+            empty = right <= x or bottom <= y
+            crop = None if empty else image.crop((x, y, right, bottom))
+        value = (value << HASH_BITS) | (0 if empty else image_hash(crop, method))
+    return value
+
+
+def hamming_distance(a, b):
+    """Return the number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class HashIndex:
+    """
+    Near-duplicate index for perceptual hashes (64-bit, or longer for fields_hash).
+
+    Attributes:
+        max_distance: Largest Hamming distance still treated as a duplicate
+        bits: Hash length in bits
+    """
+
+    def __init__(self, max_distance=0, bits=HASH_BITS):
+        if not 0 <= max_distance < bits:
+            raise ValueError(f"max_distance harus 0..{bits - 1}")
+        self.max_distance = max_distance
+        self.bits = bits
+        # Split into max_distance + 1 bands of (almost) equal width
+        band_count = max_distance + 1
+        widths = [bits // band_count + (1 if i < bits % band_count else 0) for i in range(band_count)]
+        self._bands = []
+        shift = bits
+        for width in widths:
+            shift -= width
+            self._bands.append((shift, (1 << width) - 1))
+        self._tables = [{} for _ in self._bands]
+        self._entries = []  # (hash, key)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _band_values(self, value):
+        return [(value >> shift) & mask for shift, mask in self._bands]
+
+    def find(self, value):
+        """
+        Return (key, distance) of the closest indexed hash within
+        max_distance of value, or None when there is no near-duplicate.
+        """
+        best = None
+        seen = set()
+        with self._lock:
+            for table, band in zip(self._tables, self._band_values(value)):
+                for entry_id in table.get(band, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    other, key = self._entries[entry_id]
+                    distance = hamming_distance(value, other)
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (key, distance)
+                        if distance == 0:
+                            return best
+        return best
+
+    def add(self, value, key):
+        """Index a hash under key (e.g. a filename or capture path)."""
+        with self._lock:
+            entry_id = len(self._entries)
+            self._entries.append((value, key))
+            for table, band in zip(self._tables, self._band_values(value)):
+                table.setdefault(band, []).append(entry_id)
+
+    def add_or_find(self, value, key):
+        """
+        Return the near-duplicate match for value like find(); when there
+        is none, index value under key and return None.
+        """
+        match = self.find(value)
+        if match is None:
+            self.add(value, key)
+        return match
+
+    def clear(self):
+        """Drop all indexed hashes."""
+        with self._lock:
+            self._entries.clear()
+            for table in self._tables:
+                table.clear()
@@ -0,0 +1,247 @@
+"""
+Profiling Module
+
+Optional profiling for batch runs and the OCR preview:
+
+- a cProfile dump (<prefix>.prof) covering the main thread and every thread
+  started while profiling is active (workers, decode threads), merged into
+  one pstats file
+- a Chrome trace-event file (<prefix>.trace.json) with one span per stage
+  (discovery, decode, crop, preprocess, ocr, write), per thread. Open it in
+  chrome://tracing or https://ui.perfetto.dev.
+
+Spans cost almost nothing while profiling is off: span() then returns a
+shared no-op context manager. Span listeners (e.g. the metrics module's
+latency histograms) receive (name, seconds) for every span, profiling or not.
+
+cProfile/pstats are imported only when a session starts, so importing this
+module for span() stays cheap.
+
+Trace files of several processes (e.g. shards) can be combined:
+
+    python profiling.py merge combined.trace.json shard-*.trace.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """
+    Collects Chrome trace "complete" events (ph "X").
+
+    Timestamps are wall-clock microseconds so traces from different
+    processes line up when merged.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._wall_offset = time.time() - time.perf_counter()
+
+    def _now_us(self):
+        return (time.perf_counter() + self._wall_offset) * 1e6
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            thread = threading.current_thread()
+            event = {"name": name, "ph": "X", "ts": round(start, 1), "dur": round(end - start, 1),
+                     "pid": self.pid, "tid": thread.ident}
+            if args:
+                event["args"] = args
+            with self._lock:
+                self._threads[thread.ident] = thread.name
+                self.events.append(event)
+
+    def save(self, path):
+        """Write the trace-event JSON, with thread names as metadata events."""
+        with self._lock:
+            metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                        for tid, name in self._threads.items()]
+            events = metadata + list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+_tracer = None
+_listeners = []
+
+
+def add_span_listener(listener):
+    """Call listener(name, seconds) whenever a span ends."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_span_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@contextlib.contextmanager
+def _timed_span(tracer, name, args):
+    started = time.perf_counter()
+    try:
+        if tracer is None:
+            yield
+        else:
+            with tracer.span(name, **args):
+                yield
+    finally:
+        seconds = time.perf_counter() - started
+        for listener in list(_listeners):
+            listener(name, seconds)
+
+
+def span(name, **args):
+    """Context manager timing one stage; a no-op unless profiling or a listener is active."""
+    tracer = _tracer
+    if _listeners:
+        return _timed_span(tracer, name, args)
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **args)
+
+
+def is_active():
+    return _tracer is not None
+
+
+class ProfileSession:
+    """
+    cProfile + trace recording for the calling thread and all threads it
+    starts while active.
+
+    Attributes:
+        prefix: Output path prefix (<prefix>.prof, <prefix>.trace.json)
+        tracer: The active Tracer
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.tracer = Tracer()
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._previous_hook = None
+
+    def _new_profile(self):
+        """Enable a cProfile for the current thread; False if another profiler is active"""
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this interpreter (Python 3.12+)
+            return False
+        with self._lock:
+            self._profiles.append(profile)
+        return True
+
+    def _thread_bootstrap(self, frame, event, arg):
+        # Installed via threading.setprofile: runs once in each new thread and
+        # replaces itself with a per-thread cProfile. If that fails the hook
+        # must still be removed, or it would run on every call in the thread.
+        if not self._new_profile():
+            sys.setprofile(None)
+
+    def start(self):
+        global _tracer
+        directory = os.path.dirname(self.prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _tracer = self.tracer
+        self._previous_hook = threading.getprofile()
+        threading.setprofile(self._thread_bootstrap)
+        self._new_profile()
+        return self
+
+    def stop(self):
+        """Stop recording and write both files; returns (prof_path, trace_path)."""
+        import pstats
+
+        global _tracer
+        threading.setprofile(self._previous_hook)
+        self._previous_hook = None
+        _tracer = None
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        for profile in profiles:
+            profile.disable()
+
+        prof_path = self.prefix + ".prof"
+        stats = None
+        for profile in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                continue  # thread finished without recording anything
+        if stats is not None:
+            stats.dump_stats(prof_path)
+        trace_path = self.tracer.save(self.prefix + ".trace.json")
+        print(f"Profil: {prof_path}, trace: {trace_path}")
+        return prof_path, trace_path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def profile_session(prefix):
+    """Return a context manager that profiles to prefix, or a no-op when prefix is empty."""
+    return ProfileSession(prefix) if prefix else contextlib.nullcontext()
+
+
+def merge_traces(output_path, paths):
+    """Concatenate the events of several trace files (one per process) into one."""
+    events = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            events.extend(json.load(f).get("traceEvents", []))
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alat bantu file profil/trace")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge = subparsers.add_parser("merge", help="Gabungkan beberapa file trace menjadi satu")
+    merge.add_argument("output", help="File trace gabungan")
+    merge.add_argument("traces", nargs="+", help="File .trace.json sumber")
+    stats = subparsers.add_parser("stats", help="Tampilkan fungsi terlama dari file .prof")
+    stats.add_argument("prof", help="File .prof")
+    stats.add_argument("--limit", type=int, default=25, help="Jumlah baris (default: 25)")
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        print(merge_traces(args.output, args.traces))
+    else:
+        import pstats
+
+        pstats.Stats(args.prof).sort_stats("cumulative").print_stats(args.limit)
+
+
+if __name__ == "__main__":
+    main()
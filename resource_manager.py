@@ -0,0 +1,129 @@
+"""CPU resource planning for parallel Tesseract runs.
+
+Every `tesseract` process starts its own OpenMP thread pool, sized to the
+whole machine by default. With several OCR workers in parallel the box runs
+workers x cores threads and thrashes. This module splits the cores between
+OCR workers and Tesseract's threads, and applies the split through
+OMP_THREAD_LIMIT, which each tesseract subprocess inherits.
+
+It also has a benchmark mode that measures every sensible workers x threads
+split on a sample of real images and reports the fastest:
+
+    python resource_manager.py template.json /data/scans --sample 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import time
+
+
+THREAD_LIMIT_VARS = ("OMP_THREAD_LIMIT",)
+
+
+def available_cpus():
+    """Number of CPUs this process may run on (respects affinity/cgroups where visible)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def plan_resources(workers=None, threads=None, cpus=None):
+    """Return (workers, threads_per_tesseract) so that workers * threads <= cpus.
+
+    Arguments:
+        workers (int): requested OCR workers, None to derive
+        threads (int): requested Tesseract threads per call, None to derive
+        cpus (int): CPUs to plan for, default: available_cpus()
+    """
+    cpus = cpus or available_cpus()
+    if workers and threads:
+        return workers, threads
+    if workers:
+        return workers, max(1, cpus // workers)
+    if threads:
+        return max(1, cpus // threads), threads
+    # Many small field crops: one single-threaded tesseract per core scales best
+    return cpus, 1
+
+
+@contextlib.contextmanager
+def thread_limit(threads):
+    """Limit the OpenMP threads of every tesseract started inside the block"""
+    previous = {name: os.environ.get(name) for name in THREAD_LIMIT_VARS}
+    for name in THREAD_LIMIT_VARS:
+        os.environ[name] = str(threads)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def candidate_splits(cpus):
+    """workers x threads combinations worth measuring for a machine"""
+    splits = set()
+    threads = 1
+    while threads <= cpus:
+        splits.add((max(1, cpus // threads), threads))
+        threads *= 2
+    splits.add((cpus, 1))
+    splits.add((1, cpus))
+    return sorted(splits)
+
+
+def benchmark_splits(template_path, image_folder, sample=8, splits=None, lang="eng+ind"):
+    """Time run_ocr on a sample of images for each split; fastest first.
+
+    Returns a list of dicts: workers, threads, seconds, images_per_s.
+    """
+    import tempfile
+
+    from extract import find_images, run_ocr
+
+    images = find_images(image_folder)[:sample]
+    if not images:
+        raise FileNotFoundError(f"Tidak ada gambar di {image_folder}")
+    results = []
+    with tempfile.TemporaryDirectory() as sample_dir, tempfile.TemporaryDirectory() as output_dir:
+        for name in images:
+            source, target = os.path.abspath(os.path.join(image_folder, name)), os.path.join(sample_dir, name)
+            try:
+                os.symlink(source, target)
+            except OSError:
+                shutil.copyfile(source, target)  # no symlink permission (Windows)
+        for workers, threads in splits or candidate_splits(available_cpus()):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_ocr(template_path, sample_dir, output_dir=output_dir, workers=workers,
+                        tesseract_threads=threads, lang=lang)
+            seconds = time.perf_counter() - started
+            results.append({"workers": workers, "threads": threads, "seconds": round(seconds, 3),
+                            "images_per_s": round(len(images) / seconds, 3)})
+            print(f"workers={workers:<3} threads={threads:<3} {seconds:7.2f}s "
+                  f"{len(images) / seconds:7.2f} gambar/s", file=sys.stderr)
+    return sorted(results, key=lambda r: r["seconds"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cari pembagian workers x thread Tesseract tercepat")
+    parser.add_argument("template", help="Template JSON")
+    parser.add_argument("image_folder", help="Folder gambar contoh")
+    parser.add_argument("--sample", type=int, default=8, help="Jumlah gambar yang diuji (default: 8)")
+    parser.add_argument("--lang", default="eng+ind", help="Bahasa Tesseract (default: eng+ind)")
+    args = parser.parse_args(argv)
+
+    results = benchmark_splits(args.template, args.image_folder, sample=args.sample, lang=args.lang)
+    best = results[0]
+    print(f"Terbaik: --workers {best['workers']} --tesseract-threads {best['threads']} "
+          f"({best['images_per_s']} gambar/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Result Cache Module
+
+Persists OCR rows in a small SQLite database so an interrupted or repeated
+batch run only OCRs the images it has not seen yet.
+
+Entries are keyed by the image's relative path, size and mtime together with
+a digest of the template fields and language, so editing the template or
+replacing an image invalidates exactly the affected rows.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+
+CACHE_FILENAME = "ocr_cache.db"
+
+# Part of the digest; bump when the stored row or hash format changes
+# (2: perceptual hashes cover the template field regions only)
+CACHE_VERSION = 2
+
+
+def template_digest(fields, lang, confidence=False):
+    """Digest of everything in the template that affects OCR output (confidence: rows carry <name>_conf)."""
+    payload = json.dumps({"fields": fields, "lang": lang, "confidence": confidence, "version": CACHE_VERSION},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of OCR rows.
+
+    Attributes:
+        path: Database file
+        digest: Template digest the entries are stored under
+        hits: Lookups answered from the cache
+        misses: Lookups that required OCR
+    """
+
+    def __init__(self, cache_dir, digest, commit_every=100):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self.digest = digest
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        # Lookups run on decode threads, writes on the consumer thread
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "template TEXT, relpath TEXT, size INTEGER, mtime_ns INTEGER, row TEXT, phash TEXT, "
+            "PRIMARY KEY (template, relpath))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, relpath, path):
+        """Return (row, perceptual hash or None) for an unchanged image, or None."""
+        stat = self._stat(path)
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT size, mtime_ns, row, phash FROM results WHERE template = ? AND relpath = ?",
+                (self.digest, relpath),
+            ).fetchone()
+            if stat is not None and found is not None and tuple(found[:2]) == stat:
+                self.hits += 1
+                return json.loads(found[2]), (int(found[3], 16) if found[3] else None)
+            self.misses += 1
+            return None
+
+    def put(self, relpath, path, row, phash=None):
+        """Store a row (and the image's perceptual hash); committed in batches of commit_every."""
+        stat = self._stat(path)
+        if stat is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (self.digest, relpath, stat[0], stat[1], json.dumps(row, ensure_ascii=False),
+                 format(phash, "016x") if phash is not None else None),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
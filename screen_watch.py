@@ -0,0 +1,218 @@
+"""Continuous screen-watch mode with per-field change detection.
+
+Captures a screen region repeatedly, applies a template to every frame and
+re-OCRs only the fields whose pixels changed since they were last read.
+Changes in field values are emitted as a JSONL event stream, one object per
+line:
+
+    {"ts": "...", "frame": 12, "field": "total", "value": "1.250", "previous": "1.200"}
+
+Most frames therefore cost one capture plus a cheap hash/diff per field.
+
+Usage:
+    python screen_watch.py template.json --interval 1 --region template --output events.jsonl
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from extract import load_template_fields, extract_fields, fields_bounds, offset_fields
+
+
+class FieldChangeDetector:
+    """Decide per field whether its pixels changed since the last OCR.
+
+    A field is compared against the crop it was last OCR'd from: identical
+    bytes (hash match) are unchanged; otherwise the share of pixels whose
+    grey level moved by more than `pixel_threshold` must reach
+    `min_changed_ratio`, so capture noise does not trigger OCR while slow
+    drift still does eventually.
+    """
+
+    def __init__(self, pixel_threshold=24, min_changed_ratio=0.002):
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self._reference = {}  # field name -> (digest, grey crop)
+
+    @staticmethod
+    def _grey(crop):
+        if crop.ndim == 3:
+            return cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        return crop
+
+    def changed(self, name, crop):
+        """Return (changed, state); pass state to `accept` once the field has been OCR'd"""
+        grey = self._grey(crop)
+        digest = hashlib.blake2b(grey.tobytes(), digest_size=16).digest()
+        state = (digest, grey)
+        reference = self._reference.get(name)
+        if reference is None or reference[1].shape != grey.shape:
+            return True, state
+        if reference[0] == digest:
+            return False, state
+        moved = np.count_nonzero(cv2.absdiff(grey, reference[1]) > self.pixel_threshold)
+        return moved >= self.min_changed_ratio * grey.size, state
+
+    def accept(self, name, state):
+        """Use `state` as the new reference for a field"""
+        self._reference[name] = state
+
+    def reset(self):
+        self._reference.clear()
+
+
+class ScreenWatcher:
+    """Capture a region at a fixed rate and emit field-value change events.
+
+    Arguments:
+        fields (list): template fields in screen coordinates
+        region (tuple): (left, top, width, height) to capture, None for full screen
+        interval (float): seconds between frame starts
+        emit (callable): receives each event dict; defaults to JSONL on stdout
+        grab (callable): grab(region) -> PIL image or None; defaults to the
+            screenshot module's capture backends
+    """
+
+    def __init__(self, fields, region=None, interval=1.0, lang="eng+ind", emit=None, grab=None,
+                 detector=None):
+        self.region = tuple(region) if region else None
+        self.fields = offset_fields(fields, -self.region[0], -self.region[1]) if self.region else list(fields)
+        self.interval = interval
+        self.lang = lang
+        self.emit = emit or jsonl_emitter(sys.stdout)
+        self.grab = grab
+        self.detector = detector or FieldChangeDetector()
+        self.values = {}
+        self.frame_index = 0
+        self.stats = {"frames": 0, "fields_checked": 0, "fields_ocr": 0, "events": 0, "capture_failures": 0}
+
+    def process_frame(self, frame):
+        """Diff one BGR frame against the previous state, OCR changed fields and emit events"""
+        self.frame_index += 1
+        self.stats["frames"] += 1
+        changed_fields = []
+        states = {}
+        for field in self.fields:
+            x, y, w, h = field["x"], field["y"], field["w"], field["h"]
+            crop = frame[max(0, y):y + h, max(0, x):x + w]
+            self.stats["fields_checked"] += 1
+            if crop.size == 0:
+                continue
+            changed, state = self.detector.changed(field["name"], crop)
+            if changed:
+                changed_fields.append(field)
+                states[field["name"]] = state
+
+        if not changed_fields:
+            return []
+
+        self.stats["fields_ocr"] += len(changed_fields)
+        results = extract_fields(frame, changed_fields, lang=self.lang)
+        timestamp = datetime.now().isoformat(timespec="milliseconds")
+        events = []
+        for field in changed_fields:
+            name = field["name"]
+            self.detector.accept(name, states[name])
+            value = results.get(name, "")
+            previous = self.values.get(name)
+            if value == previous:
+                continue
+            self.values[name] = value
+            event = {"ts": timestamp, "frame": self.frame_index, "field": name,
+                     "value": value, "previous": previous}
+            events.append(event)
+            self.emit(event)
+        self.stats["events"] += len(events)
+        return events
+
+    def capture_frame(self):
+        """Grab the watched region as a BGR numpy array, None on failure"""
+        if self.grab is None:
+            from screenshot import capture_screen
+            self.grab = capture_screen
+        image = self.grab(self.region)
+        if image is None:
+            return None
+        rgb = np.asarray(image.convert("RGB"))
+        return np.ascontiguousarray(rgb[:, :, ::-1])
+
+    def run(self, max_frames=None, stop_event=None):
+        """Watch until max_frames frames were processed or stop_event is set"""
+        while max_frames is None or self.stats["frames"] < max_frames:
+            if stop_event is not None and stop_event.is_set():
+                break
+            started = time.monotonic()
+            frame = self.capture_frame()
+            if frame is None:
+                self.stats["capture_failures"] += 1
+            else:
+                self.process_frame(frame)
+            delay = self.interval - (time.monotonic() - started)
+            if delay > 0:
+                if stop_event is not None:
+                    stop_event.wait(delay)
+                else:
+                    time.sleep(delay)
+        return self.stats
+
+
+def jsonl_emitter(stream):
+    """Return an emit callback writing one JSON object per line to stream"""
+    def emit(event):
+        stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+        stream.flush()
+    return emit
+
+
+def parse_region(value, fields):
+    """Parse --region: 'full', 'template' (union of field bounds) or 'x,y,w,h'"""
+    if not value or value == "full":
+        return None
+    if value == "template":
+        return fields_bounds(fields, padding=8)
+    parts = [int(p) for p in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("Region harus 'full', 'template' atau x,y,w,h")
+    return tuple(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pantau area layar dan keluarkan perubahan nilai field sebagai JSONL")
+    parser.add_argument("template", help="Template JSON")
+    parser.add_argument("--interval", type=float, default=1.0, help="Detik antar frame (default: 1.0)")
+    parser.add_argument("--region", default="template", help="full, template, atau x,y,w,h (default: template)")
+    parser.add_argument("--output", help="File JSONL tujuan (default: stdout)")
+    parser.add_argument("--max-frames", type=int, help="Berhenti setelah N frame")
+    parser.add_argument("--lang", default="eng+ind", help="Bahasa Tesseract (default: eng+ind)")
+    args = parser.parse_args(argv)
+
+    fields = load_template_fields(args.template)
+    region = parse_region(args.region, fields)
+
+    stream = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    watcher = None
+    try:
+        watcher = ScreenWatcher(fields, region=region, interval=args.interval, lang=args.lang,
+                                emit=jsonl_emitter(stream))
+        stats = watcher.run(max_frames=args.max_frames)
+    except KeyboardInterrupt:
+        # Ctrl+C sebelum watcher selesai dibuat: belum ada statistik
+        if watcher is None:
+            return
+        stats = watcher.stats
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(f"Frames: {stats['frames']}, field dicek: {stats['fields_checked']}, "
+          f"field di-OCR: {stats['fields_ocr']}, event: {stats['events']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,223 +1,522 @@
-
-import tkinter as tk
-from tkinter import Label, Button
-from PIL import Image, ImageTk, ImageGrab
-import pyautogui
-import os
-from datetime import datetime
-import time
-import subprocess
-import sys
-
-class ScreenshotMiniGUI:
-    def __init__(self, root, callback=None, save_dir="screenshots", hotkey=None):
-        self.root = root
-        self.callback = callback
-        self.save_dir = save_dir
-        self.hotkey = hotkey
-        self.root.title("Mini Screenshot")
-        self.root.geometry("250x300")
-        self.root.resizable(False, False)
-
-        # Keep the window on top so user can reuse it easily
-        try:
-            self.root.attributes('-topmost', True)
-        except Exception:
-            pass
-
-        # Ensure the save directory exists
-        os.makedirs(self.save_dir, exist_ok=True)
-
-        self.btn = Button(root, text="Capture", command=self.take_screenshot,
-                          font=("Arial", 12), width=12)
-        self.btn.pack(pady=10)
-
-        self.preview_label = Label(root, text="(Preview akan muncul di sini)", fg="gray")
-        self.preview_label.pack(pady=10)
-
-        # Status label to show save notification without modal dialogs
-        self.status_label = Label(root, text="", fg="#10b981")
-        self.status_label.pack(pady=(6, 0))
-
-        # Hotkey label
-        self.hotkey_label = Label(root, text=(f"Hotkey: {self.hotkey}" if self.hotkey else "Hotkey: -"), fg="gray")
-        self.hotkey_label.pack(pady=(4, 0))
-
-        # Keep the window on top so user can reuse it easily
-        try:
-            self.root.attributes('-topmost', True)
-            # remove topmost after a moment so it doesn't block user
-            # self.root.after(800, lambda: self.root.attributes('-topmost', False))
-            pass
-        except Exception:
-            pass
-        
-        # Close button to allow user to close mini GUI when finished
-        try:
-            self.close_btn = Button(root, text="Close", command=self.root.destroy, font=("Arial", 10), width=10)
-            self.close_btn.pack(pady=(8, 6))
-        except Exception:
-            pass
-
-        # Try to register global hotkey if provided. Fall back to Tk binding when global not available.
-        if self.hotkey:
-            try:
-                import keyboard
-
-                # Register global hotkey -> schedule screenshot on main thread
-                try:
-                    keyboard.add_hotkey(self.hotkey, lambda: self.root.after(0, self.take_screenshot))
-                    self.hotkey_label.config(fg="#10b981")
-                except Exception as e:
-                    print(f"Failed to register global hotkey with keyboard: {e}")
-                    # fallback to Tk binding
-                    try:
-                        tk_binding = self.hotkey if self.hotkey.startswith("<") else f"<{self.hotkey}>"
-                        self.root.bind_all(tk_binding, lambda e: self.take_screenshot())
-                        self.hotkey_label.config(fg="#10b981")
-                    except Exception:
-                        self.hotkey_label.config(fg="#ef4444")
-            except Exception:
-                # keyboard module unavailable; try Tk binding syntax
-                try:
-                    tk_binding = self.hotkey if self.hotkey.startswith("<") else f"<{self.hotkey}>"
-                    self.root.bind_all(tk_binding, lambda e: self.take_screenshot())
-                    self.hotkey_label.config(fg="#10b981")
-                except Exception as e:
-                    print(f"Tkinter bind for hotkey failed: {e}")
-                    self.hotkey_label.config(fg="#ef4444")
-
-        # Tambahkan di __init__
-        self.pin_var = tk.BooleanVar(value=True)  # default: pinned
-
-        # Tambahkan tombol pin/unpin
-        self.pin_btn = Button(root, text="📌 Pin", command=self.toggle_pin, font=("Arial", 8), width=6)
-        self.pin_btn.pack(pady=(4, 0))
-
-    def toggle_pin(self):
-        current = self.pin_var.get()
-        self.pin_var.set(not current)
-        self.root.attributes('-topmost', self.pin_var.get())
-        # Perbarui teks tombol
-        if self.pin_var.get():
-            self.pin_btn.config(text="📌 Pin")
-        else:
-            self.pin_btn.config(text="🔓 Unpin")
-
-    def take_screenshot(self):
-        # Sembunyikan sementara (tanpa mengubah topmost) → jendela akan tetap di atas setelah muncul
-        self.root.withdraw()
-        time.sleep(0.3)
-
-        filename = datetime.now().strftime("%Y%m%d_%H%M%S") + ".png"
-        path = os.path.join(self.save_dir, filename)
-
-        try:
-            # Method 1: Try pyautogui.screenshot() (primary method)
-            screenshot = self._take_screenshot_pyautogui()
-            
-            if screenshot is None:
-                # Method 2: Try PIL ImageGrab as fallback
-                screenshot = self._take_screenshot_imagegrab()
-                
-            if screenshot is None:
-                # Method 3: Try subprocess with scrot/gnome-screenshot
-                screenshot = self._take_screenshot_subprocess()
-                
-            if screenshot is None:
-                # All methods failed - show user-friendly error
-                self.root.deiconify()
-                self._show_screenshot_error()
-                return
-
-            # Save and display screenshot
-            screenshot.save(path)
-            self.root.deiconify()
-            
-            # Create preview
-            preview = screenshot.resize((200, 120))
-            preview = ImageTk.PhotoImage(preview)
-            
-            self.preview_label.config(image=preview, text="")
-            self.preview_label.image = preview
-            
-            print("Saved:", path)
-            
-            # Send path to main GUI
-            if self.callback:
-                self.callback(path)
-                
-            # Show non-blocking notification
-            try:
-                self.status_label.config(text=f"Tersimpan: {os.path.basename(path)}", fg="#10b981")
-                self.root.after(2500, lambda: self.status_label.config(text="", fg="#10b981"))
-            except Exception:
-                pass
-                
-        except Exception as e:
-            self.root.deiconify()
-            # Pastikan jendela tetap di atas setelah muncul kembali
-            self.root.attributes('-topmost', True)
-            print(f"Screenshot error: {e}")
-            self._show_screenshot_error(str(e))
-
-    def _take_screenshot_pyautogui(self):
-        """Try to take screenshot using pyautogui"""
-        try:
-            screenshot = pyautogui.screenshot()
-            return screenshot
-        except Exception as e:
-            print(f"PyAutoGUI screenshot failed: {e}")
-            return None
-
-    def _take_screenshot_imagegrab(self):
-        """Try to take screenshot using PIL ImageGrab (no system dependencies)"""
-        try:
-            screenshot = ImageGrab.grab()
-            return screenshot
-        except Exception as e:
-            print(f"ImageGrab screenshot failed: {e}")
-            return None
-
-    def _take_screenshot_subprocess(self):
-        """Try to take screenshot using system commands"""
-        methods = [
-            # Try scrot first (lightweight, doesn't require gnome)
-            ["scrot", "/tmp/screenshot_temp.png"],
-            # Try gnome-screenshot
-            ["gnome-screenshot", "-f", "/tmp/screenshot_temp.png"],
-            # Try flameshot
-            ["flameshot", "full", "-p", "/tmp/screenshot_temp.png"],
-            # Try spectacle (KDE)
-            ["spectacle", "-b", "-o", "/tmp/screenshot_temp.png"]
-        ]
-        
-        for method in methods:
-            try:
-                cmd = method
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0 and os.path.exists("/tmp/screenshot_temp.png"):
-                    # Load the screenshot
-                    screenshot = Image.open("/tmp/screenshot_temp.png")
-                    # Clean up temporary file
-                    os.remove("/tmp/screenshot_temp.png")
-                    return screenshot
-            except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
-                print(f"Subprocess method {method[0]} failed: {e}")
-                continue
-        
-        return None
-
-    def _show_screenshot_error(self, error_msg=None):
-        """Show error message using status label instead of messagebox"""
-        error_details = error_msg or "Unknown error"
-        
-        print(f"Screenshot failed: {error_details}")
-        
-        # Update status label
-        try:
-            self.status_label.config(text="Screenshot gagal", fg="#ef4444")
-            self.root.after(3500, lambda: self.status_label.config(text="", fg="#10b981"))
-        except Exception:
-            pass
-
+
+import tkinter as tk
+from tkinter import Label, Button
+from PIL import Image, ImageTk, ImageGrab
+import numpy as np
+import os
+from datetime import datetime
+import time
+import subprocess
+import sys
+import io
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from phash import HASH_BITS, HashIndex, fields_hash, image_hash
+
+# Seconds to wait after hiding the mini window before the first capture of a burst
+HIDE_DELAY = 0.3
+
+# RAM-backed directory for the external screenshot tools when available
+TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def to_bgr_array(image):
+    """Convert a PIL screenshot to an OpenCV-style BGR numpy array"""
+    rgb = np.asarray(image.convert("RGB"))
+    return np.ascontiguousarray(rgb[:, :, ::-1])
+
+
+def normalize_region(region):
+    """Return region as an integer (left, top, width, height) tuple, or None for full screen"""
+    if not region:
+        return None
+    left, top, width, height = (int(v) for v in region)
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Region tidak valid: {region}")
+    return (max(0, left), max(0, top), width, height)
+
+
+def capture_pyautogui(region=None):
+    """Try to take screenshot using pyautogui"""
+    try:
+        # Imported on first use: pyautogui is slow to import and needs a display
+        import pyautogui
+        screenshot = pyautogui.screenshot(region=region)
+        return screenshot
+    except Exception as e:
+        print(f"PyAutoGUI screenshot failed: {e}")
+        return None
+
+
+def capture_imagegrab(region=None):
+    """Try to take screenshot using PIL ImageGrab (no system dependencies)"""
+    try:
+        bbox = None
+        if region:
+            left, top, width, height = region
+            bbox = (left, top, left + width, top + height)
+        screenshot = ImageGrab.grab(bbox=bbox)
+        return screenshot
+    except Exception as e:
+        print(f"ImageGrab screenshot failed: {e}")
+        return None
+
+
+def _capture_with_tool(command, region=None):
+    """Run one external screenshot tool; command(path) builds its argv.
+
+    A command that does not use the path is expected to write PNG data to
+    stdout. The region is cropped afterwards.
+    """
+    temp_dir = tempfile.mkdtemp(prefix="screenshot_", dir=TEMP_DIR)
+    temp_path = os.path.join(temp_dir, "screenshot_temp.png")
+    cmd = command(temp_path)
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=10)
+        if result.returncode != 0:
+            return None
+        if temp_path not in cmd and result.stdout:
+            source = io.BytesIO(result.stdout)
+        elif os.path.exists(temp_path):
+            source = temp_path
+        else:
+            return None
+        # Decode fully before the temporary file is removed
+        screenshot = Image.open(source)
+        screenshot.load()
+        if region:
+            left, top, width, height = region
+            screenshot = screenshot.crop((left, top, left + width, top + height))
+        return screenshot
+    except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
+        print(f"Subprocess method {cmd[0]} failed: {e}")
+        return None
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# External tools in fallback order: (tool name, argv builder)
+SUBPROCESS_TOOLS = [
+    # Try scrot first (lightweight, doesn't require gnome)
+    ("scrot", lambda path: ["scrot", path]),
+    # Try gnome-screenshot
+    ("gnome-screenshot", lambda path: ["gnome-screenshot", "-f", path]),
+    # Try flameshot, streaming the PNG to stdout instead of a file
+    ("flameshot", lambda path: ["flameshot", "full", "--raw"]),
+    # Try spectacle (KDE)
+    ("spectacle", lambda path: ["spectacle", "-b", "-o", path]),
+]
+
+
+def capture_subprocess(region=None):
+    """Try to take screenshot using system commands (region is cropped afterwards)"""
+    for tool, command in SUBPROCESS_TOOLS:
+        if shutil.which(tool) is None:
+            continue
+        screenshot = _capture_with_tool(command, region)
+        if screenshot is not None:
+            return screenshot
+    return None
+
+
+def _tool_backend(command):
+    return lambda region=None: _capture_with_tool(command, region)
+
+
+# All capture backends in fallback order: (name, capture(region), external tool or None)
+BACKENDS = [("pyautogui", capture_pyautogui, None), ("imagegrab", capture_imagegrab, None)] + [
+    (tool, _tool_backend(command), tool) for tool, command in SUBPROCESS_TOOLS
+]
+
+_preferred_backend = None
+_probe_results = None
+_probe_lock = threading.Lock()
+
+
+def benchmark_backends(repeat=1, region=None):
+    """Time every available backend; returns a list of dicts sorted fastest first.
+
+    Each dict holds name, ok, latency_ms (best of `repeat`) and mean_ms.
+    External tools that are not installed are reported without running them.
+    """
+    results = []
+    for name, backend, tool in BACKENDS:
+        if tool and shutil.which(tool) is None:
+            results.append({"name": name, "ok": False, "latency_ms": None, "mean_ms": None,
+                            "error": "not installed"})
+            continue
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            screenshot = backend(region)
+            elapsed = (time.perf_counter() - started) * 1000
+            if screenshot is None:
+                break
+            timings.append(elapsed)
+        if timings:
+            results.append({"name": name, "ok": True, "latency_ms": round(min(timings), 1),
+                            "mean_ms": round(sum(timings) / len(timings), 1)})
+        else:
+            results.append({"name": name, "ok": False, "latency_ms": None, "mean_ms": None,
+                            "error": "capture failed"})
+    results.sort(key=lambda r: (not r["ok"], r["latency_ms"] or 0))
+    return results
+
+
+def probe_backends(force=False):
+    """Probe the backends once and cache the fastest working one; returns the probe results"""
+    global _preferred_backend, _probe_results
+    with _probe_lock:
+        if _probe_results is None or force:
+            _probe_results = benchmark_backends(repeat=1)
+            working = [r["name"] for r in _probe_results if r["ok"]]
+            _preferred_backend = working[0] if working else None
+            print(f"Screenshot backend: {_preferred_backend or 'none available'}")
+        return _probe_results
+
+
+def get_preferred_backend():
+    """Name of the cached fastest working backend (probing on first use), or None"""
+    probe_backends()
+    return _preferred_backend
+
+
+def capture_screen(region=None):
+    """Capture the screen (or region) with the cached fastest backend, None if nothing works.
+
+    If the cached backend stops working the backends are probed again once.
+    """
+    for attempt in range(2):
+        name = get_preferred_backend()
+        if name is None:
+            return None
+        backend = next(b for n, b, _ in BACKENDS if n == name)
+        screenshot = backend(region)
+        if screenshot is not None:
+            return screenshot
+        if attempt == 0:
+            probe_backends(force=True)
+    return None
+
+
+class ScreenshotMiniGUI:
+    def __init__(self, root, callback=None, save_dir="screenshots", hotkey=None,
+                 image_callback=None, save_to_disk=True, region=None, dedup_distance=None,
+                 dedup_fields=None):
+        """
+        callback(path) is called after a capture has been written to disk.
+        image_callback(image, path, region) receives every capture in memory as
+        a BGR numpy array (path is None when save_to_disk is False), so OCR can
+        start without waiting for or re-reading the PNG.
+        region is an optional (left, top, width, height) screen area; only
+        that area is grabbed, encoded and handed on.
+        dedup_distance enables near-duplicate skipping: a capture whose
+        perceptual hash is within that Hamming distance of an earlier capture
+        of this session is neither saved nor handed on. dedup_fields (template
+        fields relative to the capture) limits the hash to those regions, so
+        different forms on the same template are not taken for duplicates.
+        """
+        self.root = root
+        self.callback = callback
+        self.image_callback = image_callback
+        self.save_to_disk = save_to_disk
+        self.region = normalize_region(region)
+        self.save_dir = save_dir
+        self.hotkey = hotkey
+        # Results from background threads, delivered on the Tk thread
+        self._ui_queue = queue.Queue()
+        # Burst capture: one capture thread, PNG encoding on a small pool
+        self._capture_queue = queue.Queue()
+        self._capture_thread = None
+        self._encoder_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="png-encoder")
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._capture_seq = 0
+        self._hidden_since = None
+        self._dedup_fields = dedup_fields or None
+        self._hash_index = None
+        if dedup_distance is not None:
+            bits = HASH_BITS * len(self._dedup_fields) if self._dedup_fields else HASH_BITS
+            self._hash_index = HashIndex(dedup_distance, bits=bits)
+        self.root.title("Mini Screenshot")
+        self.root.geometry("250x300")
+        self.root.resizable(False, False)
+
+        # Keep the window on top so user can reuse it easily
+        try:
+            self.root.attributes('-topmost', True)
+        except Exception:
+            pass
+
+        # Ensure the save directory exists
+        os.makedirs(self.save_dir, exist_ok=True)
+
+        self.btn = Button(root, text="Capture", command=self.take_screenshot,
+                          font=("Arial", 12), width=12)
+        self.btn.pack(pady=10)
+
+        self.preview_label = Label(root, text="(Preview akan muncul di sini)", fg="gray")
+        self.preview_label.pack(pady=10)
+
+        # Status label to show save notification without modal dialogs
+        self.status_label = Label(root, text="", fg="#10b981")
+        self.status_label.pack(pady=(6, 0))
+
+        # Hotkey label
+        self.hotkey_label = Label(root, text=(f"Hotkey: {self.hotkey}" if self.hotkey else "Hotkey: -"), fg="gray")
+        self.hotkey_label.pack(pady=(4, 0))
+
+        # Capture backend, probed once in the background
+        self.backend_label = Label(root, text="Backend: ...", fg="gray")
+        self.backend_label.pack(pady=(2, 0))
+        threading.Thread(target=self._probe_backend, daemon=True).start()
+
+        # Keep the window on top so user can reuse it easily
+        try:
+            self.root.attributes('-topmost', True)
+            # remove topmost after a moment so it doesn't block user
+            # self.root.after(800, lambda: self.root.attributes('-topmost', False))
+            pass
+        except Exception:
+            pass
+        
+        # Close button to allow user to close mini GUI when finished
+        try:
+            self.close_btn = Button(root, text="Close", command=self.root.destroy, font=("Arial", 10), width=10)
+            self.close_btn.pack(pady=(8, 6))
+        except Exception:
+            pass
+
+        # Try to register global hotkey if provided. Fall back to Tk binding when global not available.
+        if self.hotkey:
+            try:
+                import keyboard
+
+                # Register global hotkey -> schedule screenshot on main thread
+                try:
+                    keyboard.add_hotkey(self.hotkey, lambda: self.root.after(0, self.take_screenshot))
+                    self.hotkey_label.config(fg="#10b981")
+                except Exception as e:
+                    print(f"Failed to register global hotkey with keyboard: {e}")
+                    # fallback to Tk binding
+                    try:
+                        tk_binding = self.hotkey if self.hotkey.startswith("<") else f"<{self.hotkey}>"
+                        self.root.bind_all(tk_binding, lambda e: self.take_screenshot())
+                        self.hotkey_label.config(fg="#10b981")
+                    except Exception:
+                        self.hotkey_label.config(fg="#ef4444")
+            except Exception:
+                # keyboard module unavailable; try Tk binding syntax
+                try:
+                    tk_binding = self.hotkey if self.hotkey.startswith("<") else f"<{self.hotkey}>"
+                    self.root.bind_all(tk_binding, lambda e: self.take_screenshot())
+                    self.hotkey_label.config(fg="#10b981")
+                except Exception as e:
+                    print(f"Tkinter bind for hotkey failed: {e}")
+                    self.hotkey_label.config(fg="#ef4444")
+
+        # Tambahkan di __init__
+        self.pin_var = tk.BooleanVar(value=True)  # default: pinned
+
+        # Tambahkan tombol pin/unpin
+        self.pin_btn = Button(root, text="📌 Pin", command=self.toggle_pin, font=("Arial", 8), width=6)
+        self.pin_btn.pack(pady=(4, 0))
+
+        self._drain_ui_queue()
+
+    def _drain_ui_queue(self):
+        """Run callbacks queued by background threads on the Tk thread"""
+        while True:
+            try:
+                func, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Screenshot callback error: {e}")
+        try:
+            self.root.after(50, self._drain_ui_queue)
+        except Exception:
+            pass  # window destroyed
+
+    def _probe_backend(self):
+        """Probe capture backends off the Tk thread and show the winner"""
+        results = probe_backends()
+        winner = next((r for r in results if r["ok"]), None)
+        text = f"Backend: {winner['name']} ({winner['latency_ms']:.0f} ms)" if winner else "Backend: tidak tersedia"
+        self._ui_queue.put((lambda: self.backend_label.config(text=text, fg="#10b981" if winner else "#ef4444"), ()))
+
+    def set_region(self, region):
+        """Limit later captures to (left, top, width, height), or None for full screen"""
+        self.region = normalize_region(region)
+
+    def toggle_pin(self):
+        current = self.pin_var.get()
+        self.pin_var.set(not current)
+        self.root.attributes('-topmost', self.pin_var.get())
+        # Perbarui teks tombol
+        if self.pin_var.get():
+            self.pin_btn.config(text="📌 Pin")
+        else:
+            self.pin_btn.config(text="🔓 Unpin")
+
+    def take_screenshot(self):
+        """Queue one capture; safe to call in rapid bursts (button or hotkey)"""
+        self._capture_seq += 1
+        filename = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3] + f"_{self._capture_seq:03d}.png"
+        path = os.path.join(self.save_dir, filename)
+
+        with self._pending_lock:
+            self._pending += 1
+
+        # Sembunyikan sementara (tanpa mengubah topmost) → jendela akan tetap di atas setelah muncul
+        if self._hidden_since is None:
+            self.root.withdraw()
+            self._hidden_since = time.monotonic()
+
+        self._capture_queue.put((path, self.region, self._hidden_since))
+
+        if self._capture_thread is None:
+            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._capture_thread.start()
+
+    def _capture_loop(self):
+        """Capture thread: takes queued captures one by one at full rate"""
+        while True:
+            path, region, hidden_since = self._capture_queue.get()
+            # Give the window manager time to hide the mini window (only right after hiding)
+            delay = HIDE_DELAY - (time.monotonic() - hidden_since)
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                # Cached fastest backend (see probe_backends)
+                screenshot = capture_screen(region)
+                if screenshot is None:
+                    # All methods failed - show user-friendly error
+                    self._ui_queue.put((self._show_screenshot_error, ()))
+                elif self._is_duplicate(screenshot, path):
+                    pass
+                else:
+                    image = to_bgr_array(screenshot) if self.image_callback else None
+                    preview = screenshot.resize((200, 120), Image.Resampling.BILINEAR, reducing_gap=2.0)
+                    self._ui_queue.put((self._on_captured, (preview, image, path, region)))
+
+                    # Persist on the encoder pool; callback(path) fires once the file exists
+                    if self.save_to_disk:
+                        self._encoder_pool.submit(self._save_screenshot, screenshot, path)
+            except Exception as e:
+                print(f"Screenshot error: {e}")
+                self._ui_queue.put((self._show_screenshot_error, (str(e),)))
+            finally:
+                with self._pending_lock:
+                    self._pending -= 1
+                    burst_done = self._pending == 0
+                if burst_done:
+                    self._ui_queue.put((self._show_window, ()))
+
+    def _is_duplicate(self, screenshot, path):
+        """Check a capture against earlier ones; report and return True for near-duplicates"""
+        if self._hash_index is None:
+            return False
+        if self._dedup_fields:
+            value = fields_hash(screenshot, self._dedup_fields)
+        else:
+            value = image_hash(screenshot)
+        match = self._hash_index.add_or_find(value, path)
+        if match is None:
+            return False
+        original, distance = match
+        print(f"Duplicate capture skipped (distance {distance}): {original}")
+        self._ui_queue.put((self._on_duplicate, (original,)))
+        return True
+
+    def _on_duplicate(self, original):
+        try:
+            self.status_label.config(text=f"Duplikat: {os.path.basename(original)}", fg="#f59e0b")
+            self.root.after(2500, lambda: self.status_label.config(text="", fg="#10b981"))
+        except Exception:
+            pass
+
+    def _show_window(self):
+        """Bring the mini window back once no captures are pending"""
+        with self._pending_lock:
+            if self._pending:
+                return
+        self._hidden_since = None
+        self.root.deiconify()
+        # Pastikan jendela tetap di atas setelah muncul kembali
+        try:
+            self.root.attributes('-topmost', self.pin_var.get())
+        except Exception:
+            pass
+
+    def _on_captured(self, preview, image, path, region):
+        """Show the preview and hand the capture on (Tk thread)"""
+        preview = ImageTk.PhotoImage(preview)
+        self.preview_label.config(image=preview, text="")
+        self.preview_label.image = preview
+
+        # Hand the in-memory image straight to the OCR consumer
+        if self.image_callback:
+            self.image_callback(image, path if self.save_to_disk else None, region)
+
+        if not self.save_to_disk:
+            try:
+                self.status_label.config(text="Tertangkap (memori)", fg="#10b981")
+                self.root.after(2500, lambda: self.status_label.config(text="", fg="#10b981"))
+            except Exception:
+                pass
+
+    def _save_screenshot(self, screenshot, path):
+        """Encode and save a capture (runs in a background thread)"""
+        try:
+            screenshot.save(path)
+            print("Saved:", path)
+            self._ui_queue.put((self._on_screenshot_saved, (path,)))
+        except Exception as e:
+            print(f"Screenshot save error: {e}")
+            self._ui_queue.put((self._show_screenshot_error, (str(e),)))
+
+    def _on_screenshot_saved(self, path):
+        # Send path to main GUI
+        if self.callback:
+            self.callback(path)
+
+        # Show non-blocking notification
+        try:
+            self.status_label.config(text=f"Tersimpan: {os.path.basename(path)}", fg="#10b981")
+            self.root.after(2500, lambda: self.status_label.config(text="", fg="#10b981"))
+        except Exception:
+            pass
+
+    def _take_screenshot_pyautogui(self, region=None):
+        """Try to take screenshot using pyautogui"""
+        return capture_pyautogui(region)
+
+    def _take_screenshot_imagegrab(self, region=None):
+        """Try to take screenshot using PIL ImageGrab (no system dependencies)"""
+        return capture_imagegrab(region)
+
+    def _take_screenshot_subprocess(self, region=None):
+        """Try to take screenshot using system commands"""
+        return capture_subprocess(region)
+
+    def _show_screenshot_error(self, error_msg=None):
+        """Show error message using status label instead of messagebox"""
+        error_details = error_msg or "Unknown error"
+        
+        print(f"Screenshot failed: {error_details}")
+        
+        # Update status label
+        try:
+            self.status_label.config(text="Screenshot gagal", fg="#ef4444")
+            self.root.after(3500, lambda: self.status_label.config(text="", fg="#10b981"))
+        except Exception:
+            pass
+
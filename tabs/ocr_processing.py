@@ -8,7 +8,8 @@ import threading
 import time
 from tkinter import messagebox
 
-from ocr_worker import run_ocr
+from metrics import format_summary
+from ocr_worker import read_metrics, run_ocr
 
 
 class OCRProcessing:
@@ -57,10 +58,20 @@ class OCRProcessing:
         elapsed = int(time.time() - (self._ocr_start_time or time.time()))
         mins, secs = divmod(elapsed, 60)
         self.ocr_tab.ocr_timer_label.config(text=f"Waktu: {mins:02d}:{secs:02d}")
+        self._update_metrics_readout()
         
         # Schedule next update / Jadwalkan pembaruan berikutnya
         self._ocr_timer_job = self.root.after(1000, self._update_ocr_timer)
 
+    def _update_metrics_readout(self):
+        """
+        Show the batch counters from the worker's metrics textfile.
+        Tampilkan penghitung batch dari file metrik worker.
+        """
+        snapshot = read_metrics(self.ocr_tab.output_folder_path) if self.ocr_tab.output_folder_path else None
+        if snapshot is not None:
+            self.ocr_tab.ocr_metrics_label.config(text=format_summary(snapshot))
+
     def _animate_ocr_loading(self):
         """
         Animate loading indicator during OCR processing.
@@ -84,6 +95,12 @@ class OCRProcessing:
         """
         self._ocr_running = False
         
+        # Final counters / Penghitung akhir
+        try:
+            self.root.after(0, self._update_metrics_readout)
+        except Exception:
+            pass
+        
         # Cancel timer / Batalkan timer
         try:
             if self._ocr_timer_job:
@@ -125,10 +142,8 @@ class OCRProcessing:
             
             if mode == "folder":
                 input_path = self.ocr_tab.input_folder_path
-                is_batch = True
             else:
                 input_path = self.ocr_tab.input_file_path
-                is_batch = False
             
             # Get output folder / Dapatkan folder output
             output_path = self.ocr_tab.output_folder_path
@@ -146,24 +161,28 @@ class OCRProcessing:
             self.ocr_tab.log.see('end')
             
             # Run OCR processing / Jalankan pemrosesan OCR
-            result = run_ocr(
+            errors = []
+            manifest = run_ocr(
                 template_path=self.current_template_path,
                 input_path=input_path,
-                output_path=output_path,
-                is_batch=is_batch,
+                output_dir=output_path,
                 export_format=export_format,
-                log_callback=self._log_ocr_message
+                progress_cb=self._log_ocr_message,
+                done_cb=lambda success, message: errors.append(message) if not success else None
             )
             
             # Log result / Catat hasil
-            if result:
+            if manifest:
                 self.ocr_tab.log.insert('end', "\n" + "=" * 50 + "\n")
                 self.ocr_tab.log.insert('end', f"✅ Pemrosesan OCR selesai!\n")
-                self.ocr_tab.log.insert('end', f"📁 Hasil tersimpan di: {output_path}\n")
+                for path in manifest["output_paths"]:
+                    self.ocr_tab.log.insert('end', f"📁 Hasil tersimpan di: {path}\n")
                 self.ocr_tab.log.see('end')
             else:
                 self.ocr_tab.log.insert('end', "\n" + "=" * 50 + "\n")
                 self.ocr_tab.log.insert('end', "❌ Pemrosesan OCR gagal.\n")
+                for message in errors:
+                    self.ocr_tab.log.insert('end', f"{message}\n")
                 self.ocr_tab.log.see('end')
         
         except Exception as e:
@@ -251,6 +270,7 @@ class OCRProcessing:
         self._ocr_running = True
         self._ocr_start_time = time.time()
         self._loading_dots = 0
+        self.ocr_tab.ocr_metrics_label.config(text="")
 
         # Start UI timers / Mulai timer UI
         self._update_ocr_timer()
@@ -7,10 +7,31 @@ Handles OCR tab interface and template/input/output selection.
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import os
+import queue
+import threading
 
 from modern_styles import create_modern_frame, create_modern_button, create_modern_label
 
 
+# Folder tree scanning / Pemindaian tree folder
+SCAN_CHUNK_SIZE = 200      # Entries per queued chunk / Entri per chunk antrian
+SCAN_POLL_MS = 50          # Queue poll interval / Interval polling antrian
+SCAN_INSERTS_PER_TICK = 1000  # Max tree inserts per poll / Maks insert tree per polling
+PLACEHOLDER_TEXT = "⏳ Memuat..."
+
+
+def format_size(num_bytes):
+    """
+    Format a byte count as a short human readable string.
+    Format jumlah byte menjadi string singkat yang mudah dibaca.
+    """
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
 class OCRTab:
     """
     Manages the OCR Process tab interface and file selection functionality.
@@ -44,6 +65,16 @@ class OCRTab:
         self.start_btn = None
         self.ocr_timer_label = None
         self.ocr_loading_label = None
+        self.ocr_metrics_label = None
+        
+        # Lazy folder tree state / State tree folder lazy
+        self._tree_paths = {}        # item id -> directory path
+        self._tree_loaded = set()    # item ids whose children were scanned
+        self._folder_stats = {}      # item id -> [file_count, total_bytes, scanning]
+        self._scan_queue = queue.Queue()
+        self._scan_generation = 0
+        self._active_scans = 0
+        self._scan_poll_job = None
         
         self.setup_ui()
     
@@ -185,7 +216,7 @@ class OCRTab:
         self.export_format_combo = ttk.Combobox(
             export_row,
             textvariable=self.export_format_var,
-            values=["CSV", "Excel"],
+            values=["CSV", "Excel", "Parquet", "SQLite"],
             state="readonly",
             font=('Consolas', 9),
             width=10
@@ -209,6 +240,10 @@ class OCRTab:
         
         self.ocr_loading_label = create_modern_label(left_panel, "", style='Modern.TLabel')
         self.ocr_loading_label.pack()
+
+        # Live counters of the running batch / Penghitung batch yang sedang berjalan
+        self.ocr_metrics_label = create_modern_label(left_panel, "", style='Modern.TLabel')
+        self.ocr_metrics_label.pack()
         
         # ========================================
         # Right Panel: Preview & Log / Panel Kanan: Pratinjau & Log
@@ -223,7 +258,13 @@ class OCRTab:
         tree_frame = tk.Frame(tree_section, bg='white')
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=(6, 0))
         
-        self.input_tree = ttk.Treeview(tree_frame, show='tree')
+        self.input_tree = ttk.Treeview(tree_frame, columns=("files", "size"), show='tree headings')
+        self.input_tree.heading("#0", text="Nama")
+        self.input_tree.heading("files", text="File")
+        self.input_tree.heading("size", text="Ukuran")
+        self.input_tree.column("files", width=70, anchor='e', stretch=False)
+        self.input_tree.column("size", width=90, anchor='e', stretch=False)
+        self.input_tree.bind('<<TreeviewOpen>>', self._on_tree_open)
         tree_v_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.input_tree.yview)
         self.input_tree.configure(yscrollcommand=tree_v_scroll.set)
         self.input_tree.grid(row=0, column=0, sticky="nsew")
@@ -333,6 +374,12 @@ class OCRTab:
         Clear all items from the input folder treeview.
         Hapus semua item dari treeview folder input.
         """
+        # Invalidate running scans / Batalkan pemindaian yang sedang berjalan
+        self._scan_generation += 1
+        self._active_scans = 0
+        self._tree_paths.clear()
+        self._tree_loaded.clear()
+        self._folder_stats.clear()
         try:
             for item in self.input_tree.get_children():
                 self.input_tree.delete(item)
@@ -344,6 +391,13 @@ class OCRTab:
         Display folder structure in the treeview.
         Tampilkan struktur folder di treeview.
         
+        Only the top level is scanned right away; subfolders are scanned when
+        they are expanded. Scanning runs in a background thread and entries
+        are streamed into the tree in chunks.
+        Hanya level teratas yang dipindai langsung; subfolder dipindai saat
+        dibuka. Pemindaian berjalan di thread latar belakang dan entri
+        dimasukkan ke tree secara bertahap.
+        
         Args:
             folder_path: Path to the folder to display / Path ke folder yang akan ditampilkan
         """
@@ -360,34 +414,141 @@ class OCRTab:
         # Insert root folder / Masukkan folder root
         root_name = os.path.basename(base_path) or base_path
         root_id = self.input_tree.insert('', 'end', text=root_name, open=True)
+        self._tree_paths[root_id] = base_path
+        self._folder_stats[root_id] = [0, 0, True]
 
-        nodes = {base_path: root_id}
+        self._load_tree_node(root_id)
 
-        # Walk through directory / Jelajahi direktori
-        for current_root, dirs, files in os.walk(base_path):
-            current_root_norm = os.path.normpath(os.path.abspath(current_root))
-            
-            if not current_root_norm.startswith(base_path):
-                continue
+    def _on_tree_open(self, event=None):
+        """
+        Scan a folder the first time its node is expanded.
+        Pindai folder saat node-nya dibuka pertama kali.
+        """
+        item = self.input_tree.focus()
+        if item in self._tree_paths:
+            self._load_tree_node(item)
 
-            parent_id = nodes.get(current_root_norm, root_id)
+    def _load_tree_node(self, item):
+        """
+        Start a background scan for the folder behind a tree node.
+        Mulai pemindaian latar belakang untuk folder dari node tree.
+        
+        Args:
+            item: Treeview item id of the folder / Id item treeview dari folder
+        """
+        if item in self._tree_loaded:
+            return
+        self._tree_loaded.add(item)
 
-            # Sort for consistent display / Urutkan untuk tampilan konsisten
-            dirs.sort()
-            files.sort()
+        # Remove the expand placeholder / Hapus placeholder expand
+        for child in self.input_tree.get_children(item):
+            if child not in self._tree_paths:
+                self.input_tree.delete(child)
 
-            # Add directories / Tambahkan direktori
-            for d in dirs:
-                full_d = os.path.normpath(os.path.join(current_root_norm, d))
-                try:
-                    nid = self.input_tree.insert(parent_id, 'end', text=d, open=False)
-                    nodes[full_d] = nid
-                except Exception:
-                    continue
+        self._folder_stats[item] = [0, 0, True]
+        self._update_folder_stats(item)
+
+        self._active_scans += 1
+        worker = threading.Thread(
+            target=self._scan_folder_worker,
+            args=(self._scan_generation, item, self._tree_paths[item]),
+            daemon=True
+        )
+        worker.start()
 
-            # Add files / Tambahkan file
-            for f in files:
+        if self._scan_poll_job is None:
+            self._scan_poll_job = self.parent_frame.after(SCAN_POLL_MS, self._poll_scan_queue)
+
+    def _scan_folder_worker(self, generation, item, path):
+        """
+        Scan one folder level, sort it and queue its entries in chunks.
+        Pindai satu level folder, urutkan dan antrekan entrinya per chunk.
+        
+        Runs in a background thread and never touches tkinter widgets.
+        Berjalan di thread latar belakang dan tidak menyentuh widget tkinter.
+        """
+        found = []
+        error = None
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if generation != self._scan_generation:
+                        return
+                    try:
+                        is_dir = entry.is_dir()
+                        size = 0 if is_dir else entry.stat().st_size
+                    except OSError:
+                        continue
+                    found.append((entry.name, entry.path, is_dir, size))
+        except OSError as e:
+            error = str(e)
+
+        # Sort the whole level before chunking: directories first, then files, by name
+        # Urutkan seluruh level sebelum dibagi chunk: direktori dulu, lalu file, menurut nama
+        found.sort(key=lambda e: (not e[2], e[0]))
+        for start in range(0, len(found), SCAN_CHUNK_SIZE):
+            if generation != self._scan_generation:
+                return
+            self._scan_queue.put(("chunk", generation, item, found[start:start + SCAN_CHUNK_SIZE]))
+        self._scan_queue.put(("done", generation, item, error))
+
+    def _poll_scan_queue(self):
+        """
+        Move queued scan results into the treeview on the Tk thread.
+        Pindahkan hasil pemindaian dari antrian ke treeview di thread Tk.
+        """
+        self._scan_poll_job = None
+        inserted = 0
+        touched = set()
+        while inserted < SCAN_INSERTS_PER_TICK:
+            try:
+                kind, generation, item, payload = self._scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._scan_generation or not self.input_tree.exists(item):
+                continue
+
+            stats = self._folder_stats[item]
+            if kind == "done":
+                self._active_scans -= 1
+                stats[2] = False
+                touched.add(item)
+                if payload and self.log:
+                    self.log.insert(tk.END, f"⚠️ Gagal membaca folder: {payload}\n")
+                    self.log.see(tk.END)
+                continue
+
+            # Chunks arrive already sorted / Chunk sudah terurut dari thread pemindai
+            for name, path, is_dir, size in payload:
                 try:
-                    self.input_tree.insert(parent_id, 'end', text=f, open=False)
+                    if is_dir:
+                        nid = self.input_tree.insert(item, 'end', text=name, open=False, values=("", ""))
+                        self._tree_paths[nid] = path
+                        # Placeholder child so the folder can be expanded / Child placeholder agar folder bisa dibuka
+                        self.input_tree.insert(nid, 'end', text=PLACEHOLDER_TEXT)
+                    else:
+                        self.input_tree.insert(item, 'end', text=name, values=("", format_size(size)))
+                        stats[0] += 1
+                        stats[1] += size
                 except Exception:
                     continue
+            inserted += len(payload)
+            touched.add(item)
+
+        for item in touched:
+            self._update_folder_stats(item)
+
+        if self._active_scans > 0 or not self._scan_queue.empty():
+            self._scan_poll_job = self.parent_frame.after(SCAN_POLL_MS, self._poll_scan_queue)
+
+    def _update_folder_stats(self, item):
+        """
+        Show the running file count and total size of a folder node.
+        Tampilkan jumlah file dan total ukuran folder yang sedang berjalan.
+        """
+        file_count, total_bytes, scanning = self._folder_stats.get(item, (0, 0, False))
+        suffix = "…" if scanning else ""
+        try:
+            self.input_tree.item(item, values=(f"{file_count}{suffix}", format_size(total_bytes)))
+        except Exception:
+            pass
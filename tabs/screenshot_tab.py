@@ -7,9 +7,24 @@ Handles screenshot capture functionality and UI for the Screenshot tab.
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from modern_styles import create_modern_frame, create_modern_button, create_modern_label
-from screenshot import ScreenshotMiniGUI
+
+# screenshot (pyautogui, numpy) and extract (cv2, pytesseract) are imported
+# on first use to keep GUI startup fast
+# screenshot dan extract diimpor saat pertama dipakai agar GUI cepat terbuka
+
+
+# Padding around the template bounds when capturing only the template area
+# Padding di sekitar batas template saat hanya menangkap area template
+TEMPLATE_REGION_PADDING = 8
+
+# Max Hamming distance between perceptual hashes treated as the same screen
+# Jarak Hamming maksimum antar perceptual hash yang dianggap layar yang sama
+# (0 = identical hash only; near matches confuse different forms of one template)
+# (0 = hanya hash identik; jarak lebih besar mengacaukan formulir berbeda dari template yang sama)
+DUPLICATE_DISTANCE = 0
 
 
 class ScreenshotTab:
@@ -31,6 +46,16 @@ class ScreenshotTab:
         self.screenshot_log = None
         self.folder_entry = None
         self.folder_var = None
+        self.save_png_var = None
+        self.ocr_on_capture_var = None
+        self.region_mode_var = None
+        self.region_var = None
+        self.skip_duplicates_var = None
+        
+        # Template OCR on capture / OCR template saat capture
+        self.template_provider = None   # callable returning the active template path
+        self._template_cache = {}       # path -> (mtime, fields)
+        self._ocr_executor = None
         
         # Ensure screenshot folder exists / Pastikan folder screenshot ada
         os.makedirs(self.image_folder, exist_ok=True)
@@ -91,6 +116,57 @@ class ScreenshotTab:
             style='Modern.TButton'
         ).pack(pady=20)
 
+        # Capture options / Opsi capture
+        options_row = create_modern_frame(screenshot_section, padding=0)
+        options_row.pack(fill=tk.X)
+        self.save_png_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            options_row,
+            text="💾 Simpan PNG",
+            variable=self.save_png_var,
+            bg='white'
+        ).pack(side=tk.LEFT)
+        self.ocr_on_capture_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            options_row,
+            text="🔍 OCR langsung dengan template aktif",
+            variable=self.ocr_on_capture_var,
+            bg='white'
+        ).pack(side=tk.LEFT, padx=(15, 0))
+        self.skip_duplicates_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            options_row,
+            text="🧬 Lewati duplikat",
+            variable=self.skip_duplicates_var,
+            bg='white'
+        ).pack(side=tk.LEFT, padx=(15, 0))
+
+        # Capture area selection / Pemilihan area capture
+        region_row = create_modern_frame(screenshot_section, padding=0)
+        region_row.pack(fill=tk.X, pady=(8, 0))
+        create_modern_label(region_row, "🖼️ Area:", style='Modern.TLabel').pack(side=tk.LEFT)
+        self.region_mode_var = tk.StringVar(value="full")
+        for text, value in (("Layar penuh", "full"), ("Area template", "template"), ("Custom", "custom")):
+            tk.Radiobutton(
+                region_row,
+                text=text,
+                variable=self.region_mode_var,
+                value=value,
+                bg='white'
+            ).pack(side=tk.LEFT, padx=(8, 0))
+        self.region_var = tk.StringVar(value="0,0,800,600")
+        tk.Entry(
+            region_row,
+            textvariable=self.region_var,
+            font=('Consolas', 9),
+            width=18,
+            bg='white',
+            fg='#1e293b',
+            relief='solid',
+            borderwidth=1
+        ).pack(side=tk.LEFT, padx=(8, 0))
+        create_modern_label(region_row, "x,y,w,h", style='Modern.TLabel').pack(side=tk.LEFT, padx=(6, 0))
+
         # Log area for screenshot activity / Area log untuk aktivitas screenshot
         log_frame = create_modern_frame(screenshot_section, padding=15)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=(20, 0))
@@ -142,15 +218,73 @@ class ScreenshotTab:
         Open screenshot capture window.
         Buka jendela pengambilan screenshot.
         """
+        try:
+            region = self.get_capture_region()
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Area capture tidak valid: {e}")
+            return
+        if region:
+            self.screenshot_log.insert(tk.END, f"🖼️ Area capture: x={region[0]}, y={region[1]}, w={region[2]}, h={region[3]}\n")
+            self.screenshot_log.see(tk.END)
+
+        # Duplicates are judged on the template field regions when a template is active
+        # Duplikat dinilai dari area field template jika ada template aktif
+        dedup_fields = self._capture_fields(region) if self.skip_duplicates_var.get() else None
+        
         # Create a new Toplevel window with ScreenshotMiniGUI
+        from screenshot import ScreenshotMiniGUI
         win = tk.Toplevel()
         ScreenshotMiniGUI(
             win, 
             callback=self.after_screenshot, 
             save_dir=self.image_folder, 
-            hotkey="F9"
+            hotkey="F9",
+            image_callback=self.after_capture_image,
+            save_to_disk=self.save_png_var.get(),
+            region=region,
+            dedup_distance=DUPLICATE_DISTANCE if self.skip_duplicates_var.get() else None,
+            dedup_fields=dedup_fields
         )
     
+    def _capture_fields(self, region):
+        """
+        Active template fields relative to the capture area, or None.
+        Field template aktif relatif terhadap area capture, atau None.
+        """
+        template_path = self.template_provider() if self.template_provider else ""
+        if not template_path:
+            return None
+        try:
+            fields = self._get_template_fields(template_path)
+        except Exception:
+            return None
+        if region:
+            from extract import offset_fields
+            fields = offset_fields(fields, -region[0], -region[1])
+        return fields
+    
+    def get_capture_region(self):
+        """
+        Resolve the selected capture area to (left, top, width, height).
+        Ubah area capture yang dipilih menjadi (left, top, width, height).
+        
+        Returns:
+            tuple or None: Screen region, or None for full screen / Area layar, atau None untuk layar penuh
+        """
+        mode = self.region_mode_var.get()
+        if mode == "template":
+            template_path = self.template_provider() if self.template_provider else ""
+            if not template_path:
+                raise ValueError("belum ada template aktif")
+            from extract import fields_bounds
+            return fields_bounds(self._get_template_fields(template_path), padding=TEMPLATE_REGION_PADDING)
+        if mode == "custom":
+            parts = [p.strip() for p in self.region_var.get().split(",")]
+            if len(parts) != 4:
+                raise ValueError("format harus x,y,w,h")
+            return tuple(int(p) for p in parts)
+        return None
+    
     def after_screenshot(self, path):
         """
         Handle screenshot completion callback.
@@ -170,6 +304,92 @@ class ScreenshotTab:
         except Exception as e:
             messagebox.showerror("❌ Error", f"Gagal memproses screenshot: {str(e)}")
     
+    def set_template_provider(self, provider):
+        """
+        Set the callable that returns the active template path.
+        Atur callable yang mengembalikan path template aktif.
+        
+        Args:
+            provider: Callable without arguments / Callable tanpa argumen
+        """
+        self.template_provider = provider
+    
+    def after_capture_image(self, image, path, region=None):
+        """
+        Handle an in-memory capture and OCR it with the active template.
+        Tangani capture di memori dan OCR dengan template aktif.
+        
+        The BGR numpy array comes straight from the capture, so no PNG has
+        to be written or decoded before OCR starts.
+        Array numpy BGR langsung dari capture, sehingga tidak perlu menulis
+        atau membaca PNG sebelum OCR dimulai.
+        
+        Args:
+            image: Captured screen as BGR numpy array / Layar hasil capture sebagai array numpy BGR
+            path: Target PNG path, or None when not saved / Path PNG tujuan, atau None jika tidak disimpan
+            region: Captured screen area, or None for full screen / Area layar yang ditangkap, atau None untuk layar penuh
+        """
+        if path is None:
+            self.screenshot_log.insert(tk.END, f"📸 Screenshot di memori: {image.shape[1]}x{image.shape[0]}\n")
+            self.screenshot_log.see(tk.END)
+
+        if not self.ocr_on_capture_var.get():
+            return
+        template_path = self.template_provider() if self.template_provider else ""
+        if not template_path:
+            self.screenshot_log.insert(tk.END, "⚠️ OCR dilewati: belum ada template aktif\n")
+            self.screenshot_log.see(tk.END)
+            return
+
+        from extract import extract_fields, offset_fields
+        try:
+            fields = self._get_template_fields(template_path)
+            if region:
+                # Template coordinates are screen coordinates; make them relative to the capture
+                # Koordinat template adalah koordinat layar; jadikan relatif terhadap capture
+                fields = offset_fields(fields, -region[0], -region[1])
+        except Exception as e:
+            self.screenshot_log.insert(tk.END, f"❌ Gagal memuat template: {e}\n")
+            self.screenshot_log.see(tk.END)
+            return
+
+        if self._ocr_executor is None:
+            self._ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-ocr")
+        label = os.path.basename(path) if path else "memori"
+        future = self._ocr_executor.submit(extract_fields, image, fields)
+        self._poll_capture_ocr(future, label)
+    
+    def _get_template_fields(self, template_path):
+        """
+        Load template fields, reusing them until the file changes.
+        Muat field template, gunakan ulang sampai file berubah.
+        """
+        mtime = os.path.getmtime(template_path)
+        cached = self._template_cache.get(template_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        from extract import load_template_fields
+        fields = load_template_fields(template_path)
+        self._template_cache[template_path] = (mtime, fields)
+        return fields
+    
+    def _poll_capture_ocr(self, future, label):
+        """
+        Log OCR results on the Tk thread once the background job is done.
+        Catat hasil OCR di thread Tk setelah job latar belakang selesai.
+        """
+        if not future.done():
+            self.parent_frame.after(100, lambda: self._poll_capture_ocr(future, label))
+            return
+        try:
+            results = future.result()
+            self.screenshot_log.insert(tk.END, f"🔍 OCR {label}:\n")
+            for name, text in results.items():
+                self.screenshot_log.insert(tk.END, f"   {name}: {text}\n")
+        except Exception as e:
+            self.screenshot_log.insert(tk.END, f"❌ OCR gagal: {e}\n")
+        self.screenshot_log.see(tk.END)
+    
     def get_output_folder(self):
         """
         Get the current output folder path.
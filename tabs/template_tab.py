@@ -10,7 +10,23 @@ from tkinter import ttk
 import os
 
 from modern_styles import create_modern_frame, create_modern_button, create_modern_label
-from template_gui import ModernTemplateGUI
+
+
+def list_template_files(templates_dir):
+    """
+    Scan a template directory and return the sorted template paths.
+    Pindai direktori template dan kembalikan path template terurut.
+    
+    Safe to call from a background thread / Aman dipanggil dari thread latar belakang.
+    """
+    results = []
+    try:
+        for fname in os.listdir(templates_dir):
+            if fname.lower().endswith('.json'):
+                results.append(os.path.join(templates_dir, fname))
+    except Exception:
+        pass
+    return sorted(results)
 
 
 class TemplateTab:
@@ -50,6 +66,9 @@ class TemplateTab:
         create_modern_label(header_frame, "📐 Template Creator", style='Modern.TLabel').pack()
         
         # Initialize template GUI component / Inisialisasi komponen GUI template
+        # Imported here: template_gui pulls in OpenCV and the OCR engine
+        # Diimpor di sini: template_gui memuat OpenCV dan engine OCR
+        from template_gui import ModernTemplateGUI
         self.template_gui = ModernTemplateGUI(self.parent_frame)
     
     def on_template_created(self, template_path):
@@ -84,14 +103,7 @@ class TemplateTab:
         Returns:
             list: Sorted list of template file paths / Daftar terurut path file template
         """
-        results = []
-        try:
-            for fname in os.listdir(self.templates_dir):
-                if fname.lower().endswith('.json'):
-                    results.append(os.path.join(self.templates_dir, fname))
-        except Exception:
-            pass
-        return sorted(results)
+        return list_template_files(self.templates_dir)
     
     def get_template_gui(self):
         """
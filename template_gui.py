@@ -7,23 +7,29 @@ and save them as JSON templates for OCR processing.
 
 Features:
 - Image loading and display with zoom/pan capabilities
+- Tiled, cached zoom rendering for large scans
 - Rectangle selection for defining extraction regions
 - Template save/load functionality
 - Enhanced OCR preview with confidence scores
+- Live, debounced background OCR of newly drawn fields
 - Field management (edit, delete, statistics)
 - Mini-map navigation for large images
 """
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from PIL import Image, ImageTk  # Pillow for image handling
+from PIL import ImageTk  # Pillow for image handling
 import json  # JSON for template file format
 import os
 import time
 import shutil
-import cv2  # OpenCV for image processing
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from modern_styles import create_modern_frame, create_modern_button, create_modern_label, create_modern_notebook
 from enhanced_ocr import EnhancedOCR
+from image_pyramid import ZoomPyramid
+from image_cache import get_decoded_image
+from profiling import span
 
 
 class ModernTemplateGUI:
@@ -37,7 +43,11 @@ class ModernTemplateGUI:
     Attributes:
         parent_frame: Parent tkinter frame to embed this GUI
         image: PIL Image object for current loaded image
+        decoded: Shared DecodedImage entry the image, preview crops and
+            mini-map thumbnail come from
+        pyramid: ZoomPyramid used to render visible tiles of the image
         rectangles: List of dicts containing field selections
+        rect_items: Canvas item id of each field rectangle, keyed by id(rect)
         zoom_factor: Current zoom level (1.0 = 100%)
         fields_tree: Treeview widget showing selected fields
     """
@@ -45,9 +55,13 @@ class ModernTemplateGUI:
     def __init__(self, parent_frame):
         self.parent_frame = parent_frame
         self.image = None
-        self.tk_image = None
         self.original_image = None
+        self.decoded = None
+        self.minimap_photo = None
         self.rectangles = []
+        self.rect_items = {}
+        self.highlight_rect = None
+        self.highlight_item = None
         self.start_x = None
         self.start_y = None
         self.current_rect = None
@@ -61,8 +75,29 @@ class ModernTemplateGUI:
         self.viewport_width = 600
         self.viewport_height = 400
 
+        # Tiled rendering state
+        self.pyramid = None
+        self.tile_items = {}          # (tx, ty) -> (canvas item id, PhotoImage, is_high_quality)
+        self.tile_zoom = None         # zoom factor the current tile items were rendered for
+        self.hq_delay_ms = 250        # idle time before the high-quality pass
+        self._hq_job = None
+        self._tile_refresh_job = None
+
         self.minimap_canvas = None
 
+        # Background OCR preview state
+        self.preview_delay_ms = 400   # debounce after mouse-up before OCR starts
+        self.ocr_engine = EnhancedOCR(languages="eng+ind", confidence_threshold=0.6)
+        self._ocr_executor = None
+        self._ocr_queue = queue.Queue()
+        self._ocr_poll_job = None
+        self._ocr_cache = {}          # (x, y, w, h) -> OCR result for the current image
+        self._ocr_generation = 0      # bumped per image; results of older images are dropped
+        self._ocr_jobs = {}           # id(rect) -> (box, future)
+        self._ocr_debounce = {}       # id(rect) -> after() job id
+        self._field_results = {}      # id(rect) -> OCR result dict or None while pending
+        self._preview_batch = None    # ids still pending for an explicit Preview run
+
         self.setup_ui()
 
     # ==========================================================================
@@ -187,14 +222,15 @@ class ModernTemplateGUI:
         self.canvas = tk.Canvas(canvas_frame, cursor="cross", bg="white", highlightthickness=0, highlightbackground="white")
         self.canvas.configure(scrollregion=(0, 0, 1000, 800))
 
-        v_scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.canvas.yview)
-        h_scrollbar = ttk.Scrollbar(canvas_frame, orient="horizontal", command=self.canvas.xview)
+        v_scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.on_scroll_y)
+        h_scrollbar = ttk.Scrollbar(canvas_frame, orient="horizontal", command=self.on_scroll_x)
         self.canvas.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         self.canvas.grid(row=0, column=0, sticky="nsew")
         v_scrollbar.grid(row=0, column=1, sticky="ns")
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         canvas_frame.grid_rowconfigure(0, weight=1)
         canvas_frame.grid_columnconfigure(0, weight=1)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_tile_refresh())
 
         minimap_frame = create_modern_frame(self.viewport_frame, padding=5)
         minimap_frame.pack(fill=tk.X, side=tk.BOTTOM)
@@ -353,18 +389,15 @@ class ModernTemplateGUI:
         Redraw the current image on the canvas with current zoom level.
         
         Handles:
-        - Image resizing based on zoom factor
         - Centering the image on canvas
         - Setting up scroll region for large images
+        - Rendering only the visible tiles (fast filter first, then a
+          high-quality pass once zooming stops)
         - Drawing field rectangles on top
         """
         if not self.image:
             return
-        self.canvas.delete("all")
-        new_width = int(self.image.width * self.zoom_factor)
-        new_height = int(self.image.height * self.zoom_factor)
-        display_image = self.image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(display_image)
+        new_width, new_height = self.pyramid.display_size(self.zoom_factor)
         self.canvas.update_idletasks()
         try:
             canvas_width = self.canvas.winfo_width(); canvas_height = self.canvas.winfo_height()
@@ -376,28 +409,159 @@ class ModernTemplateGUI:
             canvas_width, canvas_height = 800, 600
         self.image_offset_x = max(0, (canvas_width - new_width) // 2)
         self.image_offset_y = max(0, (canvas_height - new_height) // 2)
-        image_id = self.canvas.create_image(self.image_offset_x, self.image_offset_y, anchor="nw", image=self.tk_image, tags="main_image")
-        self.redraw_rectangles()
         padding = 20
         scroll_width = max(canvas_width, new_width + 2 * padding)
         scroll_height = max(canvas_height, new_height + 2 * padding)
         self.canvas.configure(scrollregion=(0, 0, scroll_width, scroll_height))
+        self.clear_tiles()
+        self.render_visible_tiles()
+        self.redraw_rectangles()
 
-    def redraw_rectangles(self):
+    def clear_tiles(self):
+        """Remove all tile items from the canvas (cached tiles are kept)."""
+        self.canvas.delete("tile")
+        self.tile_items = {}
+        self.tile_zoom = None
+
+    def visible_tile_range(self):
         """
-        Redraw all field selection rectangles on the canvas.
+        Return the (tx0, ty0, tx1, ty1) tile index range visible in the viewport.
         
-        Each rectangle is scaled according to current zoom level
-        and displayed with a blue outline.
+        The range is inclusive and clipped to the tile grid at the current zoom.
         """
-        if not self.rectangles:
+        tile = self.pyramid.tile_size
+        cols, rows = self.pyramid.tile_grid(self.zoom_factor)
+        left = self.canvas.canvasx(0) - self.image_offset_x
+        top = self.canvas.canvasy(0) - self.image_offset_y
+        right = left + max(self.canvas.winfo_width(), 1)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        tx0 = max(0, int(left // tile)); ty0 = max(0, int(top // tile))
+        tx1 = min(cols - 1, int(right // tile)); ty1 = min(rows - 1, int(bottom // tile))
+        return tx0, ty0, tx1, ty1
+
+    def render_visible_tiles(self, high_quality=False):
+        """
+        Create or update canvas items for the tiles visible in the viewport.
+        
+        Args:
+            high_quality: Render with the high-quality filter. The fast pass
+                schedules a high-quality pass after hq_delay_ms of inactivity.
+        """
+        if not self.image or not self.pyramid:
+            return
+        if self.tile_zoom != self.zoom_factor:
+            self.clear_tiles()
+            self.tile_zoom = self.zoom_factor
+        tile = self.pyramid.tile_size
+        tx0, ty0, tx1, ty1 = self.visible_tile_range()
+        needs_quality_pass = False
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                current = self.tile_items.get((tx, ty))
+                if current and (current[2] or not high_quality):
+                    continue
+                photo, is_hq = self.pyramid.get_tile(self.zoom_factor, tx, ty, high_quality, convert=ImageTk.PhotoImage)
+                if photo is None:
+                    continue
+                if current:
+                    self.canvas.itemconfig(current[0], image=photo)
+                    item = current[0]
+                else:
+                    item = self.canvas.create_image(self.image_offset_x + tx * tile, self.image_offset_y + ty * tile, anchor="nw", image=photo, tags=("main_image", "tile"))
+                    self.canvas.tag_lower(item)
+                self.tile_items[(tx, ty)] = (item, photo, is_hq)
+                needs_quality_pass = needs_quality_pass or not is_hq
+        if self._hq_job:
+            self.canvas.after_cancel(self._hq_job)
+            self._hq_job = None
+        if needs_quality_pass:
+            self._hq_job = self.canvas.after(self.hq_delay_ms, self._render_quality_pass)
+
+    def _render_quality_pass(self):
+        """Re-render visible tiles with the high-quality filter once zooming has stopped."""
+        self._hq_job = None
+        self.render_visible_tiles(high_quality=True)
+
+    def schedule_tile_refresh(self):
+        """Coalesce scroll/resize events into a single tile render on idle."""
+        if not self.image or self._tile_refresh_job:
             return
+        def refresh():
+            self._tile_refresh_job = None
+            self.render_visible_tiles()
+        self._tile_refresh_job = self.canvas.after_idle(refresh)
+
+    def on_scroll_x(self, *args):
+        """Scroll the canvas horizontally and render newly exposed tiles."""
+        self.canvas.xview(*args); self.schedule_tile_refresh()
+
+    def on_scroll_y(self, *args):
+        """Scroll the canvas vertically and render newly exposed tiles."""
+        self.canvas.yview(*args); self.schedule_tile_refresh()
+
+    def field_canvas_coords(self, rect):
+        """Return the (x1, y1, x2, y2) canvas coordinates of a field at the current zoom."""
+        x = int(rect["x"] * self.zoom_factor + self.image_offset_x)
+        y = int(rect["y"] * self.zoom_factor + self.image_offset_y)
+        w = int(rect["w"] * self.zoom_factor)
+        h = int(rect["h"] * self.zoom_factor)
+        return x, y, x + w, y + h
+
+    def add_field_item(self, rect):
+        """Create the canvas rectangle for a single field and remember its item id."""
+        item = self.canvas.create_rectangle(*self.field_canvas_coords(rect), outline="#2563eb", width=2, tags="field_rect")
+        self.rect_items[id(rect)] = item
+        return item
+
+    def remove_field_item(self, rect):
+        """Delete the canvas rectangle (and highlight) belonging to a single field."""
+        item = self.rect_items.pop(id(rect), None)
+        if item:
+            self.canvas.delete(item)
+        if self.highlight_rect is rect:
+            self.clear_highlight()
+        self.cancel_field_ocr(rect)
+
+    def redraw_rectangles(self):
+        """
+        Bring the field rectangles on the canvas in line with self.rectangles.
+        
+        Items are kept per field: rectangles that no longer exist are deleted,
+        new ones are created, and existing ones are only moved with
+        canvas.coords to follow the current zoom level and offset.
+        """
+        current = {id(rect): rect for rect in self.rectangles}
+        for key in [key for key in self.rect_items if key not in current]:
+            self.canvas.delete(self.rect_items.pop(key))
+        for key in [key for key in self._field_results if key not in current]:
+            self._cancel_ocr_job(key); self._field_results.pop(key, None)
+        if self.highlight_rect is not None and id(self.highlight_rect) not in current:
+            self.clear_highlight()
         for rect in self.rectangles:
-            x = int(rect["x"] * self.zoom_factor + self.image_offset_x)
-            y = int(rect["y"] * self.zoom_factor + self.image_offset_y)
-            w = int(rect["w"] * self.zoom_factor)
-            h = int(rect["h"] * self.zoom_factor)
-            self.canvas.create_rectangle(x, y, x + w, y + h, outline="#2563eb", width=2, tags="field_rect")
+            item = self.rect_items.get(id(rect))
+            if item:
+                self.canvas.coords(item, *self.field_canvas_coords(rect))
+            else:
+                self.add_field_item(rect)
+        self.update_highlight()
+
+    def update_highlight(self):
+        """Move the selection highlight onto the currently highlighted field."""
+        if self.highlight_rect is None:
+            return
+        coords = self.field_canvas_coords(self.highlight_rect)
+        if self.highlight_item:
+            self.canvas.coords(self.highlight_item, *coords)
+        else:
+            self.highlight_item = self.canvas.create_rectangle(*coords, outline="#fbbf24", width=4, tags="highlight")
+        self.canvas.tag_raise(self.highlight_item)
+
+    def clear_highlight(self):
+        """Remove the selection highlight from the canvas."""
+        if self.highlight_item:
+            self.canvas.delete(self.highlight_item)
+        self.highlight_item = None
+        self.highlight_rect = None
 
     def update_minimap(self):
         if not self.minimap_canvas or not self.image:
@@ -410,6 +574,9 @@ class ModernTemplateGUI:
         minimap_scale = min(scale_x, scale_y)
         scaled_width = int(self.image.width * minimap_scale); scaled_height = int(self.image.height * minimap_scale)
         x = (minimap_width - scaled_width) // 2; y = (minimap_height - scaled_height) // 2
+        if self.decoded and scaled_width > 0 and scaled_height > 0:
+            self.minimap_photo = ImageTk.PhotoImage(self.decoded.thumbnail(scaled_width, scaled_height))
+            self.minimap_canvas.create_image(x, y, anchor="nw", image=self.minimap_photo, tags="minimap_image")
         self.minimap_canvas.create_rectangle(x, y, x + scaled_width, y + scaled_height, outline="#2563eb", width=2, tags="minimap_border")
         for rect in self.rectangles:
             mx = x + int(rect["x"] * minimap_scale); my = y + int(rect["y"] * minimap_scale)
@@ -431,13 +598,9 @@ class ModernTemplateGUI:
         if selection:
             item = self.fields_tree.item(selection[0])
             field_name = item['values'][0]
-            for i, rect in enumerate(self.rectangles):
-                if rect["name"] == field_name:
-                    self.canvas.delete("highlight")
-                    x = int(rect["x"] * self.zoom_factor + self.image_offset_x)
-                    y = int(rect["y"] * self.zoom_factor + self.image_offset_y)
-                    w = int(rect["w"] * self.zoom_factor); h = int(rect["h"] * self.zoom_factor)
-                    self.canvas.create_rectangle(x, y, x + w, y + h, outline="#fbbf24", width=4, tags="highlight")
+            for rect in self.rectangles:
+                if str(rect["name"]) == str(field_name):
+                    self.highlight_rect = rect; self.update_highlight()
                     break
 
     def show_context_menu(self, event):
@@ -513,8 +676,12 @@ class ModernTemplateGUI:
         field_name = item['values'][0]
         if not messagebox.askyesno("Delete Field", f"Are you sure you want to delete field '{field_name}'?"):
             return
-        self.rectangles = [rect for rect in self.rectangles if rect["name"] != field_name]
-        self.redraw_image(); self.update_field_list(); self.update_field_stats(); self.update_minimap(); self.update_status(f"🗑️ Field deleted: {field_name}", "#ef4444")
+        removed = [rect for rect in self.rectangles if str(rect["name"]) == str(field_name)]
+        self.rectangles = [rect for rect in self.rectangles if str(rect["name"]) != str(field_name)]
+        for rect in removed:
+            self.remove_field_item(rect)
+        self.fields_tree.delete(selection[0]); self.update_field_count()
+        self.update_field_stats(); self.update_minimap(); self.update_status(f"🗑️ Field deleted: {field_name}", "#ef4444")
 
     def update_field_list(self):
         """
@@ -527,6 +694,10 @@ class ModernTemplateGUI:
             self.fields_tree.delete(item)
         for rect in self.rectangles:
             self.fields_tree.insert("", tk.END, values=(rect["name"], rect["x"], rect["y"], rect["w"], rect["h"]))
+        self.update_field_count()
+
+    def update_field_count(self):
+        """Update the 'N fields selected' label above the fields table."""
         count = len(self.rectangles)
         if count == 0: self.field_count_label.config(text="No fields selected")
         elif count == 1: self.field_count_label.config(text="1 field selected")
@@ -585,11 +756,13 @@ class ModernTemplateGUI:
         )
         if not path: return
         try:
-            self.original_image = Image.open(path)
-            self.image = self.original_image.copy()
+            self.decoded = get_decoded_image(path)
+            self.original_image = self.decoded.pil
+            self.image = self.decoded.pil
+            self.pyramid = ZoomPyramid(self.image)
+            self.reset_ocr_preview()
             self.zoom_factor = 1.0; self.image_offset_x = 0; self.image_offset_y = 0
             self.rectangles = []
-            self.tk_image = ImageTk.PhotoImage(self.image)
             self.canvas.update_idletasks()
             self.update_zoom_display(); self.redraw_image(); self.update_minimap(); self.update_field_list(); self.update_field_stats()
             if self.preview_text:
@@ -597,7 +770,7 @@ class ModernTemplateGUI:
             self.update_status(f"✅ Image loaded: {self.image.width}x{self.image.height} • Zoom: 100%", "#10b981")
         except Exception as e:
             messagebox.showerror("❌ Error", f"Failed to load image: {str(e)}")
-            self.image = None; self.tk_image = None
+            self.image = None; self.pyramid = None; self.decoded = None
 
     # ==========================================================================
     # MOUSE EVENT HANDLERS FOR RECTANGLE SELECTION
@@ -644,8 +817,11 @@ class ModernTemplateGUI:
             self.canvas.delete(self.current_rect); self.current_rect = None
             if w > 5 and h > 5:
                 field_name = f"field_{len(self.rectangles)+1}"
-                self.rectangles.append({"name": field_name, "x": int(x), "y": int(y), "w": int(w), "h": int(h)})
-                self.redraw_rectangles(); self.update_field_list(); self.update_field_stats(); self.update_minimap(); self.update_status(f"✅ Added {field_name}: x={x}, y={y}, w={w}, h={h}", "#10b981")
+                rect = {"name": field_name, "x": int(x), "y": int(y), "w": int(w), "h": int(h)}
+                self.rectangles.append(rect); self.add_field_item(rect)
+                self.fields_tree.insert("", tk.END, values=(rect["name"], rect["x"], rect["y"], rect["w"], rect["h"])); self.update_field_count()
+                self.update_field_stats(); self.update_minimap(); self.update_status(f"✅ Added {field_name}: x={x}, y={y}, w={w}, h={h}", "#10b981")
+                self.schedule_field_ocr(rect)
             else:
                 self.update_status("❌ Rectangle too small, deleted", "#ef4444")
 
@@ -703,27 +879,8 @@ class ModernTemplateGUI:
             fields = data.get("fields", [])
             if not isinstance(fields, list): raise ValueError("Invalid template format: 'fields' should be a list")
             self.rectangles = fields
-            try: self.canvas.delete("all")
-            except Exception: pass
-            if hasattr(self, 'tk_image') and self.tk_image:
-                try:
-                    canvas_width = self.canvas.winfo_width() or self.viewport_frame.winfo_width() or 800
-                    canvas_height = self.canvas.winfo_height() or self.viewport_frame.winfo_height() or 600
-                    x = max(0, (canvas_width - self.image.width) // 2)
-                    y = max(0, (canvas_height - self.image.height) // 2)
-                    self.canvas.create_image(x, y, anchor="nw", image=self.tk_image, tags="main_image")
-                    self.zoom_factor = getattr(self, 'zoom_factor', 1.0)
-                    self.image_offset_x = getattr(self, 'image_offset_x', x)
-                    self.image_offset_y = getattr(self, 'image_offset_y', y)
-                except Exception:
-                    pass
             try: self.redraw_rectangles()
-            except Exception:
-                try:
-                    for rect in self.rectangles:
-                        x, y, w, h = rect.get('x', 0), rect.get('y', 0), rect.get('w', 0), rect.get('h', 0)
-                        self.canvas.create_rectangle(x, y, x + w, y + h, outline="#2563eb", width=2, tags='field_rect')
-                except Exception: pass
+            except Exception: pass
             try: self.update_field_list()
             except Exception: pass
             try: self.update_minimap()
@@ -750,13 +907,168 @@ class ModernTemplateGUI:
             except Exception: pass
             self.update_status(f"📂 Template dimuat: {os.path.basename(path)}", "#10b981")
 
+    # ==========================================================================
+    # BACKGROUND OCR PREVIEW
+    # ==========================================================================
+
+    def get_cv_image(self):
+        """Return the current image as a BGR array from the shared decoded-image cache."""
+        return self.decoded.bgr if self.decoded else None
+
+    def reset_ocr_preview(self):
+        """Cancel all pending OCR work and drop cached results (called when a new image is opened)."""
+        # Jobs already running cannot be cancelled; their results carry the old
+        # generation and are discarded in _poll_ocr_results
+        self._ocr_generation += 1
+        for key in list(self._ocr_jobs):
+            self._cancel_ocr_job(key)
+        for job in self._ocr_debounce.values():
+            self.canvas.after_cancel(job)
+        self._ocr_debounce.clear()
+        self._ocr_cache.clear()
+        self._field_results.clear()
+        self._preview_batch = None
+
+    def schedule_field_ocr(self, rect):
+        """
+        Debounce OCR of a field: the job starts only after preview_delay_ms
+        without further changes to the same field.
+        
+        Args:
+            rect: Field dict from self.rectangles
+        """
+        key = id(rect)
+        job = self._ocr_debounce.pop(key, None)
+        if job:
+            self.canvas.after_cancel(job)
+        self._ocr_debounce[key] = self.canvas.after(self.preview_delay_ms, lambda: self.request_field_ocr(rect))
+
+    def request_field_ocr(self, rect):
+        """
+        OCR a single field in the background worker, or serve it from the cache.
+        
+        A pending job for the same field is cancelled first; if it is already
+        running, its result is discarded when it arrives because its box no
+        longer matches.
+        """
+        key = id(rect)
+        self._ocr_debounce.pop(key, None)
+        box = (rect["x"], rect["y"], rect["w"], rect["h"])
+        pending = self._ocr_jobs.get(key)
+        if pending and pending[0] == box:
+            return
+        self._cancel_ocr_job(key)
+        if box in self._ocr_cache:
+            self._field_results[key] = self._ocr_cache[box]
+            self._on_field_result(key)
+            return
+        if self.decoded is None:
+            return
+        crop = self.decoded.crop_bgr(*box)
+        if self._ocr_executor is None:
+            self._ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-preview")
+        self._field_results[key] = None
+        future = self._ocr_executor.submit(self._ocr_field_worker, self._ocr_generation, key, box, crop)
+        self._ocr_jobs[key] = (box, future)
+        self.render_preview_text()
+        if self._ocr_poll_job is None:
+            self._ocr_poll_job = self.canvas.after(100, self._poll_ocr_results)
+
+    def cancel_field_ocr(self, rect):
+        """Cancel debounced or pending OCR for a field and forget its result."""
+        key = id(rect)
+        job = self._ocr_debounce.pop(key, None)
+        if job:
+            self.canvas.after_cancel(job)
+        self._cancel_ocr_job(key)
+        self._field_results.pop(key, None)
+        if self._preview_batch is not None:
+            self._preview_batch.discard(key)
+
+    def _cancel_ocr_job(self, key):
+        pending = self._ocr_jobs.pop(key, None)
+        if pending:
+            pending[1].cancel()
+
+    def _ocr_field_worker(self, generation, key, box, crop):
+        """Run EnhancedOCR on one crop. Executes in the worker thread; never touches widgets."""
+        start_time = time.time()
+        try:
+            if crop.size == 0:
+                raise ValueError("Empty crop region")
+            with span("field_preview"):
+                result = dict(self.ocr_engine.extract_text(crop, debug=False))
+        except Exception as e:
+            result = {'text': '', 'confidence': 0.0, 'strategy_used': 'none', 'error': str(e)}
+        result['time'] = time.time() - start_time
+        self._ocr_queue.put((generation, key, box, result))
+
+    def _poll_ocr_results(self):
+        """Deliver finished OCR results to the UI on the Tk thread."""
+        self._ocr_poll_job = None
+        while True:
+            try:
+                generation, key, box, result = self._ocr_queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._ocr_generation:
+                continue  # stale: OCR of a previously opened image
+            self._ocr_cache[box] = result
+            pending = self._ocr_jobs.get(key)
+            if not pending or pending[0] != box:
+                continue  # stale: the field changed or was removed meanwhile
+            del self._ocr_jobs[key]
+            self._field_results[key] = result
+            self._on_field_result(key)
+        if self._ocr_jobs:
+            self._ocr_poll_job = self.canvas.after(100, self._poll_ocr_results)
+
+    def _on_field_result(self, key):
+        """Show a newly available field result and finish the Preview run when it was the last one."""
+        if self._preview_batch is not None:
+            self._preview_batch.discard(key)
+        self.render_preview_text()
+        if self._preview_batch is not None and not self._preview_batch:
+            self._preview_batch = None
+            self._finish_preview()
+
+    def render_preview_text(self):
+        """Rewrite the Extracted Text tab from the current per-field results, in field order."""
+        if not self.preview_text:
+            return
+        self.preview_text.config(state=tk.NORMAL); self.preview_text.delete(1.0, tk.END)
+        self.preview_text.insert(tk.END, "🚀 ENHANCED OCR PREVIEW\n")
+        self.preview_text.insert(tk.END, "=" * 50 + "\n")
+        for field in self.rectangles:
+            key = id(field)
+            if key not in self._field_results:
+                continue
+            ocr_result = self._field_results[key]
+            x, y, w, h = field["x"], field["y"], field["w"], field["h"]
+            if ocr_result is None:
+                self.preview_text.insert(tk.END, f"🔹 {str(field['name']).upper()}\n   ⏳ Processing...\n\n")
+                continue
+            if ocr_result.get('error'):
+                self.preview_text.insert(tk.END, f"🔹 {str(field['name']).upper()}\n   ❌ Error: {ocr_result['error']}\n\n")
+                continue
+            self.preview_text.insert(tk.END, f"🔹 {str(field['name']).upper()}\n   Position: ({x}, {y}) Size: {w}x{h}\n   Strategy: {ocr_result['strategy_used']}\n   Processing time: {ocr_result['time']:.3f}s\n")
+            if ocr_result['text']:
+                confidence_color = "🟢" if ocr_result['confidence'] >= 0.8 else "🟡" if ocr_result['confidence'] >= 0.6 else "🔴"
+                self.preview_text.insert(tk.END, f"   Text: {ocr_result['text']}\n   Confidence: {confidence_color} {ocr_result['confidence']:.3f}\n")
+            else:
+                self.preview_text.insert(tk.END, f"   Text: [No text detected]\n   Confidence: 🔴 {ocr_result['confidence']:.3f}\n")
+            self.preview_text.insert(tk.END, "\n")
+        self.preview_text.see(tk.END)
+        self.preview_text.config(state=tk.DISABLED)
+
     def preview_extractions(self):
         """
         Run OCR on all selected field regions for preview.
         
-        Uses EnhancedOCR to extract text with confidence scores.
-        Displays results in the Extracted Text tab with summary.
-        Shows processing time and improvement tips if needed.
+        Uses EnhancedOCR in the background worker to extract text with
+        confidence scores. Results appear in the Extracted Text tab as each
+        field finishes; unchanged fields are served from the cache. A summary
+        with processing time and improvement tips is shown when all are done.
         """
         if not self.image:
             messagebox.showwarning("⚠️ Warning", "Open an image first!")
@@ -765,40 +1077,34 @@ class ModernTemplateGUI:
             messagebox.showwarning("⚠️ Warning", "Select at least one area first!")
             return
         try:
-            if self.original_image:
-                cv_image = cv2.cvtColor(cv2.imread(self.original_image.filename), cv2.COLOR_RGB2BGR)
-            else:
+            if self.get_cv_image() is None:
                 messagebox.showerror("❌ Error", "No original image file available")
                 return
             self.fields_notebook.select(self.fields_notebook.tabs()[1])
-            self.preview_text.config(state=tk.NORMAL); self.preview_text.delete(1.0, tk.END)
-            self.preview_text.insert(tk.END, "🚀 ENHANCED OCR PREVIEW\n")
-            self.preview_text.insert(tk.END, "=" * 50 + "\n")
-            ocr = EnhancedOCR(languages="eng+ind", confidence_threshold=0.6)
-            extracted_count = 0; high_confidence_count = 0; total_processing_time = 0
-            for i, field in enumerate(self.rectangles):
-                x, y, w, h = field["x"], field["y"], field["w"], field["h"]
-                crop = cv_image[y:y+h, x:x+w]
-                if crop.size == 0:
-                    self.preview_text.insert(tk.END, f"🔹 {field['name'].upper()}\n   ❌ Error: Empty crop region\n\n")
-                    continue
-                start_time = time.time(); ocr_result = ocr.extract_text(crop, debug=False); processing_time = time.time() - start_time; total_processing_time += processing_time
-                self.preview_text.insert(tk.END, f"🔹 {field['name'].upper()}\n   Position: ({x}, {y}) Size: {w}x{h}\n   Strategy: {ocr_result['strategy_used']}\n   Processing time: {processing_time:.3f}s\n")
-                if ocr_result['text']:
-                    confidence_color = "🟢" if ocr_result['confidence'] >= 0.8 else "🟡" if ocr_result['confidence'] >= 0.6 else "🔴"
-                    self.preview_text.insert(tk.END, f"   Text: {ocr_result['text']}\n   Confidence: {confidence_color} {ocr_result['confidence']:.3f}\n")
-                    extracted_count += 1
-                    if ocr_result['confidence'] >= 0.8: high_confidence_count += 1
-                else:
-                    self.preview_text.insert(tk.END, "   Text: [No text detected]\n   Confidence: 🔴 {ocr_result['confidence']:.3f}\n")
-                self.preview_text.insert(tk.END, "\n")
-            self.preview_text.insert(tk.END, f"📊 ENHANCED OCR SUMMARY:\n   Total fields: {len(self.rectangles)}\n   Text extracted: {extracted_count}\n   High confidence (≥0.8): {high_confidence_count}\n   Success rate: {(extracted_count/len(self.rectangles)*100):.1f}%\n   Average time per field: {(total_processing_time/len(self.rectangles)*1000):.1f}ms\n")
-            if high_confidence_count < len(self.rectangles) * 0.5:
-                self.preview_text.insert(tk.END, "\n💡 IMPROVEMENT TIPS:\n   • Increase image quality/resolution\n   • Adjust field boundaries to exclude background\n   • Ensure good contrast between text and background\n")
-            self.preview_text.config(state=tk.DISABLED)
-            self.update_status(f"🚀 Enhanced OCR completed! {extracted_count}/{len(self.rectangles)} fields extracted", "#10b981")
-            message = f"Enhanced OCR completed!\n\n📊 Results:\n• Total fields: {len(self.rectangles)}\n• Successfully extracted: {extracted_count}\n• High confidence: {high_confidence_count}\n• Success rate: {(extracted_count/len(self.rectangles)*100):.1f}%\n• Average processing time: {(total_processing_time/len(self.rectangles)*1000):.1f}ms"
-            messagebox.showinfo("✅ Enhanced OCR Complete", message)
+            self._preview_batch = {id(field) for field in self.rectangles}
+            self.update_status("⏳ Enhanced OCR running in background...", "#64748b")
+            for field in list(self.rectangles):
+                self.request_field_ocr(field)
         except Exception as e:
+            self._preview_batch = None
             messagebox.showerror("❌ Error", f"Failed to preview extractions: {str(e)}")
             self.update_status("❌ Enhanced OCR failed", "#ef4444")
+
+    def _finish_preview(self):
+        """Append the summary for a completed Preview run and notify the user."""
+        results = [self._field_results.get(id(field)) for field in self.rectangles]
+        results = [r for r in results if r]
+        if not results:
+            return
+        total = len(self.rectangles)
+        extracted_count = sum(1 for r in results if r['text'])
+        high_confidence_count = sum(1 for r in results if r['text'] and r['confidence'] >= 0.8)
+        total_processing_time = sum(r.get('time', 0.0) for r in results)
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.insert(tk.END, f"📊 ENHANCED OCR SUMMARY:\n   Total fields: {total}\n   Text extracted: {extracted_count}\n   High confidence (≥0.8): {high_confidence_count}\n   Success rate: {(extracted_count/total*100):.1f}%\n   Average time per field: {(total_processing_time/total*1000):.1f}ms\n")
+        if high_confidence_count < total * 0.5:
+            self.preview_text.insert(tk.END, "\n💡 IMPROVEMENT TIPS:\n   • Increase image quality/resolution\n   • Adjust field boundaries to exclude background\n   • Ensure good contrast between text and background\n")
+        self.preview_text.config(state=tk.DISABLED)
+        self.update_status(f"🚀 Enhanced OCR completed! {extracted_count}/{total} fields extracted", "#10b981")
+        message = f"Enhanced OCR completed!\n\n📊 Results:\n• Total fields: {total}\n• Successfully extracted: {extracted_count}\n• High confidence: {high_confidence_count}\n• Success rate: {(extracted_count/total*100):.1f}%\n• Average processing time: {(total_processing_time/total*1000):.1f}ms"
+        messagebox.showinfo("✅ Enhanced OCR Complete", message)
@@ -108,6 +108,24 @@ def test_screenshot_class():
     print("\n" + "=" * 40)
     print("🏁 ScreenshotMiniGUI testing completed!")
 
+def test_backend_benchmark():
+    """Measure the latency of every capture backend and show which one is cached"""
+    
+    print("\n⏱️ Benchmarking Capture Backends")
+    print("=" * 40)
+    
+    from screenshot import benchmark_backends, get_preferred_backend
+    
+    for result in benchmark_backends(repeat=3):
+        if result["ok"]:
+            print(f"✅ {result['name']}: best {result['latency_ms']:.1f} ms, mean {result['mean_ms']:.1f} ms")
+        else:
+            print(f"❌ {result['name']}: {result['error']}")
+    
+    print(f"\n🏆 Cached backend: {get_preferred_backend() or 'none'}")
+    print("\n" + "=" * 40)
+    print("🏁 Backend benchmark completed!")
+
 if __name__ == "__main__":
     print("🚀 Starting Screenshot Functionality Tests")
     print(f"Python version: {sys.version}")
@@ -123,5 +141,6 @@ if __name__ == "__main__":
     # Run tests
     test_screenshot_methods()
     test_screenshot_class()
+    test_backend_benchmark()
     
     print("\n🎉 All tests completed!")